@@ -0,0 +1,159 @@
+"""Command-line maintenance tasks.
+
+Usage (from the backend directory):
+    python -m app.cli init-db
+    python -m app.cli export-zip --out resumes.zip --public-only
+    python -m app.cli backfill-fingerprints
+    python -m app.cli verify-pending
+    python -m app.cli rebuild-stats
+    python -m app.cli rebuild-candidates
+    python -m app.cli purge-refresh-tokens
+"""
+import argparse
+import sys
+from datetime import datetime
+
+
+def _int_list(value: str):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def init_db(args: argparse.Namespace) -> None:
+    from app.database import init_db as create_schema
+
+    create_schema()
+    print("Database schema is up to date")
+
+
+def export_zip(args: argparse.Namespace) -> None:
+    from app.services.export_service import export_service
+
+    criteria = {
+        "resume_ids": args.resume_ids,
+        "user_ids": args.user_ids,
+        "public_only": args.public_only,
+        "updated_since": datetime.fromisoformat(args.updated_since) if args.updated_since else None,
+    }
+
+    out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    try:
+        for chunk in export_service.iter_resumes_zip(**criteria):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        export_service.shutdown()
+
+
+def backfill_fingerprints(args: argparse.Namespace) -> None:
+    from app.database import SessionLocal
+    from app.services.duplicate_service import duplicate_service
+
+    db = SessionLocal()
+    try:
+        added = duplicate_service.backfill(db)
+    finally:
+        db.close()
+    print(f"Fingerprinted {added} achievements")
+
+
+def verify_pending(args: argparse.Namespace) -> None:
+    from collections import Counter
+    from app.database import SessionLocal
+    from app.services.verification_service import verification_service
+
+    db = SessionLocal()
+    try:
+        futures = verification_service.enqueue_pending(db)
+    finally:
+        db.close()
+    outcomes = Counter()
+    try:
+        for future in futures:
+            status = future.result()
+            outcomes[status.value if status else "unchanged"] += 1
+    finally:
+        verification_service.shutdown()
+    print(", ".join(f"{name}: {count}" for name, count in sorted(outcomes.items())) or "Nothing pending")
+
+
+def rebuild_stats(args: argparse.Namespace) -> None:
+    from app.database import SessionLocal
+    from app.services.stats_service import stats_service
+
+    db = SessionLocal()
+    try:
+        users = stats_service.rebuild(db)
+    finally:
+        db.close()
+    print(f"Rebuilt stats for {users} users")
+
+
+def rebuild_candidates(args: argparse.Namespace) -> None:
+    from app.database import SessionLocal
+    from app.services.candidate_service import candidate_matrix
+
+    db = SessionLocal()
+    try:
+        profiles = candidate_matrix.rebuild(db)
+    finally:
+        db.close()
+    print(f"Rebuilt the candidate matrix from {profiles} public profiles")
+
+
+def purge_refresh_tokens(args: argparse.Namespace) -> None:
+    from app.database import SessionLocal
+    from app.services import refresh_tokens
+
+    db = SessionLocal()
+    try:
+        deleted = refresh_tokens.purge_expired(db)
+    finally:
+        db.close()
+    print(f"Deleted {deleted} expired refresh tokens")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    init_parser = subparsers.add_parser("init-db", help="Create missing tables and search indexes")
+    init_parser.set_defaults(func=init_db)
+
+    export_parser = subparsers.add_parser("export-zip", help="Export resumes as a ZIP of PDFs")
+    export_parser.add_argument("--out", required=True, help="Output file, or - for stdout")
+    export_parser.add_argument("--resume-ids", type=_int_list, help="Comma-separated resume ids")
+    export_parser.add_argument("--user-ids", type=_int_list, help="Comma-separated user ids")
+    export_parser.add_argument("--public-only", action="store_true")
+    export_parser.add_argument("--updated-since", help="ISO date, e.g. 2024-01-31")
+    export_parser.set_defaults(func=export_zip)
+
+    backfill_parser = subparsers.add_parser(
+        "backfill-fingerprints", help="Fingerprint existing achievements for duplicate detection"
+    )
+    backfill_parser.set_defaults(func=backfill_fingerprints)
+
+    verify_parser = subparsers.add_parser(
+        "verify-pending", help="Check certificates of all pending achievements"
+    )
+    verify_parser.set_defaults(func=verify_pending)
+
+    stats_parser = subparsers.add_parser(
+        "rebuild-stats", help="Recompute every user's achievement and skill counters"
+    )
+    stats_parser.set_defaults(func=rebuild_stats)
+
+    candidates_parser = subparsers.add_parser(
+        "rebuild-candidates", help="Write a fresh candidate matrix generation for the job-matching workers"
+    )
+    candidates_parser.set_defaults(func=rebuild_candidates)
+
+    purge_parser = subparsers.add_parser("purge-refresh-tokens", help="Delete expired refresh tokens")
+    purge_parser.set_defaults(func=purge_refresh_tokens)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,97 @@
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
+
+
+class LLMProvider(BaseModel):
+    """One OpenAI-compatible chat completions endpoint for summaries"""
+    name: str
+    model: str
+    base_url: Optional[str] = None  # None means api.openai.com
+    api_key: Optional[str] = None
+    timeout_seconds: float = 30.0
+    max_concurrency: int = 4  # In-flight calls per process
+    weight: float = 1.0  # Share of traffic among equally fast providers
 
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./resume_system.db"
     secret_key: str = "your-secret-key-please-change-in-production"
     algorithm: str = "HS256"
-    access_token_expire_minutes: int = 30
+    access_token_expire_minutes: int = 15  # Renewed through /auth/refresh without a password check
+    refresh_token_expire_days: int = 30
     openai_api_key: Optional[str] = None
     hf_token: Optional[str] = None
+    admin_emails: str = ""  # Comma-separated, e.g. career-services staff
+    
+    # Startup
+    auto_create_schema: bool = True  # Set false in production and run `python -m app.cli init-db`
+    warmup_on_startup: bool = True  # Import ReportLab/OpenAI in the background after startup
+    
+    # PDF rendering / bulk export
+    pdf_cache_max_bytes: int = 64 * 1024 * 1024
+    export_workers: int = 4
+    
+    # Admission control for expensive endpoints ("N/second|minute|hour|day")
+    rate_limit_enabled: bool = True
+    rate_limit_store: str = "memory://"  # or sqlite:///./data/ratelimit.db, redis://host:6379/0
+    rate_limit_ai: str = "20/hour"
+    rate_limit_pdf: str = "30/minute"
+    rate_limit_auth: str = "20/minute"  # Per client IP
+    max_inflight_ai: int = 8  # Per process
+    max_inflight_pdf: int = 8
+    
+    # Request metrics at /metrics
+    metrics_enabled: bool = True
+    server_timing_enabled: bool = False  # Adds a Server-Timing header to every response
+    slow_query_ms: Optional[float] = None  # Log SQL slower than this; unset disables the log
+    slow_query_log_path: Optional[str] = "./data/slow_queries.log"
+    slow_query_buffer_size: int = 500
+    slow_query_explain: bool = True
+    
+    # AI summary regeneration: requests for one resume within the window share one LLM call
+    summary_debounce_seconds: float = 1.5
+    summary_max_wait_seconds: float = 5.0
+    prompt_token_budget: int = 600  # Estimated tokens per summary prompt
+    
+    # Summary LLM providers, as JSON, e.g.
+    # LLM_PROVIDERS='[{"name": "local", "base_url": "http://127.0.0.1:8766/v1", "model": "stub"}]'
+    # Unset: Hugging Face router (HF_TOKEN) and OpenAI (OPENAI_API_KEY), whichever are configured
+    llm_providers: List[LLMProvider] = []
+    llm_failure_threshold: int = 3  # Consecutive failures before a provider is benched
+    llm_cooldown_seconds: float = 30.0  # Doubles per failed retry, up to 10x
+    
+    # Resume revision history: a full snapshot every N revisions, deltas in between
+    resume_revision_snapshot_interval: int = 16
+    
+    # Serialized profile JSON kept per user for GET /resumes/{id}
+    profile_cache_max_entries: int = 2048
+    
+    # Live resume preview WebSockets
+    live_poll_seconds: float = 5.0  # Catches changes made by other worker processes
+    live_send_timeout_seconds: float = 10.0  # Drop clients that stop reading
+    live_max_connections_per_user: int = 5
+    live_auth_timeout_seconds: float = 10.0  # For the first frame, which carries the access token
+    
+    # Local data (memory-mapped indexes etc.)
+    data_dir: str = "./data"
+    
+    # Uploaded certificates and attachments
+    upload_dir: str = "./uploads"
+    upload_max_bytes: int = 20 * 1024 * 1024
+    
+    # Talent search
+    talent_index_rebuild_seconds: int = 300
+    candidate_matrix_rebuild_seconds: int = 3600
+    skill_graph_rebuild_seconds: int = 3600
+    
+    # Certificate verification
+    verification_enabled: bool = True
+    verification_workers: int = 8
+    verification_per_host_limit: int = 2
+    verification_timeout_seconds: float = 10.0
+    verification_max_bytes: int = 10 * 1024 * 1024
+    verification_allow_private_hosts: bool = False  # Only for local issuer stubs
     
     class Config:
         env_file = ".env"
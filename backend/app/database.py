@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
@@ -8,6 +8,14 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, connection_record):
+        # SQLite ignores foreign keys (and so ON DELETE CASCADE) unless asked per connection
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -20,3 +28,11 @@ def get_db():
     finally:
         db.close()
 
+
+def init_db():
+    """Create missing tables and search indexes"""
+    import app.models  # noqa: F401  (register tables on Base.metadata)
+    from app.services.search_service import search_service
+    
+    Base.metadata.create_all(bind=engine)
+    search_service.install(engine)
@@ -0,0 +1,120 @@
+"""Per-route request metrics and an optional Server-Timing header.
+
+``MetricsMiddleware`` is plain ASGI (no BaseHTTPMiddleware task/stream
+wrapping). It puts a ``RequestStats`` into a context variable, which
+SQLAlchemy cursor hooks and ``metrics.timed`` add to. Context is copied into
+the threadpool that runs sync routes, so the same object is updated there.
+"""
+import time
+from typing import Callable, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import metrics
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+request_seconds = metrics.Histogram(
+    "http_request_duration_seconds", "Request latency by route template", ("method", "route")
+)
+requests_total = metrics.Counter(
+    "http_requests_total", "Requests by route template and status", ("method", "route", "status")
+)
+response_bytes = metrics.Histogram(
+    "http_response_size_bytes", "Response body size by route template", ("method", "route"), buckets=SIZE_BUCKETS
+)
+db_queries = metrics.Histogram(
+    "http_db_queries_per_request", "SQL statements executed per request", ("method", "route"), buckets=COUNT_BUCKETS
+)
+db_seconds = metrics.Counter(
+    "http_db_seconds_total", "Time spent executing SQL, by route template", ("method", "route")
+)
+work_seconds = metrics.Counter(
+    "http_work_seconds_total", "Time spent in LLM calls / PDF building, by route template", ("method", "route", "kind")
+)
+
+
+def install_sql_hooks(engine: Engine) -> None:
+    """Count and time SQL statements against the current request"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = metrics.current_request.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += elapsed
+
+
+class MetricsMiddleware:
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+        self._templates: Dict[Callable, str] = {}
+
+    def _route_template(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "<unmatched>"
+        template = self._templates.get(endpoint)
+        if template is None:
+            # Routing puts the endpoint, not the route, into the scope
+            for route in getattr(scope.get("app"), "routes", ()):
+                if getattr(route, "endpoint", None) is endpoint:
+                    template = route.path_format
+                    break
+            else:
+                template = getattr(endpoint, "__name__", "<unknown>")
+            self._templates[endpoint] = template
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = metrics.RequestStats()
+        token = metrics.current_request.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", self._server_timing(stats, time.perf_counter() - started))
+                    ]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.current_request.reset(token)
+            elapsed = time.perf_counter() - started
+            method, route = scope["method"], self._route_template(scope)
+            request_seconds.observe(elapsed, method=method, route=route)
+            requests_total.inc(method=method, route=route, status=str(status_code))
+            response_bytes.observe(size, method=method, route=route)
+            db_queries.observe(stats.db_queries, method=method, route=route)
+            if stats.db_seconds:
+                db_seconds.inc(stats.db_seconds, method=method, route=route)
+            for kind, seconds in stats.timings.items():
+                work_seconds.inc(seconds, method=method, route=route, kind=kind)
+
+    @staticmethod
+    def _server_timing(stats: metrics.RequestStats, elapsed: float) -> bytes:
+        parts = [f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.db_queries} queries"']
+        parts.extend(f"{kind};dur={seconds * 1000:.1f}" for kind, seconds in stats.timings.items())
+        parts.append(f"app;dur={elapsed * 1000:.1f}")
+        return ", ".join(parts).encode("latin-1")
@@ -1,15 +1,47 @@
-from fastapi import FastAPI
+import threading
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.routes import auth, users, achievements, resumes
+from app.database import engine, init_db
+from app import metrics
+from app.config import settings
+from app.instrumentation import MetricsMiddleware, install_sql_hooks
+from app import slow_query_log
+from app.routes import auth, users, achievements, resumes, talent, files, admin, dashboard
+from app.services.export_service import export_service
+from app.services.pdf_service import pdf_service
+from app.services.ai_service import get_ai_service
+from app.services.verification_service import verification_service
+
+
+def warm_up():
+    """Load lazily imported libraries before the first request needs them"""
+    try:
+        pdf_service.warm_up()
+        get_ai_service().warm_up()
+    except Exception as e:
+        print(f"Warm-up error: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.auto_create_schema:
+        init_db()
+    if settings.warmup_on_startup:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    yield
+    export_service.shutdown()
+    verification_service.shutdown()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Resume Building & Career Ecosystem API",
     description="API for dynamic resume generation based on verified achievements",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -21,11 +53,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics
+if settings.metrics_enabled:
+    install_sql_hooks(engine)
+    app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing_enabled)
+
+# Slow SQL log (opt-in)
+if settings.slow_query_ms is not None:
+    slow_query_log.enable(
+        engine,
+        threshold_ms=settings.slow_query_ms,
+        path=settings.slow_query_log_path,
+        buffer_size=settings.slow_query_buffer_size,
+        explain=settings.slow_query_explain,
+    )
+
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
 app.include_router(achievements.router, prefix="/api")
 app.include_router(resumes.router, prefix="/api")
+app.include_router(talent.router, prefix="/api")
+app.include_router(files.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+app.include_router(dashboard.router, prefix="/api")
 
 
 @app.get("/")
@@ -40,5 +91,17 @@ def read_root():
 
 @app.get("/health")
 def health_check():
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        print(f"Health check database error: {e}")
+        return JSONResponse(status_code=503, content={"status": "unhealthy", "database": "unreachable"})
     return {"status": "healthy"}
 
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
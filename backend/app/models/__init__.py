@@ -5,9 +5,15 @@ from app.models.achievement import (
     Hackathon,
     Project,
     Skill,
-    UserSkill
+    UserSkill,
+    AchievementFingerprint
 )
 from app.models.resume import Resume
+from app.models.resume_revision import ResumeRevision
+from app.models.stored_object import StoredObject, StoredObjectUpload
+from app.models.user_stats import UserStats
+from app.models.profile_version import ProfileVersion
+from app.models.refresh_token import RefreshToken
 
 __all__ = [
     "User",
@@ -17,6 +23,13 @@ __all__ = [
     "Project",
     "Skill",
     "UserSkill",
-    "Resume"
+    "AchievementFingerprint",
+    "Resume",
+    "ResumeRevision",
+    "StoredObject",
+    "StoredObjectUpload",
+    "UserStats",
+    "ProfileVersion",
+    "RefreshToken"
 ]
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -15,7 +15,7 @@ class Internship(Base):
     __tablename__ = "internships"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     company_name = Column(String, nullable=False)
     position = Column(String, nullable=False)
     location = Column(String, nullable=True)
@@ -36,7 +36,7 @@ class Course(Base):
     __tablename__ = "courses"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     course_name = Column(String, nullable=False)
     platform = Column(String, nullable=False)  # Coursera, Udemy, etc.
     instructor = Column(String, nullable=True)
@@ -57,7 +57,7 @@ class Hackathon(Base):
     __tablename__ = "hackathons"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     hackathon_name = Column(String, nullable=False)
     organizer = Column(String, nullable=False)
     participation_date = Column(DateTime, nullable=False)
@@ -78,7 +78,7 @@ class Project(Base):
     __tablename__ = "projects"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     project_name = Column(String, nullable=False)
     project_type = Column(String, nullable=True)  # Personal, Academic, Professional
     start_date = Column(DateTime, nullable=False)
@@ -111,7 +111,7 @@ class UserSkill(Base):
     __tablename__ = "user_skills"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False)
     proficiency_level = Column(String, nullable=True)  # Beginner, Intermediate, Advanced, Expert
     years_of_experience = Column(Integer, nullable=True)
@@ -121,3 +121,19 @@ class UserSkill(Base):
     user = relationship("User", back_populates="skills")
     skill = relationship("Skill", back_populates="user_skills")
 
+
+
+class AchievementFingerprint(Base):
+    """Normalized-key hash of an achievement, for O(1) duplicate checks per user"""
+    __tablename__ = "achievement_fingerprints"
+    __table_args__ = (
+        Index("ix_achievement_fingerprints_lookup", "user_id", "kind", "fingerprint"),
+        Index("ix_achievement_fingerprints_achievement", "kind", "achievement_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String, nullable=False)  # internship, course, hackathon, project
+    achievement_id = Column(Integer, nullable=False)
+    fingerprint = Column(String(32), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey
+from datetime import datetime
+from app.database import Base
+
+
+class ProfileVersion(Base):
+    """Per-user change token, bumped by every write to the user's profile data"""
+    __tablename__ = "profile_versions"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, nullable=False)  # Starts at the creation time in ms, +1 per change
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
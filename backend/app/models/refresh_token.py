@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from app.database import Base
+
+
+class RefreshToken(Base):
+    """A rotating refresh token, stored as an HMAC of the token only.
+
+    Written with Core statements in services/refresh_tokens.py, so issuing and
+    rotating tokens does not count as a profile change (see change_tokens.py).
+    """
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    family_id = Column(String(32), nullable=False, index=True)  # Shared by every rotation of one login
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)  # Set when rotated, logged out or reused
+    replaced_by = Column(Integer, ForeignKey("refresh_tokens.id", ondelete="SET NULL"), nullable=True)
@@ -8,7 +8,7 @@ class Resume(Base):
     __tablename__ = "resumes"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String, nullable=False, default="My Resume")
     template = Column(String, default="modern")  # modern, classic, minimal, creative
     summary = Column(Text, nullable=True)  # AI-generated or custom
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base
+
+
+class ResumeRevision(Base):
+    """One saved state of a resume's content, as a snapshot or a delta; see services/revision_service.py"""
+    __tablename__ = "resume_revisions"
+    __table_args__ = (
+        UniqueConstraint("resume_id", "number", name="uq_resume_revisions_number"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, index=True)
+    number = Column(Integer, nullable=False)  # 1, 2, ... per resume
+    kind = Column(String, nullable=False)  # snapshot, delta (against revision number - 1)
+    source = Column(String, nullable=False, default="edit")  # create, edit, ai_summary, restore
+    fields = Column(String, nullable=False, default="")  # Comma-separated fields changed by this revision
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed JSON
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    resume = relationship("Resume")
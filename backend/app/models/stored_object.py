@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from app.database import Base
+
+
+class StoredObject(Base):
+    """An uploaded file, stored once on disk under its SHA-256 digest"""
+    __tablename__ = "stored_objects"
+    
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(Integer, nullable=False)
+    content_type = Column(String, nullable=False)
+    uploaded_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # First uploader
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class StoredObjectUpload(Base):
+    """A user who uploaded a stored file; only uploaders (and admins) may read it"""
+    __tablename__ = "stored_object_uploads"
+    
+    sha256 = Column(String(64), ForeignKey("stored_objects.sha256", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -20,11 +20,11 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
-    internships = relationship("Internship", back_populates="user", cascade="all, delete-orphan")
-    courses = relationship("Course", back_populates="user", cascade="all, delete-orphan")
-    hackathons = relationship("Hackathon", back_populates="user", cascade="all, delete-orphan")
-    projects = relationship("Project", back_populates="user", cascade="all, delete-orphan")
-    skills = relationship("UserSkill", back_populates="user", cascade="all, delete-orphan")
-    resumes = relationship("Resume", back_populates="user", cascade="all, delete-orphan")
+    # Relationships; child rows are removed by ON DELETE CASCADE, never loaded for a delete
+    internships = relationship("Internship", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    courses = relationship("Course", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    hackathons = relationship("Hackathon", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    projects = relationship("Project", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    skills = relationship("UserSkill", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    resumes = relationship("Resume", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON
+from datetime import datetime
+from app.database import Base
+
+
+class UserStats(Base):
+    """Per-user counters kept current by deltas; see services/stats_service.py"""
+    __tablename__ = "user_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    
+    internships_pending = Column(Integer, nullable=False, default=0)
+    internships_verified = Column(Integer, nullable=False, default=0)
+    internships_rejected = Column(Integer, nullable=False, default=0)
+    courses_pending = Column(Integer, nullable=False, default=0)
+    courses_verified = Column(Integer, nullable=False, default=0)
+    courses_rejected = Column(Integer, nullable=False, default=0)
+    hackathons_pending = Column(Integer, nullable=False, default=0)
+    hackathons_verified = Column(Integer, nullable=False, default=0)
+    hackathons_rejected = Column(Integer, nullable=False, default=0)
+    projects_pending = Column(Integer, nullable=False, default=0)
+    projects_verified = Column(Integer, nullable=False, default=0)
+    projects_rejected = Column(Integer, nullable=False, default=0)
+    
+    skills_count = Column(Integer, nullable=False, default=0)
+    top_skills = Column(JSON, nullable=True)  # Skill names, most verified first
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,242 @@
+"""Admission control for expensive endpoints.
+
+Two layers, applied per route class ("ai", "pdf", "auth"):
+
+* a token bucket per caller (user id, or client IP for auth routes) that
+  bounds each caller's sustained rate while allowing short bursts, and
+* a per-process cap on requests in flight, so a spike from many callers
+  can't exhaust LLM quota or PDF CPU.
+
+Buckets live in a pluggable store: in memory for a single process, or a
+SQLite file / Redis server shared by several workers (``RATE_LIMIT_STORE``).
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app import metrics
+from app.auth import get_current_user
+from app.config import settings
+from app.models.user import User
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+rejected_requests = metrics.Counter(
+    "rate_limit_rejected_total", "Requests rejected by admission control", ("route_class", "reason")
+)
+inflight_requests = metrics.Gauge(
+    "rate_limit_inflight", "Requests currently admitted per route class", ("route_class",)
+)
+
+
+def parse_rate(spec: str) -> Tuple[int, float]:
+    """Parse "N/period" into (bucket capacity, tokens refilled per second)"""
+    count, _, period = spec.partition("/")
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period.strip().rstrip("s")]
+
+
+# Stores. ``take`` removes one token and returns 0, or returns the seconds
+# until a token will be available.
+
+class MemoryStore:
+    """Buckets in a dict kept in least-recently-used order, capped at MAX_KEYS"""
+
+    MAX_KEYS = 100_000
+
+    def __init__(self):
+        # key -> (tokens, updated, capacity, rate); the bucket's own limits, since
+        # route classes share the store
+        self._buckets: "OrderedDict[str, Tuple[float, float, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _, _ = self._buckets.get(key, (capacity, now, capacity, rate))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, capacity, rate)
+            self._buckets.move_to_end(key)
+            self._evict(now)
+            return 0.0 if allowed else (1 - tokens) / rate
+
+    def _evict(self, now: float) -> None:
+        # A bucket that has refilled completely is the same as no bucket: drop
+        # the least recently used one if so, and past MAX_KEYS drop it anyway
+        tokens, updated, capacity, rate = next(iter(self._buckets.values()))
+        if tokens + (now - updated) * rate >= capacity or len(self._buckets) > self.MAX_KEYS:
+            self._buckets.popitem(last=False)
+
+class SQLiteStore:
+    """Buckets in a local SQLite file, shared by worker processes on one host"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return 0.0 if allowed else (1 - tokens) / rate
+
+
+class RedisStore:
+    """Buckets in Redis, shared by workers on any number of hosts"""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_STORE uses redis:// but the 'redis' package is not installed")
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        return float(self._script(keys=[f"ratelimit:{key}"], args=[capacity, rate, time.time()]))
+
+
+def create_store(url: str):
+    if url.startswith("sqlite:///"):
+        return SQLiteStore(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://")):
+        return RedisStore(url)
+    if url in ("", "memory://"):
+        return MemoryStore()
+    raise ValueError(f"Unsupported RATE_LIMIT_STORE: {url}")
+
+
+class AdmissionController:
+    def __init__(self, store, rates: Dict[str, str], concurrency: Dict[str, int], enabled: bool = True):
+        self.store = store
+        self.enabled = enabled
+        self.rates = {route_class: parse_rate(spec) for route_class, spec in rates.items()}
+        self.slots = {route_class: threading.BoundedSemaphore(limit) for route_class, limit in concurrency.items()}
+
+    def _reject(self, route_class: str, reason: str, retry_after: float, detail: str):
+        rejected_requests.inc(route_class=route_class, reason=reason)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    def check_rate(self, route_class: str, caller: str) -> None:
+        capacity, rate = self.rates[route_class]
+        try:
+            wait = self.store.take(f"{route_class}:{caller}", capacity, rate)
+        except Exception as e:
+            # Fail open: a broken limiter store shouldn't take the API down
+            print(f"Rate limit store error: {e}")
+            return
+        if wait > 0:
+            self._reject(route_class, "rate", wait, "Rate limit exceeded, please retry later")
+
+    @contextmanager
+    def admit(self, route_class: str, caller: str):
+        """Admit one request for ``caller``, or raise 429"""
+        if not self.enabled:
+            yield
+            return
+        # Take the slot first: a request turned away as busy shouldn't cost the caller a token
+        slot = self.slots.get(route_class)
+        if slot is not None and not slot.acquire(blocking=False):
+            self._reject(route_class, "concurrency", 1, "Server is busy, please retry shortly")
+        try:
+            self.check_rate(route_class, caller)
+        except BaseException:
+            if slot is not None:
+                slot.release()
+            raise
+        inflight_requests.inc(route_class=route_class)
+        try:
+            yield
+        finally:
+            inflight_requests.dec(route_class=route_class)
+            if slot is not None:
+                slot.release()
+
+
+admission = AdmissionController(
+    create_store(settings.rate_limit_store),
+    rates={"ai": settings.rate_limit_ai, "pdf": settings.rate_limit_pdf, "auth": settings.rate_limit_auth},
+    concurrency={"ai": settings.max_inflight_ai, "pdf": settings.max_inflight_pdf},
+    enabled=settings.rate_limit_enabled,
+)
+
+
+def limit_user(route_class: str):
+    """Route dependency: admit the request against the current user's bucket"""
+    def dependency(current_user: User = Depends(get_current_user)):
+        with admission.admit(route_class, f"user:{current_user.id}"):
+            yield
+    return dependency
+
+
+def limit_ip(route_class: str):
+    """Route dependency: admit the request against the client IP's bucket"""
+    def dependency(request: Request):
+        host = request.client.host if request.client else "unknown"
+        with admission.admit(route_class, f"ip:{host}"):
+            yield
+    return dependency
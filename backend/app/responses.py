@@ -0,0 +1,47 @@
+"""Fast JSON responses.
+
+Returning a ``Response`` from a route skips FastAPI's response_model pass
+(validate, dump to Python, then ``json.dumps``). These helpers serialize in one
+step instead: ORM objects go through a ``TypeAdapter`` built once per schema
+straight to JSON bytes, and plain data goes through orjson. Routes keep their
+``response_model`` so the OpenAPI docs are unchanged.
+"""
+from typing import Any, Dict, List, Optional, Type
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class JSONBytesResponse(Response):
+    """A response whose body is already-encoded JSON"""
+    media_type = "application/json"
+
+
+_list_adapters: Dict[Type[BaseModel], TypeAdapter] = {}
+
+
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Cached ``TypeAdapter(List[model])``; building one compiles a validator"""
+    adapter = _list_adapters.get(model)
+    if adapter is None:
+        adapter = _list_adapters[model] = TypeAdapter(List[model])
+    return adapter
+
+
+def model_list_response(model: Type[BaseModel], objects: List[Any], **kwargs) -> JSONBytesResponse:
+    """Serialize ORM objects as a JSON list of ``model`` without the dict round trip"""
+    adapter = list_adapter(model)
+    body = adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+    return JSONBytesResponse(body, **kwargs)
+
+
+def dumps(data: Any) -> bytes:
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def not_modified(request: Request, token) -> Optional[Response]:
+    """A 304 if the request's validators match ``token`` (see change_tokens)"""
+    if token.matches(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        return Response(status_code=304, headers=token.headers())
+    return None
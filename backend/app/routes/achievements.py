@@ -1,46 +1,130 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional
 
 from app.database import get_db
 from app.models.user import User
-from app.models.achievement import Internship, Course, Hackathon, Project, Skill, UserSkill
+from app.models.achievement import Internship, Course, Hackathon, Project, Skill, UserSkill, VerificationStatus
 from app.schemas.achievement import (
     InternshipCreate, InternshipResponse,
     CourseCreate, CourseResponse,
     HackathonCreate, HackathonResponse,
     ProjectCreate, ProjectResponse,
     UserSkillCreate, UserSkillResponse,
-    SkillResponse
+    SkillResponse,
+    SkillSuggestion,
+    AchievementSearchResponse
 )
 from app.auth import get_current_user
+from app.services.search_service import search_service
+from app.services.skill_graph_service import skill_graph_service
+from app.services.duplicate_service import duplicate_service
+from app.services.verification_service import verification_service, evidence, credit_skills, skill_names
+from app.config import settings
+from app.routes.files import receive_upload
+from app.schemas.file import StoredObjectResponse
+from app.responses import model_list_response, not_modified
+from app.services.storage_service import storage_service
+from app.services.stats_service import stats_service
+from app.services import change_tokens
 
 router = APIRouter(prefix="/achievements", tags=["Achievements"])
 
 
+def _reject_duplicate(db: Session, user_id: int, kind: str, fingerprint: str, allow_duplicate: bool):
+    """Raise 409 with the matching id if the user already has this achievement"""
+    
+    if allow_duplicate:
+        return
+    
+    duplicate_id = duplicate_service.find(db, user_id, kind, fingerprint)
+    if duplicate_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": f"A matching {kind} already exists",
+                "duplicate_id": duplicate_id,
+            }
+        )
+
+
+def _list_response(request: Request, db: Session, user: User, schema, items_attr: str):
+    """Serialize one of the user's lists, or answer 304 if the client's copy is current"""
+    
+    token = change_tokens.current(db, user.id)
+    cached = not_modified(request, token)
+    if cached is not None:
+        return cached
+    return model_list_response(schema, getattr(user, items_attr), headers=token.headers())
+
+
+def _schedule_verification(kind: str, achievement):
+    """Queue a background certificate check if there is evidence to verify"""
+    
+    url, _ = evidence(kind, achievement)
+    if settings.verification_enabled and url:
+        verification_service.enqueue(kind, achievement.id)
+
+
+# Search
+@router.get("/search", response_model=AchievementSearchResponse)
+def search_achievements(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Full-text search across the current user's achievements"""
+    
+    # Fetch one extra row to know whether another page exists
+    hits = search_service.search(db, current_user.id, q, limit=limit + 1, offset=offset)
+    
+    return {
+        "query": q,
+        "limit": limit,
+        "offset": offset,
+        "has_more": len(hits) > limit,
+        "results": hits[:limit],
+    }
+
+
 # Internships
 @router.get("/internships", response_model=List[InternshipResponse])
-def get_internships(current_user: User = Depends(get_current_user)):
+def get_internships(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """Get all internships for current user"""
-    return current_user.internships
+    return _list_response(request, db, current_user, InternshipResponse, "internships")
 
 
 @router.post("/internships", response_model=InternshipResponse, status_code=status.HTTP_201_CREATED)
 def create_internship(
     internship_data: InternshipCreate,
+    allow_duplicate: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new internship"""
     
+    fingerprint = duplicate_service.fingerprint("internship", internship_data.dict())
+    _reject_duplicate(db, current_user.id, "internship", fingerprint, allow_duplicate)
+    
     db_internship = Internship(
         user_id=current_user.id,
         **internship_data.dict()
     )
     
     db.add(db_internship)
+    db.flush()
+    duplicate_service.record(db, current_user.id, "internship", db_internship.id, fingerprint)
+    stats_service.achievement_added(db, current_user.id, "internship", db_internship.verification_status)
     db.commit()
     db.refresh(db_internship)
+    _schedule_verification("internship", db_internship)
     
     return db_internship
 
@@ -61,33 +145,47 @@ def delete_internship(
     if not internship:
         raise HTTPException(status_code=404, detail="Internship not found")
     
+    duplicate_service.forget(db, "internship", internship.id)
     db.delete(internship)
+    stats_service.achievement_removed(db, current_user.id, "internship", internship.verification_status)
     db.commit()
 
 
 # Courses
 @router.get("/courses", response_model=List[CourseResponse])
-def get_courses(current_user: User = Depends(get_current_user)):
+def get_courses(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """Get all courses for current user"""
-    return current_user.courses
+    return _list_response(request, db, current_user, CourseResponse, "courses")
 
 
 @router.post("/courses", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
 def create_course(
     course_data: CourseCreate,
+    allow_duplicate: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new course"""
     
+    fingerprint = duplicate_service.fingerprint("course", course_data.dict())
+    _reject_duplicate(db, current_user.id, "course", fingerprint, allow_duplicate)
+    
     db_course = Course(
         user_id=current_user.id,
         **course_data.dict()
     )
     
     db.add(db_course)
+    db.flush()
+    duplicate_service.record(db, current_user.id, "course", db_course.id, fingerprint)
+    stats_service.achievement_added(db, current_user.id, "course", db_course.verification_status)
     db.commit()
     db.refresh(db_course)
+    _schedule_verification("course", db_course)
     
     return db_course
 
@@ -108,33 +206,47 @@ def delete_course(
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
+    duplicate_service.forget(db, "course", course.id)
     db.delete(course)
+    stats_service.achievement_removed(db, current_user.id, "course", course.verification_status)
     db.commit()
 
 
 # Hackathons
 @router.get("/hackathons", response_model=List[HackathonResponse])
-def get_hackathons(current_user: User = Depends(get_current_user)):
+def get_hackathons(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """Get all hackathons for current user"""
-    return current_user.hackathons
+    return _list_response(request, db, current_user, HackathonResponse, "hackathons")
 
 
 @router.post("/hackathons", response_model=HackathonResponse, status_code=status.HTTP_201_CREATED)
 def create_hackathon(
     hackathon_data: HackathonCreate,
+    allow_duplicate: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new hackathon entry"""
     
+    fingerprint = duplicate_service.fingerprint("hackathon", hackathon_data.dict())
+    _reject_duplicate(db, current_user.id, "hackathon", fingerprint, allow_duplicate)
+    
     db_hackathon = Hackathon(
         user_id=current_user.id,
         **hackathon_data.dict()
     )
     
     db.add(db_hackathon)
+    db.flush()
+    duplicate_service.record(db, current_user.id, "hackathon", db_hackathon.id, fingerprint)
+    stats_service.achievement_added(db, current_user.id, "hackathon", db_hackathon.verification_status)
     db.commit()
     db.refresh(db_hackathon)
+    _schedule_verification("hackathon", db_hackathon)
     
     return db_hackathon
 
@@ -155,33 +267,47 @@ def delete_hackathon(
     if not hackathon:
         raise HTTPException(status_code=404, detail="Hackathon not found")
     
+    duplicate_service.forget(db, "hackathon", hackathon.id)
     db.delete(hackathon)
+    stats_service.achievement_removed(db, current_user.id, "hackathon", hackathon.verification_status)
     db.commit()
 
 
 # Projects
 @router.get("/projects", response_model=List[ProjectResponse])
-def get_projects(current_user: User = Depends(get_current_user)):
+def get_projects(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """Get all projects for current user"""
-    return current_user.projects
+    return _list_response(request, db, current_user, ProjectResponse, "projects")
 
 
 @router.post("/projects", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 def create_project(
     project_data: ProjectCreate,
+    allow_duplicate: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new project"""
     
+    fingerprint = duplicate_service.fingerprint("project", project_data.dict())
+    _reject_duplicate(db, current_user.id, "project", fingerprint, allow_duplicate)
+    
     db_project = Project(
         user_id=current_user.id,
         **project_data.dict()
     )
     
     db.add(db_project)
+    db.flush()
+    duplicate_service.record(db, current_user.id, "project", db_project.id, fingerprint)
+    stats_service.achievement_added(db, current_user.id, "project", db_project.verification_status)
     db.commit()
     db.refresh(db_project)
+    _schedule_verification("project", db_project)
     
     return db_project
 
@@ -202,15 +328,88 @@ def delete_project(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
+    duplicate_service.forget(db, "project", project.id)
     db.delete(project)
+    stats_service.achievement_removed(db, current_user.id, "project", project.verification_status)
     db.commit()
 
 
+# Certificates
+CERTIFICATE_MODELS = {"internships": Internship, "courses": Course, "hackathons": Hackathon}
+
+
+def _owned_achievement(db: Session, kind: str, achievement_id: int, user_id: int):
+    model = CERTIFICATE_MODELS[kind]
+    return db.query(model).filter(model.id == achievement_id, model.user_id == user_id).first()
+
+
+def _attach_certificate(db: Session, kind: str, achievement_id: int, user_id: int, url: str) -> Optional[str]:
+    """Point the achievement at an uploaded file and send it back for review"""
+    
+    achievement = _owned_achievement(db, kind, achievement_id, user_id)
+    if not achievement:
+        return None  # Deleted during the upload
+    
+    previous_status = achievement.verification_status
+    if previous_status == VerificationStatus.VERIFIED:
+        # Its skills were credited when it was verified
+        credit_skills(db, user_id, skill_names(kind[:-1], achievement), -1)
+    achievement.certificate_url = url
+    achievement.verification_status = VerificationStatus.PENDING
+    stats_service.status_changed(db, user_id, kind[:-1], previous_status, VerificationStatus.PENDING)
+    db.commit()
+    return url
+
+
+@router.post("/{kind}/{achievement_id}/certificate", response_model=StoredObjectResponse)
+async def upload_certificate(
+    kind: Literal["internships", "courses", "hackathons"],
+    achievement_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Upload a certificate file (raw body) and attach it to an achievement"""
+    
+    # async only to stream the body; database work runs in the threadpool
+    if not await run_in_threadpool(_owned_achievement, db, kind, achievement_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Achievement not found")
+    
+    stored = await receive_upload(request, db, current_user)
+    
+    url = await run_in_threadpool(
+        _attach_certificate, db, kind, achievement_id, current_user.id, storage_service.url_for(stored.sha256)
+    )
+    if url is None:
+        raise HTTPException(status_code=404, detail="Achievement not found")
+    
+    return {
+        "sha256": stored.sha256,
+        "size": stored.size,
+        "content_type": stored.content_type,
+        "url": url,
+    }
+
+
 # Skills
 @router.get("/skills", response_model=List[UserSkillResponse])
-def get_skills(current_user: User = Depends(get_current_user)):
+def get_skills(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """Get all skills for current user"""
-    return current_user.skills
+    return _list_response(request, db, current_user, UserSkillResponse, "skills")
+
+
+@router.get("/skills/suggestions", response_model=List[SkillSuggestion])
+def get_skill_suggestions(
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Suggest skills that commonly appear alongside the current user's skills"""
+    return skill_graph_service.suggest(db, current_user.id, limit=limit)
 
 
 @router.post("/skills", response_model=UserSkillResponse, status_code=status.HTTP_201_CREATED)
@@ -247,6 +446,7 @@ def create_skill(
     )
     
     db.add(db_user_skill)
+    stats_service.skills_changed(db, current_user.id, 1)
     db.commit()
     db.refresh(db_user_skill)
     
@@ -270,5 +470,6 @@ def delete_skill(
         raise HTTPException(status_code=404, detail="Skill not found")
     
     db.delete(user_skill)
+    stats_service.skills_changed(db, current_user.id, -1)
     db.commit()
 
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+
+from app.models.user import User
+from app.auth import get_current_admin
+from app import slow_query_log
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/slow-queries")
+def list_slow_queries(
+    limit: int = Query(100, ge=1, le=1000),
+    min_ms: float = Query(0.0, ge=0),
+    contains: Optional[str] = None,
+    shape_id: Optional[str] = None,
+    current_admin: User = Depends(get_current_admin)
+):
+    """List recent slow SQL statements, newest first"""
+    
+    log = slow_query_log.slow_query_log
+    if log is None:
+        raise HTTPException(status_code=404, detail="Slow query log is disabled (set SLOW_QUERY_MS)")
+    
+    return {
+        "threshold_ms": log.threshold_seconds * 1000,
+        "results": log.query(limit=limit, min_ms=min_ms, contains=contains, shape_id=shape_id),
+    }
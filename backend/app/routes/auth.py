@@ -5,18 +5,34 @@ from datetime import timedelta
 
 from app.database import get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse, Token
+from app.schemas.user import UserCreate, UserResponse, Token, RefreshRequest
 from app.auth import (
     get_password_hash,
     authenticate_user,
     create_access_token,
 )
 from app.config import settings
+from app.rate_limit import limit_ip
+from app.services import refresh_tokens
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+def _token_response(user: User, refresh_token: str) -> dict:
+    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    access_token = create_access_token(
+        data={"sub": user.email}, expires_delta=access_token_expires
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "expires_in": int(access_token_expires.total_seconds()),
+    }
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(limit_ip("auth"))])
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
     
@@ -49,7 +65,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_ip("auth"))])
 def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
@@ -64,10 +80,39 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
+    refresh_token, _ = refresh_tokens.issue(db, user.id)
+    db.commit()
+    
+    return _token_response(user, refresh_token)
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(body: RefreshRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for new access and refresh tokens"""
+    
+    try:
+        user_id, refresh_token = refresh_tokens.rotate(db, body.refresh_token)
+    except refresh_tokens.RefreshError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user = db.get(User, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return _token_response(user, refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(body: RefreshRequest, db: Session = Depends(get_db)):
+    """Revoke a refresh token and every token rotated from the same login"""
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    refresh_tokens.revoke(db, body.refresh_token)
 
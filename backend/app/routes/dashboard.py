@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.schemas.dashboard import DashboardResponse
+from app.auth import get_current_user
+from app.services.dashboard_service import dashboard_service
+from app.services import change_tokens
+from app.responses import JSONBytesResponse, dumps, not_modified
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("", response_model=DashboardResponse)
+def get_dashboard(
+    request: Request,
+    recent: int = Query(5, ge=0, le=50),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get achievement counts, verification breakdowns, recent items and resumes"""
+    
+    token = change_tokens.current(db, current_user.id)
+    cached = not_modified(request, token)
+    if cached is not None:
+        return cached
+    
+    summary = DashboardResponse.model_validate(dashboard_service.summary(db, current_user.id, recent_limit=recent))
+    return JSONBytesResponse(summary.model_dump_json(), headers=token.headers())
@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.models.stored_object import StoredObject
+from app.schemas.file import StoredObjectResponse
+from app.auth import get_current_user, is_admin
+from app.services.storage_service import storage_service, UploadTooLarge, UnsupportedFileType
+
+router = APIRouter(prefix="/files", tags=["Files"])
+
+
+async def receive_upload(request: Request, db: Session, user: User) -> StoredObject:
+    """Stream the raw request body into the file store"""
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > storage_service.max_bytes:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+
+    try:
+        return await storage_service.save(db, request.stream(), user.id)
+    except UploadTooLarge:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+    except UnsupportedFileType:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Only PDF, PNG, JPEG, GIF and WebP files are accepted"
+        )
+
+
+def _stored_response(stored: StoredObject) -> dict:
+    return {
+        "sha256": stored.sha256,
+        "size": stored.size,
+        "content_type": stored.content_type,
+        "url": storage_service.url_for(stored.sha256),
+    }
+
+
+@router.post("", response_model=StoredObjectResponse, status_code=status.HTTP_201_CREATED)
+async def upload_file(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Upload a file as the raw request body"""
+
+    # async to stream the body; StorageService.save keeps its blocking IO off the event loop
+    stored = await receive_upload(request, db, current_user)
+    return _stored_response(stored)
+
+
+@router.get("/{sha256}")
+def download_file(
+    sha256: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Download a stored file by its content hash (uploaders or admin)"""
+
+    stored = storage_service.get(db, sha256)
+    # Same answer for "doesn't exist" and "not yours", so hashes can't be probed
+    if not stored or not (storage_service.may_read(db, stored, current_user) or is_admin(current_user)):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    # Content never changes for a given address, but access can: revalidate every use
+    headers = {
+        "ETag": f'"{stored.sha256}"',
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization",
+        "X-Content-Type-Options": "nosniff",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(storage_service.path_for(stored.sha256), media_type=stored.content_type, headers=headers)
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 import secrets
 import io
@@ -9,34 +9,108 @@ import io
 from app.database import get_db
 from app.models.user import User
 from app.models.resume import Resume
-from app.schemas.resume import ResumeCreate, ResumeUpdate, ResumeResponse, ResumeFullResponse
-from app.auth import get_current_user
+from app.schemas.resume import (
+    ResumeCreate, ResumeUpdate, ResumeResponse, ResumeFullResponse, ResumeBulkExportRequest,
+    JobMatchRequest, JobMatchResponse, ResumeRevisionResponse, ResumeRevisionDetail, ResumeRevisionComparison
+)
+from app.auth import get_current_user, get_current_admin
+from app.rate_limit import admission, limit_user
 from app.services.resume_service import resume_service
-
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-from reportlab.lib import colors
+from app.services.pdf_service import pdf_service
+from app.services.export_service import export_service
+from app.services.match_service import match_service
+from app.services.profile_cache import profile_cache
+from app.services.summary_scheduler import summary_scheduler
+from app.services.live_service import live_hub, LiveSession, receive_credentials, CLOSE_UNAUTHORIZED, CLOSE_TOO_MANY
+from app.services import change_tokens, revision_service
+from app.responses import JSONBytesResponse, dumps, model_list_response, not_modified
 
 router = APIRouter(prefix="/resumes", tags=["Resumes"])
 
 
 @router.get("", response_model=List[ResumeResponse])
-def get_resumes(current_user: User = Depends(get_current_user)):
+def get_resumes(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """Get all resumes for current user"""
-    return current_user.resumes
+    
+    token = change_tokens.current(db, current_user.id)
+    cached = not_modified(request, token)
+    if cached is not None:
+        return cached
+    
+    return model_list_response(ResumeResponse, current_user.resumes, headers=token.headers())
+
+
+@router.post("/export-zip")
+def export_resumes_zip(
+    export_request: ResumeBulkExportRequest,
+    current_user: User = Depends(get_current_admin)
+):
+    """Export many resumes as a streamed ZIP of PDFs (admin only)"""
+    
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    
+    return StreamingResponse(
+        export_service.iter_resumes_zip(**export_request.dict()),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=resumes_{timestamp}.zip"}
+    )
+
+
+@router.post("/job-match", response_model=JobMatchResponse)
+def match_job(
+    match_request: JobMatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Rank the current user's achievements and skills against a job description"""
+    
+    resume = None
+    if match_request.resume_id is not None:
+        resume = db.query(Resume).filter(
+            Resume.id == match_request.resume_id,
+            Resume.user_id == current_user.id
+        ).first()
+        
+        if not resume:
+            raise HTTPException(status_code=404, detail="Resume not found")
+    
+    user_data = resume_service.get_user_complete_data(db, current_user)
+    sections = match_service.top_matches(user_data, match_request.job_description, top_k=match_request.top_k)
+    
+    if resume is not None:
+        # Sections with no relevant items are left out, so they render in full.
+        # Reassign (not mutate) so SQLAlchemy notices the JSON change.
+        resume.configuration = {
+            **(resume.configuration or {}),
+            "selected_content": {
+                section: [item["id"] for item in items] for section, items in sections.items() if items
+            },
+        }
+        db.commit()
+    
+    return {"sections": sections, "saved_resume_id": resume.id if resume is not None else None}
 
 
 @router.get("/{resume_id}", response_model=ResumeFullResponse)
 def get_resume(
     resume_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific resume with full data"""
     
+    # Any write that could change this response advances the user's token,
+    # so a matching validator proves the client's copy is still current
+    token = change_tokens.current(db, current_user.id)
+    cached = not_modified(request, token)
+    if cached is not None:
+        return cached
+    
     resume = db.query(Resume).filter(
         Resume.id == resume_id,
         Resume.user_id == current_user.id
@@ -45,28 +119,37 @@ def get_resume(
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Get complete user data
-    user_data = resume_service.get_user_complete_data(db, current_user)
+    # Profile JSON is serialized once per change and spliced in as bytes
+    user_data = profile_cache.get_or_build(
+        current_user.id, token.version, lambda: resume_service.get_user_complete_data(db, current_user)
+    )
     
-    # Convert resume to dict and add user data
-    resume_dict = {
-        "id": resume.id,
-        "user_id": resume.user_id,
-        "title": resume.title,
-        "template": resume.template,
-        "summary": resume.summary,
-        "is_ai_generated_summary": bool(resume.is_ai_generated_summary),
-        "configuration": resume.configuration,
-        "is_public": bool(resume.is_public),
-        "public_url_slug": resume.public_url_slug,
-        "view_count": resume.view_count,
-        "last_generated_at": resume.last_generated_at,
-        "created_at": resume.created_at,
-        "updated_at": resume.updated_at,
-        "user_data": user_data
-    }
-    
-    return resume_dict
+    resume_dict = resume_service.resume_fields(resume)
+    
+    return JSONBytesResponse(
+        dumps(resume_dict)[:-1] + b',"user_data":' + user_data + b"}", headers=token.headers()
+    )
+
+
+@router.websocket("/{resume_id}/live")
+async def live_resume(websocket: WebSocket, resume_id: int):
+    """Stream the resume, then diffs against the last acknowledged version (see live_service)"""
+    
+    await websocket.accept()
+    credentials = await receive_credentials(websocket)
+    if credentials is None:
+        await websocket.close(CLOSE_UNAUTHORIZED)
+        return
+    
+    user_id, expires_at = credentials
+    session = LiveSession(websocket, user_id, resume_id, expires_at)
+    if not live_hub.add(session):
+        await websocket.close(CLOSE_TOO_MANY)
+        return
+    try:
+        await session.run()
+    finally:
+        live_hub.remove(session)
 
 
 @router.post("", response_model=ResumeResponse, status_code=status.HTTP_201_CREATED)
@@ -80,8 +163,9 @@ def create_resume(
     # Generate AI summary if requested
     summary = resume_data.summary
     if resume_data.is_ai_generated_summary or not summary:
-        user_data = resume_service.get_user_complete_data(db, current_user)
-        summary = resume_service.generate_ai_summary(user_data)
+        with admission.admit("ai", f"user:{current_user.id}"):
+            user_data = resume_service.get_user_complete_data(db, current_user)
+            summary = resume_service.generate_ai_summary(user_data)
     
     # Generate public URL slug if public
     public_url_slug = None
@@ -126,10 +210,10 @@ def update_resume(
     
     update_data = resume_update.dict(exclude_unset=True)
     
-    # Regenerate AI summary if requested
-    if update_data.get('is_ai_generated_summary', False):
-        user_data = resume_service.get_user_complete_data(db, current_user)
-        update_data['summary'] = resume_service.generate_ai_summary(user_data)
+    # The AI summary is regenerated after the other fields are saved
+    regenerate = update_data.get('is_ai_generated_summary', False)
+    if regenerate:
+        update_data.pop('summary', None)
     
     # Update public URL slug if changing to public
     if 'is_public' in update_data and update_data['is_public'] and not resume.public_url_slug:
@@ -141,7 +225,14 @@ def update_resume(
         else:
             setattr(resume, field, value)
     
+    resume_id, user_id = resume.id, current_user.id  # Read before commit expires them
     db.commit()
+    
+    if regenerate:
+        # Rapid saves share one generation (and one admission) from the latest profile;
+        # the session stays out of a transaction meanwhile, so no connection is held
+        summary_scheduler.regenerate(resume_id, user_id)
+    
     db.refresh(resume)
     
     return resume
@@ -183,27 +274,27 @@ def regenerate_summary(
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Generate new AI summary
-    user_data = resume_service.get_user_complete_data(db, current_user)
-    new_summary = resume_service.generate_ai_summary(user_data)
+    resume_id, user_id = resume.id, current_user.id
+    db.rollback()  # Don't hold a connection while the summary is generated
     
-    resume.summary = new_summary
-    resume.is_ai_generated_summary = 1
-    resume.last_generated_at = datetime.utcnow()
+    # Generate a new AI summary, shared with concurrent requests for this resume;
+    # the scheduler admits the generation against the "ai" limits
+    summary_scheduler.regenerate(resume_id, user_id, force=True)
     
-    db.commit()
     db.refresh(resume)
     
     return resume
 
 
-@router.get("/{resume_id}/export-pdf")
-def export_resume_pdf(
+@router.get("/{resume_id}/revisions", response_model=List[ResumeRevisionResponse])
+def get_resume_revisions(
     resume_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Export resume as PDF"""
+    """List a resume's saved revisions, newest first"""
     
     resume = db.query(Resume).filter(
         Resume.id == resume_id,
@@ -213,186 +304,118 @@ def export_resume_pdf(
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Get complete user data
-    user_data = resume_service.get_user_complete_data(db, current_user)
+    return revision_service.history(db, resume.id, limit=limit, offset=offset)
+
+
+@router.get("/{resume_id}/revisions/compare", response_model=ResumeRevisionComparison)
+def compare_resume_revisions(
+    resume_id: int,
+    from_number: int = Query(..., alias="from", ge=1),
+    to_number: Optional[int] = Query(None, alias="to", ge=1),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Compare two revisions of a resume (``to`` defaults to the latest)"""
     
-    # Create PDF in memory
-    buffer = io.BytesIO()
+    resume = db.query(Resume).filter(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ).first()
     
-    # Create PDF document
-    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
-                           topMargin=72, bottomMargin=18)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Container for PDF elements
-    story = []
+    if to_number is None:
+        to_number = revision_service.latest_number(db, resume.id)
+    old = revision_service.content_at(db, resume.id, from_number)
+    new = revision_service.content_at(db, resume.id, to_number) if to_number else None
+    if old is None or new is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
     
-    # Define styles
-    styles = getSampleStyleSheet()
+    return {"from_number": from_number, "to_number": to_number, "changes": revision_service.compare(old, new)}
+
+
+@router.get("/{resume_id}/revisions/{number}", response_model=ResumeRevisionDetail)
+def get_resume_revision(
+    resume_id: int,
+    number: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get a resume's content as of one revision"""
     
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1e40af'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-    )
+    resume = db.query(Resume).filter(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ).first()
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#1e40af'),
-        spaceAfter=12,
-        spaceBefore=12,
-        borderWidth=0,
-        borderColor=colors.HexColor('#1e40af'),
-        borderPadding=5,
-    )
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
     
-    contact_style = ParagraphStyle(
-        'ContactStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#4b5563'),
-        alignment=TA_CENTER,
-    )
+    meta = revision_service.history(db, resume.id, limit=1, number=number)
+    content = revision_service.content_at(db, resume.id, number)
+    if not meta or content is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
     
-    body_style = ParagraphStyle(
-        'BodyStyle',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.HexColor('#374151'),
-        alignment=TA_JUSTIFY,
-        spaceAfter=6,
-    )
+    return {**meta[0], "content": content}
+
+
+@router.post("/{resume_id}/revisions/{number}/restore", response_model=ResumeResponse)
+def restore_resume_revision(
+    resume_id: int,
+    number: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Restore a resume's content from a revision (recorded as a new revision)"""
     
-    subheading_style = ParagraphStyle(
-        'SubheadingStyle',
-        parent=styles['Normal'],
-        fontSize=12,
-        textColor=colors.HexColor('#111827'),
-        spaceAfter=4,
-        fontName='Helvetica-Bold',
-    )
+    resume = db.query(Resume).filter(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ).first()
+    
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    content = revision_service.content_at(db, resume.id, number)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    
+    for field, value in content.items():
+        setattr(resume, field, value)
+    
+    revision_service.tag(db, "restore")
+    db.commit()
+    db.refresh(resume)
+    
+    return resume
+
+
+@router.get("/{resume_id}/export-pdf", dependencies=[Depends(limit_user("pdf"))])
+def export_resume_pdf(
+    resume_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Export resume as PDF"""
+    
+    resume = db.query(Resume).filter(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ).first()
+    
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    # Get complete user data, narrowed to any tailored selection
+    user_data = resume_service.get_user_complete_data(db, current_user)
+    user_data = resume_service.select_content(user_data, resume.configuration)
     
-    # Add name (title)
-    story.append(Paragraph(user_data['full_name'], title_style))
-    
-    # Add contact information
-    contact_parts = []
-    if user_data.get('email'):
-        contact_parts.append(user_data['email'])
-    if user_data.get('phone'):
-        contact_parts.append(user_data['phone'])
-    if user_data.get('location'):
-        contact_parts.append(user_data['location'])
-    
-    if contact_parts:
-        story.append(Paragraph(' • '.join(contact_parts), contact_style))
-        story.append(Spacer(1, 0.1*inch))
-    
-    # Add links
-    links_parts = []
-    if user_data.get('linkedin_url'):
-        links_parts.append(f'<a href="{user_data["linkedin_url"]}">LinkedIn</a>')
-    if user_data.get('github_url'):
-        links_parts.append(f'<a href="{user_data["github_url"]}">GitHub</a>')
-    if user_data.get('portfolio_url'):
-        links_parts.append(f'<a href="{user_data["portfolio_url"]}">Portfolio</a>')
-    
-    if links_parts:
-        story.append(Paragraph(' • '.join(links_parts), contact_style))
-    
-    story.append(Spacer(1, 0.3*inch))
-    
-    # Add summary
-    if resume.summary:
-        story.append(Paragraph('Professional Summary', heading_style))
-        story.append(Paragraph(resume.summary, body_style))
-        story.append(Spacer(1, 0.2*inch))
-    
-    # Add Experience (Internships)
-    if user_data.get('internships') and len(user_data['internships']) > 0:
-        story.append(Paragraph('Experience', heading_style))
-        for intern in user_data['internships']:
-            # Position and Company
-            story.append(Paragraph(f"<b>{intern['position']}</b>", subheading_style))
-            company_date = f"{intern['company_name']}"
-            if intern.get('start_date'):
-                end_date = 'Present' if intern.get('is_current') else (intern.get('end_date', '')[:10] if intern.get('end_date') else '')
-                company_date += f" | {intern['start_date'][:10]} - {end_date}"
-            story.append(Paragraph(company_date, body_style))
-            
-            if intern.get('description'):
-                story.append(Paragraph(intern['description'], body_style))
-            if intern.get('achievements'):
-                story.append(Paragraph(f"• {intern['achievements']}", body_style))
-            story.append(Spacer(1, 0.15*inch))
-        story.append(Spacer(1, 0.1*inch))
-    
-    # Add Projects
-    if user_data.get('projects') and len(user_data['projects']) > 0:
-        story.append(Paragraph('Projects', heading_style))
-        for project in user_data['projects']:
-            story.append(Paragraph(f"<b>{project['project_name']}</b>", subheading_style))
-            
-            if project.get('start_date'):
-                end_date = 'Ongoing' if project.get('is_ongoing') else (project.get('end_date', '')[:10] if project.get('end_date') else '')
-                story.append(Paragraph(f"{project['start_date'][:10]} - {end_date}", body_style))
-            
-            if project.get('description'):
-                story.append(Paragraph(project['description'], body_style))
-            
-            if project.get('technologies'):
-                story.append(Paragraph(f"<b>Technologies:</b> {project['technologies']}", body_style))
-            
-            story.append(Spacer(1, 0.15*inch))
-        story.append(Spacer(1, 0.1*inch))
-    
-    # Add Education/Courses
-    if user_data.get('courses') and len(user_data['courses']) > 0:
-        story.append(Paragraph('Education & Certifications', heading_style))
-        for course in user_data['courses']:
-            story.append(Paragraph(f"<b>{course['course_name']}</b>", subheading_style))
-            story.append(Paragraph(course['platform'], body_style))
-            if course.get('completion_date'):
-                story.append(Paragraph(course['completion_date'][:10], body_style))
-            story.append(Spacer(1, 0.1*inch))
-        story.append(Spacer(1, 0.1*inch))
-    
-    # Add Skills
-    if user_data.get('skills') and len(user_data['skills']) > 0:
-        story.append(Paragraph('Skills', heading_style))
-        skills_list = [skill['skill']['name'] for skill in user_data['skills']]
-        story.append(Paragraph(', '.join(skills_list), body_style))
-        story.append(Spacer(1, 0.2*inch))
-    
-    # Add Hackathons
-    if user_data.get('hackathons') and len(user_data['hackathons']) > 0:
-        story.append(Paragraph('Hackathons & Competitions', heading_style))
-        for hackathon in user_data['hackathons']:
-            story.append(Paragraph(f"<b>{hackathon['hackathon_name']}</b>", subheading_style))
-            hack_info = hackathon['organizer']
-            if hackathon.get('participation_date'):
-                hack_info += f" | {hackathon['participation_date'][:10]}"
-            story.append(Paragraph(hack_info, body_style))
-            if hackathon.get('position'):
-                story.append(Paragraph(hackathon['position'], body_style))
-            story.append(Spacer(1, 0.1*inch))
-    
-    # Build PDF
-    doc.build(story)
-    
-    # Get PDF from buffer
-    buffer.seek(0)
-    
-    # Generate filename
-    filename = f"{user_data['full_name'].replace(' ', '_')}_Resume.pdf"
+    pdf = pdf_service.get_or_render(resume.summary, user_data)
+    filename = pdf_service.filename_for(user_data)
     
     return StreamingResponse(
-        buffer,
+        io.BytesIO(pdf),
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
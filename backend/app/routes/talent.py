@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.schemas.talent import TalentSearchResponse, CandidateMatchRequest, CandidateMatchResponse
+from app.auth import get_current_user
+from app.services.talent_service import talent_service, TalentQueryError
+from app.services.candidate_service import candidate_service
+
+router = APIRouter(prefix="/talent", tags=["Talent Search"])
+
+
+@router.get("/search", response_model=TalentSearchResponse)
+def search_talent(
+    q: str = Query(..., min_length=1, max_length=500,
+                   description='e.g. "Python AND (FastAPI OR Django), verified, >=2 years"'),
+    verified: bool = False,
+    min_years: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Search public profiles by skills, ranked by proficiency and verification"""
+    
+    try:
+        results = talent_service.search(db, q, verified_only=verified, min_years=min_years, limit=limit)
+    except TalentQueryError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return {"query": q, "results": results}
+
+
+@router.post("/job-match", response_model=CandidateMatchResponse)
+def match_candidates(
+    match_request: CandidateMatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Rank all public profiles against a job description"""
+    
+    results = candidate_service.match(db, match_request.job_description, limit=match_request.limit)
+    return {"results": results}
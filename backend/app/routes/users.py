@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
 from app.auth import get_current_user
+from app.services.account_service import account_service
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -33,3 +38,35 @@ def update_current_user(
     
     return current_user
 
+
+
+@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+def delete_current_user(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete the current user's account and all of their data"""
+    
+    account_service.delete_user(db, current_user.id)
+
+
+@router.get("/me/export")
+def export_current_user(
+    format: Literal["ndjson", "zip"] = Query("ndjson"),
+    current_user: User = Depends(get_current_user)
+):
+    """Download all of the current user's data as NDJSON or a ZIP archive"""
+    
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    filename = f"account_{current_user.id}_{timestamp}.{format}"
+    
+    if format == "zip":
+        body, media_type = account_service.iter_zip(current_user.id), "application/zip"
+    else:
+        body, media_type = account_service.iter_ndjson(current_user.id), "application/x-ndjson"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -153,3 +153,27 @@ class UserSkillResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class SkillSuggestion(BaseModel):
+    skill_id: int
+    name: str
+    category: Optional[str] = None
+    score: float
+    co_occurrences: int
+
+
+class AchievementSearchHit(BaseModel):
+    kind: str  # internship, course, hackathon, project
+    id: int
+    title: str
+    snippet: Optional[str] = None
+    rank: float
+
+
+class AchievementSearchResponse(BaseModel):
+    query: str
+    limit: int
+    offset: int
+    has_more: bool
+    results: List[AchievementSearchHit]
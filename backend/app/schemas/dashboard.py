@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, List
+from datetime import datetime
+
+
+class DashboardItem(BaseModel):
+    id: int
+    title: str
+    subtitle: Optional[str] = None
+    date: Optional[datetime] = None
+    verification_status: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class DashboardSkill(BaseModel):
+    id: int
+    name: str
+    category: Optional[str] = None
+    proficiency_level: Optional[str] = None
+    verified_count: Optional[int] = 0
+
+
+class DashboardResume(BaseModel):
+    id: int
+    title: str
+    template: str
+    is_public: bool
+    public_url_slug: Optional[str] = None
+    view_count: int
+    last_generated_at: Optional[datetime] = None
+    updated_at: datetime
+
+
+class DashboardResponse(BaseModel):
+    """Counts, verification breakdowns and recent items for the signed-in user"""
+    counts: Dict[str, int]
+    verification: Dict[str, Dict[str, int]]
+    recent: Dict[str, List[DashboardItem]]
+    skills: List[DashboardSkill]
+    resumes: List[DashboardResume]
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class StoredObjectResponse(BaseModel):
+    sha256: str
+    size: int
+    content_type: str
+    url: str
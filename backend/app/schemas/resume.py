@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -45,3 +45,58 @@ class ResumeFullResponse(ResumeResponse):
     class Config:
         from_attributes = True
 
+
+
+class ResumeContent(BaseModel):
+    """The versioned part of a resume"""
+    title: str
+    template: Optional[str] = None
+    summary: Optional[str] = None
+    is_ai_generated_summary: bool = True
+    configuration: Optional[Dict[str, Any]] = None
+
+
+class ResumeRevisionResponse(BaseModel):
+    number: int
+    kind: str  # snapshot or delta
+    source: str  # create, edit, ai_summary, restore, initial
+    fields: List[str]  # Fields this revision changed
+    stored_bytes: int
+    created_at: datetime
+
+
+class ResumeRevisionDetail(ResumeRevisionResponse):
+    content: ResumeContent
+
+
+class ResumeRevisionComparison(BaseModel):
+    from_number: int
+    to_number: int
+    # title/template/is_ai_generated_summary: {"from", "to"}; configuration: JSON Patch ops;
+    # summary: [{"op": "equal" | "delete" | "insert", "text": ...}]
+    changes: Dict[str, Any]
+
+
+class ResumeBulkExportRequest(BaseModel):
+    """Select resumes for bulk export by explicit ids and/or a filter"""
+    resume_ids: Optional[List[int]] = None
+    user_ids: Optional[List[int]] = None
+    public_only: bool = False
+    updated_since: Optional[datetime] = None
+
+
+class JobMatchRequest(BaseModel):
+    job_description: str = Field(..., min_length=1, max_length=50000)
+    top_k: int = Field(3, ge=1, le=50)
+    resume_id: Optional[int] = None  # Save the selection into this resume's configuration
+
+
+class JobMatchItem(BaseModel):
+    id: int
+    title: str
+    score: float
+
+
+class JobMatchResponse(BaseModel):
+    sections: Dict[str, List[JobMatchItem]]
+    saved_resume_id: Optional[int] = None
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+
+class TalentSearchHit(BaseModel):
+    user_id: int
+    full_name: str
+    public_url_slug: Optional[str] = None
+    score: float
+    matched_skills: List[str]
+
+
+class TalentSearchResponse(BaseModel):
+    query: str
+    results: List[TalentSearchHit]
+
+
+class CandidateMatchRequest(BaseModel):
+    job_description: str = Field(..., min_length=1, max_length=50000)
+    limit: int = Field(20, ge=1, le=200)
+
+
+class CandidateMatchHit(BaseModel):
+    user_id: int
+    full_name: str
+    public_url_slug: Optional[str] = None
+    score: float
+
+
+class CandidateMatchResponse(BaseModel):
+    results: List[CandidateMatchHit]
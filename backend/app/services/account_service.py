@@ -0,0 +1,179 @@
+"""Account deletion and personal-data export.
+
+Deleting a user is one DELETE on ``users``: every table keyed by the user
+declares ``ON DELETE CASCADE`` (with ``passive_deletes`` on the ORM side), so
+the database removes the children itself and nothing is loaded into the
+session. Files that no remaining achievement points to and no other user
+uploaded are removed from the file store afterwards.
+
+Exports are streamed from server-side cursors ``yield_per`` rows at a time,
+either as NDJSON (one ``{"type": ..., "data": ...}`` object per line) or as a
+ZIP holding one NDJSON file per section plus the files the user uploaded, so
+memory use does not grow with the size of the account. Resume revisions are
+exported with each revision's full content, replayed from the stored
+snapshots and deltas as the rows stream past.
+"""
+import os
+import zipfile
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.achievement import Internship, Course, Hackathon, Project, Skill, UserSkill
+from app.models.resume import Resume
+from app.models.resume_revision import ResumeRevision
+from app.models.stored_object import StoredObject, StoredObjectUpload
+from app.models.user import User
+from app.models.user_stats import UserStats
+from app.responses import dumps
+from app.services import profile_events, revision_service
+from app.services.export_service import ZipStreamWriter
+from app.services.storage_service import FILES_PREFIX, storage_service
+
+CERTIFICATE_MODELS = (Internship, Course, Hackathon)
+FILE_CHUNK_BYTES = 64 * 1024
+
+
+class AccountService:
+    """Deletes accounts and streams their data out"""
+
+    YIELD_PER = 500
+
+    def __init__(self, yield_per: int = YIELD_PER):
+        self.yield_per = yield_per
+
+    # Deletion
+
+    @staticmethod
+    def _certificate_digests(db: Session, user_id: int) -> Set[str]:
+        digests = set()
+        for model in CERTIFICATE_MODELS:
+            urls = db.execute(
+                select(model.certificate_url)
+                .where(model.user_id == user_id, model.certificate_url.like(f"{FILES_PREFIX}%"))
+            ).scalars()
+            digests.update(url[len(FILES_PREFIX):] for url in urls)
+        return digests
+
+    @staticmethod
+    def _uploaded_digests(db: Session, user_id: int) -> Set[str]:
+        """Files the user uploaded, the only ones they may read (see StorageService.may_read)"""
+        return set(db.execute(
+            select(StoredObject.sha256)
+            .outerjoin(StoredObjectUpload, (StoredObjectUpload.sha256 == StoredObject.sha256)
+                       & (StoredObjectUpload.user_id == user_id))
+            .where(or_(StoredObject.uploaded_by == user_id, StoredObjectUpload.user_id.is_not(None)))
+        ).scalars())
+
+    @staticmethod
+    def _still_referenced(db: Session, digests: Set[str]) -> Set[str]:
+        urls = [storage_service.url_for(digest) for digest in digests]
+        referenced = set(db.execute(
+            select(StoredObjectUpload.sha256).where(StoredObjectUpload.sha256.in_(digests))
+        ).scalars())
+        for model in CERTIFICATE_MODELS:
+            found = db.execute(select(model.certificate_url).where(model.certificate_url.in_(urls))).scalars()
+            referenced.update(url[len(FILES_PREFIX):] for url in found)
+        return referenced
+
+    def delete_user(self, db: Session, user_id: int) -> int:
+        """Delete the user and everything they own; returns how many files were removed"""
+        digests = self._certificate_digests(db, user_id) | self._uploaded_digests(db, user_id)
+
+        db.execute(delete(User).where(User.id == user_id))  # Children go with it (ON DELETE CASCADE)
+
+        # Identical files are shared between users; keep any someone else uploaded or still uses
+        orphaned = digests - self._still_referenced(db, digests) if digests else set()
+        if orphaned:
+            db.execute(delete(StoredObject).where(StoredObject.sha256.in_(orphaned)))
+        db.commit()
+
+        for digest in orphaned:
+            try:
+                os.remove(storage_service.path_for(digest))
+            except FileNotFoundError:
+                pass
+        # A bulk DELETE bypasses the flush hooks, so tell the caches directly
+        profile_events.notify({user_id})
+        return len(orphaned)
+
+    # Export
+
+    def _sections(self, db: Session, user_id: int) -> List[Tuple[str, Any]]:
+        """(section, statement) pairs in export order"""
+        user_columns = [c for c in User.__table__.c if c.name != "hashed_password"]
+        skill_columns = [*UserSkill.__table__.c, Skill.name.label("skill_name"), Skill.category.label("skill_category")]
+        sections = [("user", select(*user_columns).where(User.id == user_id))]
+        for name, model in (("internships", Internship), ("courses", Course),
+                            ("hackathons", Hackathon), ("projects", Project)):
+            sections.append((name, select(model.__table__).where(model.user_id == user_id).order_by(model.id)))
+        sections += [
+            ("skills", select(*skill_columns).join(Skill, Skill.id == UserSkill.skill_id)
+                .where(UserSkill.user_id == user_id).order_by(UserSkill.id)),
+            ("resumes", select(Resume.__table__).where(Resume.user_id == user_id).order_by(Resume.id)),
+            ("resume_revisions", select(ResumeRevision.__table__).join(Resume, Resume.id == ResumeRevision.resume_id)
+                .where(Resume.user_id == user_id).order_by(ResumeRevision.resume_id, ResumeRevision.number)),
+            ("stats", select(UserStats.__table__).where(UserStats.user_id == user_id)),
+        ]
+        digests = sorted(self._uploaded_digests(db, user_id))
+        if digests:
+            sections.append(("files", select(StoredObject.__table__).where(StoredObject.sha256.in_(digests))))
+        return sections
+
+    def _rows(self, db: Session, section: str, statement) -> Iterator[Dict[str, Any]]:
+        result = db.execute(statement.execution_options(yield_per=self.yield_per))
+        rows = (dict(row) for row in result.mappings())
+        if section == "resume_revisions":
+            return revision_service.contents(rows)  # Payloads are compressed deltas
+        return rows
+
+    def iter_ndjson(self, user_id: int) -> Iterator[bytes]:
+        db = SessionLocal()
+        try:
+            for section, statement in self._sections(db, user_id):
+                lines = []
+                for row in self._rows(db, section, statement):
+                    lines.append(dumps({"type": section, "data": row}))
+                    if len(lines) >= self.yield_per:
+                        yield b"\n".join(lines) + b"\n"
+                        lines = []
+                if lines:
+                    yield b"\n".join(lines) + b"\n"
+        finally:
+            db.close()
+
+    def iter_zip(self, user_id: int) -> Iterator[bytes]:
+        db = SessionLocal()
+        sink = ZipStreamWriter()
+        try:
+            with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+                files = []
+                for section, statement in self._sections(db, user_id):
+                    with archive.open(f"{section}.ndjson", mode="w", force_zip64=True) as entry:
+                        for i, row in enumerate(self._rows(db, section, statement), 1):
+                            entry.write(dumps(row) + b"\n")
+                            if section == "files":
+                                files.append(row["sha256"])
+                            if i % self.yield_per == 0:
+                                yield sink.drain()
+                    yield sink.drain()
+
+                for digest in files:
+                    path = storage_service.path_for(digest)
+                    if not os.path.exists(path):
+                        continue
+                    with open(path, "rb") as source, \
+                            archive.open(f"files/{digest}", mode="w", force_zip64=True) as entry:
+                        while chunk := source.read(FILE_CHUNK_BYTES):
+                            entry.write(chunk)
+                            yield sink.drain()
+
+            # Central directory is written when the archive closes
+            yield sink.drain()
+        finally:
+            db.close()
+
+
+account_service = AccountService()
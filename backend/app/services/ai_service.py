@@ -1,73 +1,37 @@
-from typing import Dict, Any, List
-from app.config import settings
+import threading
+from typing import Dict, Any, List, Optional
+from app import metrics
+from app.services import llm_providers, prompt_builder
+
+SYSTEM_PROMPT = "You are a professional resume writer. Create concise, impactful professional summaries."
 
 
 class AIService:
     """Service for AI-powered resume generation features"""
     
     def __init__(self):
-        self.has_openai = bool(settings.openai_api_key)
-        self.has_hf = bool(settings.hf_token)
+        self.providers = llm_providers.build_registry()
+    
+    def warm_up(self) -> None:
+        """Import the OpenAI client ahead of the first summary (it is loaded lazily)"""
+        if self.providers:
+            import openai  # noqa: F401
     
     def generate_resume_summary(self, user_data: Dict[str, Any]) -> str:
         """Generate a professional resume summary based on user's achievements"""
         
-        if self.has_hf:
-            return self._generate_with_huggingface(user_data)
-        elif self.has_openai:
-            return self._generate_with_openai(user_data)
-        else:
+        if not self.providers:
             return self._generate_fallback_summary(user_data)
-    
-    def _generate_with_huggingface(self, user_data: Dict[str, Any]) -> str:
-        """Generate summary using Hugging Face Router API"""
-        try:
-            from openai import OpenAI
-            
-            client = OpenAI(
-                base_url="https://router.huggingface.co/v1",
-                api_key=settings.hf_token,
-            )
-            
-            prompt = self._build_prompt(user_data)
-            
-            completion = client.chat.completions.create(
-                model="openai/gpt-oss-120b:groq",
-                messages=[
-                    {"role": "system", "content": "You are a professional resume writer. Create concise, impactful professional summaries."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.7
-            )
-            
-            return completion.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"Hugging Face API error: {e}")
-            return self._generate_fallback_summary(user_data)
-    
-    def _generate_with_openai(self, user_data: Dict[str, Any]) -> str:
-        """Generate summary using OpenAI API"""
+        
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": self._build_prompt(user_data)},
+        ]
         try:
-            from openai import OpenAI
-            
-            client = OpenAI(api_key=settings.openai_api_key)
-            
-            prompt = self._build_prompt(user_data)
-            
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a professional resume writer. Create concise, impactful professional summaries."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"OpenAI API error: {e}")
+            with metrics.timed("llm"):
+                return self.providers.complete(messages, max_tokens=200, temperature=0.7)
+        except llm_providers.ProviderError as e:
+            print(f"LLM providers failed: {e}")
             return self._generate_fallback_summary(user_data)
     
     def _generate_fallback_summary(self, user_data: Dict[str, Any]) -> str:
@@ -82,15 +46,20 @@ class AIService:
         hackathons = user_data.get('hackathons', [])
         projects = user_data.get('projects', [])
         skills = user_data.get('skills', [])
+        stats = user_data.get('stats')
         
-        # Count experiences
-        total_internships = len(internships)
-        total_courses = len(courses)
-        total_hackathons = len(hackathons)
-        total_projects = len(projects)
+        # Count experiences (precomputed counters when the whole profile is in play)
+        counts = stats['counts'] if stats else {}
+        total_internships = counts.get('internships', len(internships))
+        total_courses = counts.get('courses', len(courses))
+        total_hackathons = counts.get('hackathons', len(hackathons))
+        total_projects = counts.get('projects', len(projects))
         
         # Get top skills
-        skill_names = [s.get('skill', {}).get('name', '') for s in skills[:5]]
+        if stats:
+            skill_names = stats['top_skills'][:5]
+        else:
+            skill_names = [s.get('skill', {}).get('name', '') for s in skills[:5]]
         
         # Build summary
         summary_parts = []
@@ -131,45 +100,8 @@ class AIService:
         return " ".join(summary_parts)
     
     def _build_prompt(self, user_data: Dict[str, Any]) -> str:
-        """Build a prompt for OpenAI"""
-        
-        full_name = user_data.get('full_name', 'the candidate')
-        internships = user_data.get('internships', [])
-        courses = user_data.get('courses', [])
-        hackathons = user_data.get('hackathons', [])
-        projects = user_data.get('projects', [])
-        skills = user_data.get('skills', [])
-        
-        prompt = f"Create a professional resume summary for {full_name} based on the following information:\n\n"
-        
-        if internships:
-            prompt += f"Internships: {len(internships)} positions at companies including "
-            prompt += ", ".join([i.get('company_name', '') for i in internships[:3]])
-            prompt += "\n"
-        
-        if projects:
-            prompt += f"Projects: {len(projects)} projects "
-            project_techs = []
-            for p in projects[:3]:
-                if p.get('technologies'):
-                    project_techs.append(p['technologies'])
-            if project_techs:
-                prompt += f"using technologies like {', '.join(project_techs[:5])}"
-            prompt += "\n"
-        
-        if hackathons:
-            prompt += f"Hackathons: Participated in {len(hackathons)} hackathons\n"
-        
-        if courses:
-            prompt += f"Courses: Completed {len(courses)} courses\n"
-        
-        if skills:
-            skill_names = [s.get('skill', {}).get('name', '') for s in skills[:8]]
-            prompt += f"Skills: {', '.join(skill_names)}\n"
-        
-        prompt += "\nWrite a compelling 3-4 sentence professional summary that highlights their key strengths and value proposition."
-        
-        return prompt
+        """Build a prompt for OpenAI from the most informative achievements"""
+        return prompt_builder.build(user_data).text
     
     def suggest_skills(self, achievements: List[Dict[str, Any]]) -> List[str]:
         """Suggest skills based on achievements"""
@@ -186,6 +118,16 @@ class AIService:
         return list(suggested_skills)
 
 
-# Singleton instance
-ai_service = AIService()
+# Singleton instance, created on first use
+_ai_service: Optional[AIService] = None
+_ai_service_lock = threading.Lock()
+
+
+def get_ai_service() -> AIService:
+    global _ai_service
+    if _ai_service is None:
+        with _ai_service_lock:
+            if _ai_service is None:
+                _ai_service = AIService()
+    return _ai_service
 
@@ -0,0 +1,344 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.achievement import Internship, Course, Hackathon, Project, Skill, UserSkill
+from app.models.resume import Resume
+from app.models.user import User
+from app.services import profile_events
+from app.services.match_service import SECTION_FIELDS, N_FEATURES, hash_features
+
+SECTION_MODELS = {
+    "internships": Internship,
+    "projects": Project,
+    "hackathons": Hackathon,
+    "courses": Course,
+}
+
+ARRAYS = ("users", "rows", "indices", "values", "df")
+
+
+class Segment(NamedTuple):
+    """Sparse candidate rows in coordinate form: entry -> (row, feature, value)"""
+    users: np.ndarray  # row -> user id
+    rows: np.ndarray
+    indices: np.ndarray
+    values: np.ndarray
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        # One sparse matrix-vector product
+        return np.bincount(self.rows, weights=self.values * query[self.indices], minlength=len(self.users))
+
+
+def _empty_segment() -> Segment:
+    return Segment(
+        np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+        np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32),
+    )
+
+
+def _build_segment(vectors: Dict[int, Tuple[np.ndarray, np.ndarray]]) -> Segment:
+    if not vectors:
+        return _empty_segment()
+    users = np.fromiter(vectors.keys(), dtype=np.int64, count=len(vectors))
+    lengths = np.fromiter((len(v[0]) for v in vectors.values()), dtype=np.int64, count=len(vectors))
+    return Segment(
+        users,
+        np.repeat(np.arange(len(users), dtype=np.int64), lengths),
+        np.concatenate([v[0] for v in vectors.values()]),
+        np.concatenate([v[1] for v in vectors.values()]),
+    )
+
+
+class CandidateMatrix:
+    """Feature matrix of public profiles, for scoring one job against everyone.
+
+    The base segment lives on disk as .npy files opened with ``mmap_mode="r"``,
+    so worker processes share pages and restarts don't rebuild. Profiles that
+    change afterwards are re-vectorized into a small in-memory delta segment
+    that shadows their base rows; once the delta grows past a fraction of the
+    base (or the base is old) a fresh base generation is written atomically.
+    That rebuild runs on a background thread (or ``python -m app.cli
+    rebuild-candidates``) while queries keep using the current generation, and
+    a worker whose base is old first adopts a newer generation written by
+    another process rather than building its own.
+    """
+
+    CHUNK_USERS = 500
+
+    def __init__(self, directory: str, rebuild_interval_seconds: int, max_delta_ratio: float = 0.25):
+        self.directory = directory
+        self.rebuild_interval_seconds = rebuild_interval_seconds
+        self.max_delta_ratio = max_delta_ratio
+        self._base: Optional[Segment] = None
+        self._base_df: Optional[np.ndarray] = None
+        self._base_built_at = 0.0
+        self._generation: Optional[str] = None
+        self._shadowed = np.zeros(0, dtype=bool)  # base rows superseded by the delta
+        self._base_rows: Dict[int, int] = {}
+        self._delta: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._delta_segment = _empty_segment()
+        self._dirty: Set[int] = set()
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+
+    # Vectorizing profiles
+
+    def _profile_vectors(self, db: Session, user_ids: List[int]) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """L2-normalized hashed vectors for the public profiles among ``user_ids``"""
+        public = {
+            row.user_id for row in db.query(Resume.user_id)
+            .filter(Resume.user_id.in_(user_ids), Resume.is_public == 1).distinct()
+        }
+        texts: Dict[int, List[str]] = {user_id: [] for user_id in public}
+        if not public:
+            return {}
+
+        for section, model in SECTION_MODELS.items():
+            columns = [getattr(model, field) for field in SECTION_FIELDS[section]]
+            for row in db.query(model.user_id, *columns).filter(model.user_id.in_(public)):
+                texts[row[0]].extend(str(value) for value in row[1:] if value)
+        for row in db.query(UserSkill.user_id, Skill.name).join(Skill, Skill.id == UserSkill.skill_id) \
+                .filter(UserSkill.user_id.in_(public)):
+            texts[row.user_id].append(row.name)
+
+        vectors = {}
+        for user_id, parts in texts.items():
+            vector = hash_features(" ".join(parts))
+            norm = np.linalg.norm(vector.values)
+            if norm > 0:
+                vectors[user_id] = (vector.indices, (vector.values / norm).astype(np.float32))
+        return vectors
+
+    # Base generations on disk
+
+    def _current_path(self) -> str:
+        return os.path.join(self.directory, "CURRENT")
+
+    def _current_generation(self) -> Optional[str]:
+        try:
+            with open(self._current_path()) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _generation_time(generation: str) -> Optional[int]:
+        try:
+            return int(generation.split("-", 1)[0])
+        except ValueError:
+            return None
+
+    def _load_base(self) -> bool:
+        generation = self._current_generation()
+        if generation is None:
+            return False
+        try:
+            path = os.path.join(self.directory, generation)
+            arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+            built_at = os.path.getmtime(self._current_path())
+        except (OSError, ValueError):
+            return False
+        self._set_base(Segment(arrays["users"], arrays["rows"], arrays["indices"], arrays["values"]),
+                       arrays["df"], built_at, generation)
+        return True
+
+    def _set_base(self, base: Segment, df: np.ndarray, built_at: float, generation: Optional[str] = None) -> None:
+        # Profiles re-vectorized into the delta may be newer than the new base: vectorize them again
+        if self._base is not None:
+            self._dirty.update(self._delta)
+            self._dirty.update(int(self._base.users[row]) for row in np.flatnonzero(self._shadowed))
+        self._base = base
+        self._base_df = df
+        self._base_built_at = built_at
+        self._generation = generation
+        self._base_rows = {int(user_id): row for row, user_id in enumerate(base.users)}
+        self._shadowed = np.zeros(len(base.users), dtype=bool)
+        self._delta = {}
+        self._delta_segment = _empty_segment()
+
+    def _remove_old_generations(self, keep: Set[str]) -> None:
+        """Delete generations older than all of ``keep``.
+
+        Newer directories may be another worker's rebuild in progress, and the
+        generation CURRENT pointed to before the swap may still be about to be
+        opened by a worker that read CURRENT just before it changed.
+        """
+        cutoff = min((self._generation_time(g) or 0) for g in keep)
+        for entry in os.listdir(self.directory):
+            created = self._generation_time(entry)
+            if entry not in keep and created is not None and created < cutoff:
+                # Safe on POSIX even if another process still has the files mapped
+                shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+    def rebuild(self, db: Session) -> int:
+        """Vectorize every public profile into a new on-disk base generation; returns how many"""
+        with self._lock:
+            # Changes from here on are newer than the snapshot and stay dirty
+            self._dirty.clear()
+        public_ids = [row.user_id for row in db.query(Resume.user_id).filter(Resume.is_public == 1)
+                      .distinct().order_by(Resume.user_id)]
+        vectors: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        for start in range(0, len(public_ids), self.CHUNK_USERS):
+            vectors.update(self._profile_vectors(db, public_ids[start:start + self.CHUNK_USERS]))
+
+        base = _build_segment(vectors)
+        df = np.bincount(base.indices, minlength=N_FEATURES).astype(np.int32)
+
+        os.makedirs(self.directory, exist_ok=True)
+        generation = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        path = os.path.join(self.directory, generation)
+        os.makedirs(path, exist_ok=True)
+        for name, array in zip(ARRAYS, (*base, df)):
+            np.save(os.path.join(path, f"{name}.npy"), array)
+        previous = self._current_generation()
+        tmp = f"{self._current_path()}.{uuid.uuid4().hex[:8]}"
+        with open(tmp, "w") as f:
+            f.write(generation)
+        os.replace(tmp, self._current_path())
+
+        self._remove_old_generations({generation, previous} - {None})
+
+        with self._lock:
+            if not self._load_base():
+                self._set_base(base, df, time.time(), generation)
+        return len(vectors)
+
+    def _rebuild_in_background(self) -> None:
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        except Exception as e:
+            print(f"Candidate matrix rebuild failed: {e}")
+        finally:
+            db.close()
+            self._build_lock.release()
+
+    def _adopt_newer_generation(self) -> bool:
+        """Switch to a fresh generation another process wrote; False if there is none"""
+        generation = self._current_generation()
+        if generation is None or generation == self._generation:
+            return False
+        try:
+            fresh = time.time() - os.path.getmtime(self._current_path()) <= self.rebuild_interval_seconds
+        except OSError:
+            return False
+        with self._lock:
+            return fresh and self._load_base()
+
+    # Incremental updates
+
+    def on_profile_change(self, user_ids: Set[int]) -> None:
+        with self._lock:
+            self._dirty.update(user_ids)
+
+    def _apply_dirty(self, db: Session) -> None:
+        with self._lock:
+            dirty, self._dirty = list(self._dirty), set()
+        if not dirty:
+            return
+        vectors = self._profile_vectors(db, dirty)
+        with self._lock:
+            for user_id in dirty:
+                row = self._base_rows.get(user_id)
+                if row is not None:
+                    self._shadowed[row] = True
+                if user_id in vectors:
+                    self._delta[user_id] = vectors[user_id]
+                else:
+                    self._delta.pop(user_id, None)  # No longer public
+            self._delta_segment = _build_segment(self._delta)
+
+    def _ensure_fresh(self, db: Session) -> None:
+        if self._base is None:
+            with self._build_lock:
+                os.makedirs(self.directory, exist_ok=True)
+                if self._base is None and not self._load_base():
+                    self.rebuild(db)  # Nothing to serve yet, so this one has to wait
+        stale = time.time() - self._base_built_at > self.rebuild_interval_seconds
+        oversized = len(self._delta) > max(100, self.max_delta_ratio * len(self._base_rows))
+        if (stale or oversized) and self._build_lock.acquire(blocking=False):
+            if oversized or not self._adopt_newer_generation():
+                # Keep serving the current base (plus delta) until the new one is in place
+                threading.Thread(
+                    target=self._rebuild_in_background, name="candidate-matrix-rebuild", daemon=True
+                ).start()
+            else:
+                self._build_lock.release()
+        self._apply_dirty(db)
+
+    # Scoring
+
+    def top_k(self, db: Session, job_description: str, k: int) -> List[Tuple[int, float]]:
+        """Return (user_id, score) for the ``k`` best-matching public profiles"""
+        self._ensure_fresh(db)
+        job = hash_features(job_description)
+
+        with self._lock:
+            base, delta, shadowed = self._base, self._delta_segment, self._shadowed
+            total = max(len(base.users), 1)
+            idf = np.log((total + 1) / (self._base_df[job.indices] + 1.0)) + 1.0
+
+        # Squared IDF on the query side stands in for IDF on both vectors
+        query = np.zeros(N_FEATURES, dtype=np.float32)
+        query[job.indices] = job.values * idf * idf
+
+        base_scores = base.scores(query)
+        base_scores[shadowed] = -np.inf
+        scores = np.concatenate([base_scores, delta.scores(query)])
+        users = np.concatenate([base.users, delta.users])
+
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(users[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+
+class CandidateService:
+    """Service for ranking public candidates against a job posting"""
+
+    def __init__(self, matrix: CandidateMatrix):
+        self.matrix = matrix
+
+    def match(self, db: Session, job_description: str, limit: int = 20) -> List[dict]:
+        hits = self.matrix.top_k(db, job_description, limit)
+        if not hits:
+            return []
+
+        user_ids = [user_id for user_id, _ in hits]
+        users = {user.id: user for user in db.query(User).filter(User.id.in_(user_ids))}
+        slugs: Dict[int, str] = {}
+        for row in db.query(Resume.user_id, Resume.public_url_slug).filter(
+            Resume.user_id.in_(user_ids), Resume.is_public == 1
+        ).order_by(Resume.updated_at.desc()):
+            slugs.setdefault(row.user_id, row.public_url_slug)
+
+        return [
+            {
+                "user_id": user_id,
+                "full_name": users[user_id].full_name,
+                "public_url_slug": slugs.get(user_id),
+                "score": round(score, 4),
+            }
+            for user_id, score in hits
+            if user_id in users
+        ]
+
+
+candidate_matrix = CandidateMatrix(
+    os.path.join(settings.data_dir, "candidates"),
+    rebuild_interval_seconds=settings.candidate_matrix_rebuild_seconds,
+)
+profile_events.subscribe(candidate_matrix.on_profile_change)
+
+candidate_service = CandidateService(candidate_matrix)
@@ -0,0 +1,101 @@
+"""Per-user change tokens for conditional GETs.
+
+Every flush that writes a user's achievements, skills, resumes or the user row
+itself bumps that user's ``profile_versions`` row in the same transaction, so
+the token changes exactly when the data it covers commits and is shared by
+every worker process. Bulk SQL that bypasses the ORM calls ``bump`` itself.
+"""
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.profile_version import ProfileVersion
+from app.models.user import User
+from app.services.profile_events import flushed_user_ids
+
+
+class ChangeToken(NamedTuple):
+    user_id: int
+    version: int  # 0 until the user's first write
+    updated_at: Optional[datetime]
+
+    @property
+    def etag(self) -> str:
+        return f'W/"{self.user_id}-{self.version}"'
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        if self.updated_at is None:
+            return None
+        return format_datetime(self.updated_at.replace(microsecond=0, tzinfo=timezone.utc), usegmt=True)
+
+    def headers(self) -> Dict[str, str]:
+        # Cache privately but always revalidate; a 304 costs one indexed lookup
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        return headers
+
+    def matches(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """Whether a client holding these validators already has the current data"""
+        if if_none_match is not None:
+            # If-None-Match wins over If-Modified-Since; compare weakly
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or any(tag.removeprefix("W/") == self.etag.removeprefix("W/") for tag in tags)
+        if if_modified_since and self.updated_at is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).replace(tzinfo=None)
+            except (TypeError, ValueError):
+                return False
+            # HTTP dates have whole seconds, and another write may land later in the
+            # same second: only a change at or before the exact instant counts as seen.
+            # Clients sending the ETag aren't affected.
+            return self.updated_at <= since
+        return False
+
+
+def current(db: Session, user_id: int) -> ChangeToken:
+    """The user's token; a primary-key lookup that loads nothing else"""
+    row = db.execute(
+        select(ProfileVersion.version, ProfileVersion.updated_at).where(ProfileVersion.user_id == user_id)
+    ).first()
+    if row is None:
+        return ChangeToken(user_id, 0, None)
+    return ChangeToken(user_id, row.version, row.updated_at)
+
+
+def bump(connection, user_ids: Iterable[int]) -> None:
+    """Advance the tokens of ``user_ids`` in the caller's transaction"""
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    now = datetime.utcnow()
+    connection.execute(
+        update(ProfileVersion)
+        .where(ProfileVersion.user_id.in_(user_ids))
+        .values(version=ProfileVersion.version + 1, updated_at=now)
+    )
+    known = set(connection.execute(
+        select(ProfileVersion.user_id).where(ProfileVersion.user_id.in_(user_ids))
+    ).scalars())
+    missing = [user_id for user_id in user_ids if user_id not in known]
+    if missing:
+        # Start from the clock so a recreated row never repeats an old token
+        version = int(time.time() * 1000)
+        connection.execute(
+            insert(ProfileVersion),
+            [{"user_id": user_id, "version": version, "updated_at": now} for user_id in missing],
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed(session: Session, flush_context) -> None:
+    # A deleted user has nothing left to version
+    deleted = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    changed = flushed_user_ids(session) - deleted
+    if changed:
+        bump(session.connection(), changed)
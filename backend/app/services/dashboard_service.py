@@ -0,0 +1,96 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.achievement import Internship, Course, Hackathon, Project, Skill, UserSkill
+from app.models.resume import Resume
+from app.services.stats_service import stats_service
+
+# kind -> (model, title column, subtitle column, date column)
+ACHIEVEMENT_SOURCES = {
+    "internships": (Internship, Internship.position, Internship.company_name, Internship.start_date),
+    "courses": (Course, Course.course_name, Course.platform, Course.completion_date),
+    "hackathons": (Hackathon, Hackathon.hackathon_name, Hackathon.organizer, Hackathon.participation_date),
+    "projects": (Project, Project.project_name, Project.project_type, Project.start_date),
+}
+
+
+class DashboardService:
+    """Builds the dashboard summary from a few aggregate queries.
+
+    The lists behind the dashboard can be large; counts come from the user's
+    stats row and the latest rows are picked in SQL, so no collection is ever
+    loaded in full.
+    """
+
+    def recent_items(self, db: Session, user_id: int, limit: int) -> Dict[str, List[Dict[str, Any]]]:
+        """The latest ``limit`` achievements of every kind, ranked in SQL"""
+        parts = [
+            select(
+                literal(kind).label("kind"),
+                model.id.label("id"),
+                title.label("title"),
+                subtitle.label("subtitle"),
+                date.label("date"),
+                model.verification_status.label("verification_status"),
+                model.created_at.label("created_at"),
+            ).where(model.user_id == user_id)
+            for kind, (model, title, subtitle, date) in ACHIEVEMENT_SOURCES.items()
+        ]
+        combined = union_all(*parts).subquery()
+        ranked = select(
+            combined,
+            func.row_number().over(
+                partition_by=combined.c.kind,
+                order_by=(combined.c.created_at.desc(), combined.c.id.desc()),
+            ).label("rank"),
+        ).subquery()
+        query = (
+            select(*[c for c in ranked.c if c.name != "rank"])
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.kind, ranked.c.rank)
+        )
+
+        recent: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in ACHIEVEMENT_SOURCES}
+        for row in db.execute(query).mappings():
+            item = dict(row)
+            recent[item.pop("kind")].append(item)
+        return recent
+
+    def skills(self, db: Session, user_id: int) -> List[Dict[str, Any]]:
+        query = (
+            select(UserSkill.id, Skill.name, Skill.category, UserSkill.proficiency_level, UserSkill.verified_count)
+            .join(Skill, Skill.id == UserSkill.skill_id)
+            .where(UserSkill.user_id == user_id)
+            .order_by(UserSkill.verified_count.desc(), Skill.name)
+        )
+        return [dict(row) for row in db.execute(query).mappings()]
+
+    def resumes(self, db: Session, user_id: int) -> List[Dict[str, Any]]:
+        query = (
+            select(Resume.id, Resume.title, Resume.template, Resume.is_public, Resume.public_url_slug,
+                   Resume.view_count, Resume.last_generated_at, Resume.updated_at)
+            .where(Resume.user_id == user_id)
+            .order_by(Resume.updated_at.desc())
+        )
+        return [dict(row) for row in db.execute(query).mappings()]
+
+    def summary(self, db: Session, user_id: int, recent_limit: int = 5) -> Dict[str, Any]:
+        stats = stats_service.get(db, user_id)
+        resumes = self.resumes(db, user_id)
+
+        counts = dict(stats["counts"])
+        counts["skills"] = stats["skills_count"]
+        counts["resumes"] = len(resumes)
+
+        return {
+            "counts": counts,
+            "verification": stats["verification"],
+            "recent": self.recent_items(db, user_id, recent_limit),
+            "skills": self.skills(db, user_id),
+            "resumes": resumes,
+        }
+
+
+dashboard_service = DashboardService()
@@ -0,0 +1,103 @@
+import hashlib
+import re
+import unicodedata
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.achievement import AchievementFingerprint, Internship, Course, Hackathon, Project
+
+
+def _normalize(value: Any) -> str:
+    """Case-, accent-, punctuation- and whitespace-insensitive form of a field"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+def _month(value: Optional[datetime]) -> str:
+    return value.strftime("%Y-%m") if value else ""
+
+
+def _year(value: Optional[datetime]) -> str:
+    return value.strftime("%Y") if value else ""
+
+
+# Which fields make two achievements "the same" for each kind
+KEY_FIELDS = {
+    "internship": lambda d: (_normalize(d.get("company_name")), _normalize(d.get("position")), _month(d.get("start_date"))),
+    "course": lambda d: (_normalize(d.get("course_name")), _normalize(d.get("platform"))),
+    "hackathon": lambda d: (_normalize(d.get("hackathon_name")), _normalize(d.get("organizer")), _year(d.get("participation_date"))),
+    "project": lambda d: (_normalize(d.get("project_name")),),
+}
+
+MODELS = {
+    "internship": Internship,
+    "course": Course,
+    "hackathon": Hackathon,
+    "project": Project,
+}
+
+
+class DuplicateService:
+    """Detect near-duplicate achievements by hashing a normalized key.
+
+    Each achievement's fingerprint is stored per user in an indexed table, so a
+    check is one index lookup instead of a comparison against every row.
+    """
+
+    @staticmethod
+    def fingerprint(kind: str, data: Dict[str, Any]) -> str:
+        key = "\x1f".join(KEY_FIELDS[kind](data))
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def find(db: Session, user_id: int, kind: str, fingerprint: str) -> Optional[int]:
+        """Return the id of an existing achievement with this fingerprint, if any"""
+        row = db.query(AchievementFingerprint.achievement_id).filter(
+            AchievementFingerprint.user_id == user_id,
+            AchievementFingerprint.kind == kind,
+            AchievementFingerprint.fingerprint == fingerprint,
+        ).first()
+        return row.achievement_id if row else None
+
+    @staticmethod
+    def record(db: Session, user_id: int, kind: str, achievement_id: int, fingerprint: str) -> None:
+        db.add(AchievementFingerprint(
+            user_id=user_id,
+            kind=kind,
+            achievement_id=achievement_id,
+            fingerprint=fingerprint,
+        ))
+
+    @staticmethod
+    def forget(db: Session, kind: str, achievement_id: int) -> None:
+        db.query(AchievementFingerprint).filter(
+            AchievementFingerprint.kind == kind,
+            AchievementFingerprint.achievement_id == achievement_id,
+        ).delete(synchronize_session=False)
+
+    def backfill(self, db: Session, batch_size: int = 1000) -> int:
+        """Fingerprint achievements created before duplicate detection existed"""
+        added = 0
+        for kind, model in MODELS.items():
+            known = {
+                row.achievement_id for row in
+                db.query(AchievementFingerprint.achievement_id).filter(AchievementFingerprint.kind == kind)
+            }
+            for achievement in db.query(model).yield_per(batch_size):
+                if achievement.id in known:
+                    continue
+                data = {column.name: getattr(achievement, column.name) for column in model.__table__.columns}
+                self.record(db, achievement.user_id, kind, achievement.id, self.fingerprint(kind, data))
+                added += 1
+            db.commit()
+        return added
+
+
+duplicate_service = DuplicateService()
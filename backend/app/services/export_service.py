@@ -0,0 +1,185 @@
+import multiprocessing
+import re
+import threading
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.resume import Resume
+from app.services.pdf_service import pdf_service
+from app.services.resume_service import resume_service
+
+
+def _render_pdf(summary: Optional[str], user_data: Dict[str, Any]) -> bytes:
+    """Worker-process entry point (must be importable at module level)"""
+    return pdf_service.render(summary, user_data)
+
+
+class ZipStreamWriter:
+    """Write-only file object for zipfile that hands bytes back as they are produced.
+
+    It has no tell()/seek(), so zipfile falls back to data descriptors and never
+    rewinds; every entry can be sent to the client as soon as it is written.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """Service for bulk resume export"""
+
+    PAGE_SIZE = 100
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # ReportLab rendering is pure Python, so processes (not threads) give real
+        # parallelism. "spawn" avoids forking a multi-threaded server process.
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    @staticmethod
+    def _entry_name(resume: Resume, user_data: Dict[str, Any]) -> str:
+        filename = re.sub(r"[^\w.-]", "_", pdf_service.filename_for(user_data))
+        return f"{resume.id}_{filename}"
+
+    def _iter_resumes(
+        self,
+        db: Session,
+        resume_ids: Optional[List[int]] = None,
+        user_ids: Optional[List[int]] = None,
+        public_only: bool = False,
+        updated_since: Optional[datetime] = None,
+    ) -> Iterator[Resume]:
+        """Yield matching resumes page by page, ordered by (user_id, id)"""
+
+        query = db.query(Resume)
+        if resume_ids is not None:
+            query = query.filter(Resume.id.in_(resume_ids))
+        if user_ids is not None:
+            query = query.filter(Resume.user_id.in_(user_ids))
+        if public_only:
+            query = query.filter(Resume.is_public == 1)
+        if updated_since is not None:
+            query = query.filter(Resume.updated_at >= updated_since)
+        query = query.order_by(Resume.user_id, Resume.id)
+
+        # Keyset pagination keeps only one page of rows in memory at a time
+        last: Optional[Tuple[int, int]] = None
+        while True:
+            page_query = query
+            if last is not None:
+                page_query = page_query.filter(or_(
+                    Resume.user_id > last[0],
+                    and_(Resume.user_id == last[0], Resume.id > last[1]),
+                ))
+            page = page_query.limit(self.PAGE_SIZE).all()
+            if not page:
+                return
+            for resume in page:
+                yield resume
+            last = (page[-1].user_id, page[-1].id)
+            db.expunge_all()
+
+    def iter_resumes_zip(self, **criteria) -> Iterator[bytes]:
+        """Stream a ZIP archive of resume PDFs as entries complete.
+
+        At most ``2 * workers`` renders are in flight, so memory stays bounded
+        regardless of how many resumes match. A resume that fails to render is
+        left out and listed in ``errors.txt`` rather than cutting the archive short.
+        """
+
+        db = SessionLocal()
+        sink = ZipStreamWriter()
+        pending: Dict[Future, Tuple[str, str]] = {}
+        window = self.workers * 2
+        errors: List[str] = []
+
+        try:
+            with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+
+                def write_completed() -> bytes:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name, key = pending.pop(future)
+                        try:
+                            pdf = future.result()
+                        except Exception as e:
+                            print(f"Export of {name} failed: {e}")
+                            errors.append(f"{name}: {e}")
+                            continue
+                        pdf_service.store(key, pdf)
+                        archive.writestr(name, pdf)
+                    return sink.drain()
+
+                current_user_id = None
+                user_data: Dict[str, Any] = {}
+
+                for resume in self._iter_resumes(db, **criteria):
+                    if resume.user_id != current_user_id:
+                        user_data = resume_service.get_user_complete_data(db, resume.user)
+                        current_user_id = resume.user_id
+
+                    resume_data = resume_service.select_content(user_data, resume.configuration)
+                    name = self._entry_name(resume, resume_data)
+                    key = pdf_service.cache_key(resume.summary, resume_data)
+                    cached = pdf_service.lookup(key)
+                    if cached is not None:
+                        archive.writestr(name, cached)
+                        yield sink.drain()
+                        continue
+
+                    future = self._get_pool().submit(_render_pdf, resume.summary, resume_data)
+                    pending[future] = (name, key)
+
+                    if len(pending) >= window:
+                        yield write_completed()
+
+                while pending:
+                    yield write_completed()
+
+                if errors:
+                    archive.writestr("errors.txt", "\n".join(errors) + "\n")
+
+            # Central directory is written when the archive closes
+            yield sink.drain()
+        finally:
+            for future in pending:
+                future.cancel()
+            db.close()
+
+
+export_service = ExportService(workers=settings.export_workers)
@@ -0,0 +1,293 @@
+"""Live resume previews over WebSocket.
+
+Protocol (JSON text frames) on ``/api/resumes/{id}/live``:
+
+    client: {"type": "auth", "token": "<access token>"}          # first frame, within live_auth_timeout_seconds
+    server: {"type": "snapshot", "version": V, "resume": {...}}  # same document as GET /resumes/{id}
+    client: {"type": "ack", "version": V}
+    server: {"type": "diff", "base": V, "version": W, "ops": [...]}
+    client: {"type": "ack", "version": W}
+    client: {"type": "resync"}                                     # asks for a fresh snapshot
+    server: {"type": "deleted"}                                    # then closes
+
+Diffs are computed against the last version the client acknowledged and
+only carry what changed:
+
+    {"op": "set", "path": ["user_data", "bio"], "value": ...}
+    {"op": "upsert", "path": ["user_data", "projects"], "items": [...]}  # replace by id, else append
+    {"op": "remove", "path": ["user_data", "projects"], "ids": [...]}
+    {"op": "order", "path": ["user_data", "projects"], "ids": [...]}    # only when the order changed
+
+At most one message is unacknowledged per connection. Changes arriving
+meanwhile only mark the session dirty, so a slow client gets one diff
+covering everything once it catches up, and a send that stalls past
+``live_send_timeout_seconds`` drops the connection.
+
+The token travels in a frame rather than the URL so it doesn't end up in
+access logs. The connection is closed with 4401 when the token expires; the
+client renews it and reconnects.
+"""
+import asyncio
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import orjson
+from fastapi import WebSocket, WebSocketDisconnect
+from jose import jwt
+from starlette.concurrency import run_in_threadpool
+
+from app import metrics
+from app.auth import user_from_token
+from app.config import settings
+from app.database import SessionLocal
+from app.models.resume import Resume
+from app.models.user import User
+from app.responses import dumps
+from app.services import change_tokens, profile_events
+from app.services.profile_cache import profile_cache
+from app.services.resume_service import resume_service
+
+# Application close codes (4000-4999)
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_NOT_FOUND = 4404
+CLOSE_TOO_MANY = 4429
+CLOSE_TOO_SLOW = 4408
+
+live_connections = metrics.Gauge("live_preview_connections", "Open live resume preview WebSockets")
+live_messages = metrics.Counter("live_preview_messages_total", "Live preview messages sent", ("type",))
+
+Document = Dict[str, Any]
+
+
+def build_document(user_id: int, resume_id: int, known_version: Optional[int] = None):
+    """The resume document at the user's current version.
+
+    Returns None if the resume is gone, ``(version, None)`` if the version is
+    still ``known_version``, else ``(version, document)``. The profile part is
+    parsed from the serialized JSON shared with GET /resumes/{id}, so it is
+    only rebuilt from the database once per change.
+    """
+    db = SessionLocal()
+    try:
+        token = change_tokens.current(db, user_id)
+        if known_version is not None and token.version == known_version:
+            return token.version, None
+
+        resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == user_id).first()
+        if resume is None:
+            return None
+        user = db.get(User, user_id)
+        user_data = profile_cache.get_or_build(
+            user_id, token.version, lambda: resume_service.get_user_complete_data(db, user)
+        )
+        document = orjson.loads(dumps(resume_service.resume_fields(resume)))
+        document["user_data"] = orjson.loads(user_data)
+        return token.version, document
+    finally:
+        db.close()
+
+
+def authenticate(token: str) -> Optional[Tuple[int, float]]:
+    """(user id, expiry as a Unix time) for an access token, or None if it isn't valid"""
+    db = SessionLocal()
+    try:
+        user = user_from_token(db, token)
+        if user is None:
+            return None
+        expires = jwt.get_unverified_claims(token).get("exp")  # Signature checked just above
+        return user.id, float(expires) if expires else math.inf
+    finally:
+        db.close()
+
+
+async def receive_credentials(websocket: WebSocket) -> Optional[Tuple[int, float]]:
+    """Authenticate the connection from its first frame (browsers can't set headers)"""
+    try:
+        message = orjson.loads(
+            await asyncio.wait_for(websocket.receive_text(), settings.live_auth_timeout_seconds)
+        )
+    except (asyncio.TimeoutError, orjson.JSONDecodeError, WebSocketDisconnect, RuntimeError, KeyError):
+        return None
+    if not isinstance(message, dict) or message.get("type") != "auth" or not isinstance(message.get("token"), str):
+        return None
+    return await run_in_threadpool(authenticate, message["token"])
+
+
+def _is_keyed_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, dict) and "id" in item for item in value)
+
+
+def diff(old: Document, new: Document, path: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    """Structural diff of two documents (see the module docstring for the ops)"""
+    ops: List[Dict[str, Any]] = []
+    for key, value in new.items():
+        if key in old and old[key] == value:
+            continue
+        before = old.get(key)
+        here = [*path, key]
+        if isinstance(value, dict) and isinstance(before, dict):
+            ops.extend(diff(before, value, tuple(here)))
+        elif _is_keyed_list(value) and _is_keyed_list(before):
+            previous = {item["id"]: item for item in before}
+            upserts = [item for item in value if previous.get(item["id"]) != item]
+            current_ids = [item["id"] for item in value]
+            current = set(current_ids)
+            removed = [item_id for item_id in previous if item_id not in current]
+            if upserts:
+                ops.append({"op": "upsert", "path": here, "items": upserts})
+            if removed:
+                ops.append({"op": "remove", "path": here, "ids": removed})
+            # Where the client ends up after applying the upserts (appends) and removals
+            applied = [item_id for item_id in previous if item_id in current]
+            applied += [item_id for item_id in current_ids if item_id not in previous]
+            if applied != current_ids:
+                ops.append({"op": "order", "path": here, "ids": current_ids})
+        else:
+            ops.append({"op": "set", "path": here, "value": value})
+    for key in old.keys() - new.keys():
+        ops.append({"op": "set", "path": [*path, key], "value": None})
+    return ops
+
+
+class LiveSession:
+    """One WebSocket following one resume"""
+
+    def __init__(self, websocket: WebSocket, user_id: int, resume_id: int, expires_at: float = math.inf):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.resume_id = resume_id
+        self.expires_at = expires_at  # Of the access token, as a Unix time
+        self.loop = asyncio.get_running_loop()
+        self.wake = asyncio.Event()
+        self.acked: Optional[Tuple[int, Document]] = None  # What the client has confirmed
+        self.in_flight: Optional[Tuple[int, Document]] = None  # Sent, not yet acknowledged
+        self.resync = True
+        self.closed = False
+
+    def notify(self) -> None:
+        """Mark the session dirty; safe to call from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(self.wake.set)
+        except RuntimeError:
+            pass  # Event loop already closed
+
+    async def run(self) -> None:
+        reader = asyncio.create_task(self._read())
+        try:
+            while not self.closed:
+                remaining = self.expires_at - time.time()
+                if remaining <= 0:
+                    await self.close(CLOSE_UNAUTHORIZED)
+                    break
+                # Clear before building: a change committed from here on wakes the next pass
+                self.wake.clear()
+                if self.in_flight is None:
+                    await self._push()
+                try:
+                    # Also poll: changes committed by other worker processes aren't announced here
+                    await asyncio.wait_for(self.wake.wait(), min(settings.live_poll_seconds, remaining))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            reader.cancel()
+
+    async def _push(self) -> None:
+        known = None if self.resync or self.acked is None else self.acked[0]
+        built = await run_in_threadpool(build_document, self.user_id, self.resume_id, known)
+        if built is None:
+            if self.acked is None:
+                await self.close(CLOSE_NOT_FOUND)
+            else:
+                await self._send({"type": "deleted"})
+                await self.close(1000)
+            return
+        version, document = built
+        if document is None:
+            return
+
+        if known is None:
+            self.resync = False
+            message = {"type": "snapshot", "version": version, "resume": document}
+        else:
+            message = {"type": "diff", "base": known, "version": version, "ops": diff(self.acked[1], document)}
+        self.in_flight = (version, document)
+        await self._send(message)
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        try:
+            await asyncio.wait_for(
+                self.websocket.send_text(dumps(message).decode()), settings.live_send_timeout_seconds
+            )
+            live_messages.inc(type=message["type"])
+        except asyncio.TimeoutError:
+            await self.close(CLOSE_TOO_SLOW)
+        except (WebSocketDisconnect, RuntimeError):
+            self.closed = True
+
+    async def _read(self) -> None:
+        try:
+            while True:
+                try:
+                    message = orjson.loads(await self.websocket.receive_text())
+                except orjson.JSONDecodeError:
+                    continue
+                kind = message.get("type") if isinstance(message, dict) else None
+                if kind == "ack" and self.in_flight and message.get("version") == self.in_flight[0]:
+                    self.acked, self.in_flight = self.in_flight, None
+                    self.wake.set()
+                elif kind == "resync":
+                    self.resync, self.in_flight = True, None
+                    self.wake.set()
+        except (WebSocketDisconnect, RuntimeError, KeyError):
+            pass
+        finally:
+            self.closed = True
+            self.wake.set()
+
+    async def close(self, code: int) -> None:
+        if not self.closed:
+            self.closed = True
+            try:
+                await self.websocket.close(code)
+            except RuntimeError:
+                pass  # Already closed by the client
+
+
+class LiveHub:
+    """Routes committed profile changes to the sessions watching that user"""
+
+    def __init__(self, max_per_user: int):
+        self.max_per_user = max_per_user
+        self._sessions: Dict[int, Set[LiveSession]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, session: LiveSession) -> bool:
+        with self._lock:
+            sessions = self._sessions.setdefault(session.user_id, set())
+            if len(sessions) >= self.max_per_user:
+                return False
+            sessions.add(session)
+        live_connections.inc()
+        return True
+
+    def remove(self, session: LiveSession) -> None:
+        with self._lock:
+            sessions = self._sessions.get(session.user_id, set())
+            if session not in sessions:
+                return
+            sessions.discard(session)
+            if not sessions:
+                self._sessions.pop(session.user_id, None)
+        live_connections.dec()
+
+    def on_profile_change(self, user_ids: Set[int]) -> None:
+        with self._lock:
+            sessions = [s for user_id in user_ids for s in self._sessions.get(user_id, ())]
+        for session in sessions:
+            session.notify()
+
+
+live_hub = LiveHub(max_per_user=settings.live_max_connections_per_user)
+profile_events.subscribe(live_hub.on_profile_change)
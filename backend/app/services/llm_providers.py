@@ -0,0 +1,176 @@
+"""Registry of OpenAI-compatible LLM providers for summary generation.
+
+Providers come from ``settings.llm_providers`` (or, when that is empty, from
+the legacy HF_TOKEN / OPENAI_API_KEY settings). Each call is routed with a
+weighted power-of-two-choices pick: two healthy providers are sampled in
+proportion to their weight and the one with the lower latency average
+(EWMA, divided by weight) goes first, the rest follow as fallbacks in the
+same order. A provider that has not answered yet counts as fastest, so new
+ones get probed, and a small share of calls goes to the first sample
+regardless of latency so that one slow (e.g. cold) answer can't starve a
+provider for good.
+
+A provider that fails ``llm_failure_threshold`` times in a row is benched for
+``llm_cooldown_seconds``; after that it gets traffic again, and each further
+failure doubles the cooldown until one call succeeds. Every provider has its
+own timeout and cap on in-flight calls, and busy providers are skipped rather
+than queued on.
+"""
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from app import metrics
+from app.config import LLMProvider, Settings, settings
+
+llm_requests = metrics.Counter(
+    "llm_requests_total", "Summary LLM calls by provider and outcome", ("provider", "outcome")
+)
+llm_latency = metrics.Histogram(
+    "llm_request_seconds", "Summary LLM call latency by provider", labelnames=("provider",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+)
+llm_healthy = metrics.Gauge("llm_provider_healthy", "Whether a summary LLM provider is taking traffic", ("provider",))
+
+EWMA_ALPHA = 0.3
+EXPLORE_RATE = 0.05
+MAX_COOLDOWN_FACTOR = 10
+
+HF_ROUTER_URL = "https://router.huggingface.co/v1"
+
+
+class ProviderError(Exception):
+    """No provider produced a completion"""
+
+
+class Provider:
+    """One endpoint plus its health, latency average and concurrency slots"""
+
+    def __init__(self, config: LLMProvider, failure_threshold: int, cooldown_seconds: float):
+        self.config = config
+        self.name = config.name
+        self.weight = max(config.weight, 1e-6)
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.slots = threading.BoundedSemaphore(max(1, config.max_concurrency))
+        self.latency: Optional[float] = None  # EWMA of successful calls, seconds
+        self.failures = 0
+        self.benched_until = 0.0
+        self._client = None
+        self._lock = threading.Lock()
+        llm_healthy.set(1, provider=self.name)
+
+    @property
+    def client(self):
+        # One client per provider so its HTTP connection pool is reused
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from openai import OpenAI
+
+                    self._client = OpenAI(
+                        base_url=self.config.base_url,
+                        api_key=self.config.api_key or "unused",
+                        timeout=self.config.timeout_seconds,
+                        max_retries=0,  # The registry fails over instead
+                    )
+        return self._client
+
+    def available(self, now: float) -> bool:
+        return now >= self.benched_until
+
+    def cost(self) -> float:
+        return (self.latency or 0.0) / self.weight
+
+    def record_success(self, seconds: float) -> None:
+        with self._lock:
+            self.latency = seconds if self.latency is None else (
+                EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * self.latency
+            )
+            self.failures = 0
+            self.benched_until = 0.0
+        llm_healthy.set(1, provider=self.name)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            over = self.failures - self.failure_threshold
+            if over < 0:
+                return
+            factor = min(2 ** over, MAX_COOLDOWN_FACTOR)
+            self.benched_until = time.monotonic() + self.cooldown_seconds * factor
+        llm_healthy.set(0, provider=self.name)
+
+    def complete(self, client, messages: List[Dict[str, str]], **params) -> str:
+        completion = client.chat.completions.create(model=self.config.model, messages=messages, **params)
+        content = completion.choices[0].message.content
+        if not content or not content.strip():
+            raise ProviderError(f"{self.name} returned an empty completion")
+        return content.strip()
+
+
+class ProviderRegistry:
+    def __init__(self, providers: Sequence[Provider], rng: Optional[random.Random] = None):
+        self.providers = list(providers)
+        self._rng = rng or random.Random()
+
+    def __bool__(self) -> bool:
+        return bool(self.providers)
+
+    def route(self) -> List[Provider]:
+        """Providers to try, best first; benched ones are left out"""
+        now = time.monotonic()
+        candidates = [p for p in self.providers if p.available(now)]
+        if len(candidates) < 2:
+            return candidates
+        first = self._rng.choices(candidates, weights=[p.weight for p in candidates])[0]
+        others = [p for p in candidates if p is not first]
+        second = self._rng.choices(others, weights=[p.weight for p in others])[0]
+        best = first if self._rng.random() < EXPLORE_RATE else min(first, second, key=Provider.cost)
+        return [best] + sorted((p for p in candidates if p is not best), key=Provider.cost)
+
+    def complete(self, messages: List[Dict[str, str]], **params) -> str:
+        """The first successful completion along the route; ProviderError if none"""
+        errors = []
+        for provider in self.route():
+            if not provider.slots.acquire(blocking=False):
+                llm_requests.inc(provider=provider.name, outcome="busy")
+                continue
+            try:
+                client = provider.client  # Built outside the timing: the first one imports openai
+                started = time.perf_counter()
+                text = provider.complete(client, messages, **params)
+            except Exception as e:
+                provider.record_failure()
+                llm_requests.inc(provider=provider.name, outcome="error")
+                errors.append(f"{provider.name}: {e}")
+                continue
+            finally:
+                provider.slots.release()
+            elapsed = time.perf_counter() - started
+            provider.record_success(elapsed)
+            llm_latency.observe(elapsed, provider=provider.name)
+            llm_requests.inc(provider=provider.name, outcome="ok")
+            return text
+        raise ProviderError("; ".join(errors) or "no provider available")
+
+
+def provider_configs(config: Settings) -> List[LLMProvider]:
+    """Configured providers, or the legacy Hugging Face / OpenAI pair"""
+    if config.llm_providers:
+        return list(config.llm_providers)
+    legacy = []
+    if config.hf_token:
+        legacy.append(LLMProvider(
+            name="huggingface", base_url=HF_ROUTER_URL, api_key=config.hf_token, model="openai/gpt-oss-120b:groq",
+        ))
+    if config.openai_api_key:
+        legacy.append(LLMProvider(name="openai", api_key=config.openai_api_key, model="gpt-3.5-turbo"))
+    return legacy
+
+
+def build_registry(config: Settings = settings) -> ProviderRegistry:
+    return ProviderRegistry([
+        Provider(c, config.llm_failure_threshold, config.llm_cooldown_seconds) for c in provider_configs(config)
+    ])
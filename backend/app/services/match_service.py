@@ -0,0 +1,153 @@
+import hashlib
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from typing import Dict, Any, List, NamedTuple, Tuple
+
+import numpy as np
+
+FEATURE_BITS = 18
+N_FEATURES = 1 << FEATURE_BITS
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have in into is it its of on or our that the their this
+to was were will with we you your i my me us they them he she his her not no yes can may must should
+""".split())
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Text fields per section of ``ResumeService.get_user_complete_data``
+SECTION_FIELDS = {
+    "internships": ("position", "company_name", "description", "achievements", "skills_used"),
+    "projects": ("project_name", "role", "description", "technologies"),
+    "hackathons": ("hackathon_name", "project_name", "project_description", "technologies_used", "position"),
+    "courses": ("course_name", "platform", "description", "skills_learned"),
+}
+SECTION_TITLES = {
+    "internships": lambda item: f"{item.get('position')} at {item.get('company_name')}",
+    "projects": lambda item: item.get("project_name"),
+    "hackathons": lambda item: item.get("hackathon_name"),
+    "courses": lambda item: item.get("course_name"),
+    "skills": lambda item: item["skill"]["name"],
+}
+
+
+class SparseVector(NamedTuple):
+    indices: np.ndarray  # int32, unique feature ids
+    values: np.ndarray  # float32, sublinear term frequencies
+
+
+def tokenize(text: str) -> List[str]:
+    words = [w for w in _WORD_RE.findall(text.lower()) if w not in STOP_WORDS]
+    # Bigrams keep phrases like "machine learning" distinct from their parts
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def hash_features(text: str) -> SparseVector:
+    """Hashed bag-of-words with 1 + log(tf) weights"""
+    counts = Counter(zlib.crc32(token.encode("utf-8")) & (N_FEATURES - 1) for token in tokenize(text))
+    if not counts:
+        return SparseVector(np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+    indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    values = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    return SparseVector(indices, values.astype(np.float32))
+
+
+def item_text(section: str, item: Dict[str, Any]) -> str:
+    if section == "skills":
+        skill = item.get("skill", {})
+        return f"{skill.get('name', '')} {skill.get('category') or ''}"
+    return " ".join(str(item.get(field) or "") for field in SECTION_FIELDS[section])
+
+
+class MatchService:
+    """Score a user's achievements and skills against a job description.
+
+    Every item is a hashed sparse vector; scoring stacks them into one CSR-style
+    (indices, values, row) batch and computes all TF-IDF cosine scores with
+    a handful of NumPy operations. Item vectors are cached by (section, id) and
+    recomputed only when the item's text changes.
+    """
+
+    def __init__(self, cache_size: int = 50000):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[str, SparseVector]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def item_vector(self, section: str, item: Dict[str, Any]) -> SparseVector:
+        text = item_text(section, item)
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        key = (section, item["id"])
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == digest:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        vector = hash_features(text)
+        with self._lock:
+            self._cache[key] = (digest, vector)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vector
+
+    def score(self, user_data: Dict[str, Any], job_description: str) -> List[Tuple[str, Dict[str, Any], float]]:
+        """Return (section, item, cosine score) for every achievement and skill"""
+
+        items: List[Tuple[str, Dict[str, Any]]] = [
+            (section, item)
+            for section in (*SECTION_FIELDS, "skills")
+            for item in user_data.get(section, [])
+        ]
+        if not items:
+            return []
+
+        vectors = [self.item_vector(section, item) for section, item in items]
+        lengths = np.fromiter((len(v.indices) for v in vectors), dtype=np.int64, count=len(vectors))
+        indices = np.concatenate([v.indices for v in vectors])
+        values = np.concatenate([v.values for v in vectors])
+        owners = np.repeat(np.arange(len(items)), lengths)  # CSR row of every entry
+
+        job = hash_features(job_description)
+        if not len(job.indices) or not len(indices):
+            return [(section, item, 0.0) for section, item in items]
+
+        # IDF over the user's items plus the job posting itself
+        df = np.bincount(indices, minlength=N_FEATURES)
+        df[job.indices] += 1
+        idf = (np.log((len(items) + 2) / (df + 1.0)) + 1.0).astype(np.float32)
+
+        job_dense = np.zeros(N_FEATURES, dtype=np.float32)
+        job_dense[job.indices] = job.values * idf[job.indices]
+        job_norm = np.linalg.norm(job_dense[job.indices])
+
+        weights = values * idf[indices]
+        dots = np.bincount(owners, weights=weights * job_dense[indices], minlength=len(items))
+        norms = np.sqrt(np.bincount(owners, weights=weights * weights, minlength=len(items)))
+        scores = np.divide(dots, norms * job_norm, out=np.zeros(len(items)), where=norms > 0)
+
+        return [(section, item, float(score)) for (section, item), score in zip(items, scores)]
+
+    def top_matches(self, user_data: Dict[str, Any], job_description: str,
+                    top_k: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+        """Best ``top_k`` items per section, highest score first"""
+        by_section: Dict[str, List[Tuple[Dict[str, Any], float]]] = {
+            section: [] for section in (*SECTION_FIELDS, "skills")
+        }
+        for section, item, score in self.score(user_data, job_description):
+            by_section[section].append((item, score))
+
+        return {
+            section: [
+                {"id": item["id"], "title": SECTION_TITLES[section](item), "score": round(score, 4)}
+                for item, score in sorted(scored, key=lambda pair: (-pair[1], pair[0]["id"]))[:top_k]
+                if score > 0
+            ]
+            for section, scored in by_section.items()
+        }
+
+
+match_service = MatchService()
@@ -0,0 +1,251 @@
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from app.config import settings
+from app import metrics
+
+
+class PDFService:
+    """Service for rendering resumes to PDF"""
+    
+    def __init__(self, cache_max_bytes: int = 0):
+        self.cache_max_bytes = cache_max_bytes
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def cache_key(summary: Optional[str], user_data: Dict[str, Any]) -> str:
+        """Content hash of everything that ends up in the rendered PDF"""
+        payload = json.dumps([summary, user_data], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def lookup(self, key: str) -> Optional[bytes]:
+        """Return a cached PDF by content key, if present"""
+        with self._lock:
+            pdf = self._cache.get(key)
+            if pdf is not None:
+                self._cache.move_to_end(key)
+            return pdf
+    
+    def store(self, key: str, pdf: bytes) -> None:
+        """Cache a rendered PDF, evicting least recently used entries"""
+        if len(pdf) > self.cache_max_bytes:
+            return
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = pdf
+            self._cache_bytes += len(pdf)
+            while self._cache_bytes > self.cache_max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+    
+    def get_or_render(self, summary: Optional[str], user_data: Dict[str, Any]) -> bytes:
+        """Return the cached PDF for this content, rendering it on a miss"""
+        key = self.cache_key(summary, user_data)
+        pdf = self.lookup(key)
+        if pdf is None:
+            with metrics.timed("pdf"):
+                pdf = self.render(summary, user_data)
+            self.store(key, pdf)
+        return pdf
+    
+    @staticmethod
+    def warm_up() -> None:
+        """Import ReportLab ahead of the first export (it is loaded lazily)"""
+        import reportlab.platypus  # noqa: F401
+        import reportlab.lib.styles  # noqa: F401
+    
+    @staticmethod
+    def filename_for(user_data: Dict[str, Any]) -> str:
+        return f"{user_data['full_name'].replace(' ', '_')}_Resume.pdf"
+    
+    def render(self, summary: Optional[str], user_data: Dict[str, Any]) -> bytes:
+        """Build the resume PDF and return its bytes"""
+        
+        # ReportLab is heavy to import; load it on first render
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+        from reportlab.lib import colors
+        
+        # Create PDF in memory
+        buffer = io.BytesIO()
+        
+        # Create PDF document
+        doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
+                               topMargin=72, bottomMargin=18)
+        
+        # Container for PDF elements
+        story = []
+        
+        # Define styles
+        styles = getSampleStyleSheet()
+        
+        # Custom styles
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1e40af'),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+        )
+        
+        heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#1e40af'),
+            spaceAfter=12,
+            spaceBefore=12,
+            borderWidth=0,
+            borderColor=colors.HexColor('#1e40af'),
+            borderPadding=5,
+        )
+        
+        contact_style = ParagraphStyle(
+            'ContactStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=colors.HexColor('#4b5563'),
+            alignment=TA_CENTER,
+        )
+        
+        body_style = ParagraphStyle(
+            'BodyStyle',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=colors.HexColor('#374151'),
+            alignment=TA_JUSTIFY,
+            spaceAfter=6,
+        )
+        
+        subheading_style = ParagraphStyle(
+            'SubheadingStyle',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor=colors.HexColor('#111827'),
+            spaceAfter=4,
+            fontName='Helvetica-Bold',
+        )
+        
+        # Add name (title)
+        story.append(Paragraph(user_data['full_name'], title_style))
+        
+        # Add contact information
+        contact_parts = []
+        if user_data.get('email'):
+            contact_parts.append(user_data['email'])
+        if user_data.get('phone'):
+            contact_parts.append(user_data['phone'])
+        if user_data.get('location'):
+            contact_parts.append(user_data['location'])
+        
+        if contact_parts:
+            story.append(Paragraph(' • '.join(contact_parts), contact_style))
+            story.append(Spacer(1, 0.1*inch))
+        
+        # Add links
+        links_parts = []
+        if user_data.get('linkedin_url'):
+            links_parts.append(f'<a href="{user_data["linkedin_url"]}">LinkedIn</a>')
+        if user_data.get('github_url'):
+            links_parts.append(f'<a href="{user_data["github_url"]}">GitHub</a>')
+        if user_data.get('portfolio_url'):
+            links_parts.append(f'<a href="{user_data["portfolio_url"]}">Portfolio</a>')
+        
+        if links_parts:
+            story.append(Paragraph(' • '.join(links_parts), contact_style))
+        
+        story.append(Spacer(1, 0.3*inch))
+        
+        # Add summary
+        if summary:
+            story.append(Paragraph('Professional Summary', heading_style))
+            story.append(Paragraph(summary, body_style))
+            story.append(Spacer(1, 0.2*inch))
+        
+        # Add Experience (Internships)
+        if user_data.get('internships') and len(user_data['internships']) > 0:
+            story.append(Paragraph('Experience', heading_style))
+            for intern in user_data['internships']:
+                # Position and Company
+                story.append(Paragraph(f"<b>{intern['position']}</b>", subheading_style))
+                company_date = f"{intern['company_name']}"
+                if intern.get('start_date'):
+                    end_date = 'Present' if intern.get('is_current') else (intern.get('end_date', '')[:10] if intern.get('end_date') else '')
+                    company_date += f" | {intern['start_date'][:10]} - {end_date}"
+                story.append(Paragraph(company_date, body_style))
+        
+                if intern.get('description'):
+                    story.append(Paragraph(intern['description'], body_style))
+                if intern.get('achievements'):
+                    story.append(Paragraph(f"• {intern['achievements']}", body_style))
+                story.append(Spacer(1, 0.15*inch))
+            story.append(Spacer(1, 0.1*inch))
+        
+        # Add Projects
+        if user_data.get('projects') and len(user_data['projects']) > 0:
+            story.append(Paragraph('Projects', heading_style))
+            for project in user_data['projects']:
+                story.append(Paragraph(f"<b>{project['project_name']}</b>", subheading_style))
+        
+                if project.get('start_date'):
+                    end_date = 'Ongoing' if project.get('is_ongoing') else (project.get('end_date', '')[:10] if project.get('end_date') else '')
+                    story.append(Paragraph(f"{project['start_date'][:10]} - {end_date}", body_style))
+        
+                if project.get('description'):
+                    story.append(Paragraph(project['description'], body_style))
+        
+                if project.get('technologies'):
+                    story.append(Paragraph(f"<b>Technologies:</b> {project['technologies']}", body_style))
+        
+                story.append(Spacer(1, 0.15*inch))
+            story.append(Spacer(1, 0.1*inch))
+        
+        # Add Education/Courses
+        if user_data.get('courses') and len(user_data['courses']) > 0:
+            story.append(Paragraph('Education & Certifications', heading_style))
+            for course in user_data['courses']:
+                story.append(Paragraph(f"<b>{course['course_name']}</b>", subheading_style))
+                story.append(Paragraph(course['platform'], body_style))
+                if course.get('completion_date'):
+                    story.append(Paragraph(course['completion_date'][:10], body_style))
+                story.append(Spacer(1, 0.1*inch))
+            story.append(Spacer(1, 0.1*inch))
+        
+        # Add Skills
+        if user_data.get('skills') and len(user_data['skills']) > 0:
+            story.append(Paragraph('Skills', heading_style))
+            skills_list = [skill['skill']['name'] for skill in user_data['skills']]
+            story.append(Paragraph(', '.join(skills_list), body_style))
+            story.append(Spacer(1, 0.2*inch))
+        
+        # Add Hackathons
+        if user_data.get('hackathons') and len(user_data['hackathons']) > 0:
+            story.append(Paragraph('Hackathons & Competitions', heading_style))
+            for hackathon in user_data['hackathons']:
+                story.append(Paragraph(f"<b>{hackathon['hackathon_name']}</b>", subheading_style))
+                hack_info = hackathon['organizer']
+                if hackathon.get('participation_date'):
+                    hack_info += f" | {hackathon['participation_date'][:10]}"
+                story.append(Paragraph(hack_info, body_style))
+                if hackathon.get('position'):
+                    story.append(Paragraph(hackathon['position'], body_style))
+                story.append(Spacer(1, 0.1*inch))
+        
+        # Build PDF
+        doc.build(story)
+        
+        return buffer.getvalue()
+
+
+pdf_service = PDFService(cache_max_bytes=settings.pdf_cache_max_bytes)
@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Set, Tuple
+
+from app.config import settings
+from app.responses import dumps
+from app.services import profile_events
+
+
+class ProfileCache:
+    """Serialize-once cache of each user's profile payload as JSON bytes.
+
+    Entries are keyed by the user's change token (see change_tokens), which
+    every committed write to the profile advances in the database, so a hit
+    is current in every worker process. Committed changes seen by this
+    process also evict the entry right away to free memory.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_profile_change(self, user_ids: Set[int]) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def get_or_build(self, user_id: int, version: int, build: Callable[[], dict]) -> bytes:
+        """Return the user's profile JSON at ``version``, calling ``build`` on a miss"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+
+        payload = dumps(build())
+
+        if self.max_entries > 0:
+            with self._lock:
+                current = self._entries.get(user_id)
+                # Never replace a newer entry built by a concurrent request
+                if current is None or current[0] <= version:
+                    self._entries[user_id] = (version, payload)
+                    self._entries.move_to_end(user_id)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return payload
+
+profile_cache = ProfileCache(max_entries=settings.profile_cache_max_entries)
+profile_events.subscribe(profile_cache.on_profile_change)
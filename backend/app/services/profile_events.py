@@ -0,0 +1,65 @@
+"""In-process notifications for committed changes to a user's profile data.
+
+Any ORM write to a row with a ``user_id`` (achievements, skills, resumes) or to
+a ``User`` itself is collected at flush time and announced to subscribers once
+the transaction commits. Indexes and caches subscribe here instead of every
+route having to remember to update them.
+"""
+from itertools import chain
+from typing import Callable, List, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+
+Listener = Callable[[Set[int]], None]
+
+_listeners: List[Listener] = []
+
+_SESSION_KEY = "changed_user_ids"
+
+
+def subscribe(listener: Listener) -> Listener:
+    """Register a callback receiving the set of user ids changed by a commit"""
+    _listeners.append(listener)
+    return listener
+
+
+def notify(user_ids: Set[int]) -> None:
+    """Announce changes made outside the ORM unit of work (e.g. bulk SQL)"""
+    for listener in _listeners:
+        try:
+            listener(set(user_ids))
+        except Exception as e:
+            print(f"Profile change listener error: {e}")
+
+
+def flushed_user_ids(session: Session) -> Set[int]:
+    """Users whose data the flush in progress writes (call from ``after_flush``)"""
+    changed = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, User):
+            changed.add(obj.id)
+        else:
+            user_id = getattr(obj, "user_id", None)
+            if user_id is not None:
+                changed.add(user_id)
+    return changed
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    session.info.setdefault(_SESSION_KEY, set()).update(flushed_user_ids(session))
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session: Session) -> None:
+    changed = session.info.pop(_SESSION_KEY, None)
+    if changed:
+        notify(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
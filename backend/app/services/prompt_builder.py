@@ -0,0 +1,181 @@
+"""Assemble the resume-summary prompt within a token budget.
+
+Achievements are ranked by how much they say about the candidate:
+
+* recency: exponential decay by age (ongoing work counts as current);
+* verification: verified > pending > rejected;
+* skill overlap: how many of the user's top skills the entry mentions;
+* kind: internships weigh more than projects, hackathons and courses.
+
+The header (name, counts, top skills) is always included; the best entries
+are then added until the next one would not fit. Tokens are estimated
+locally, so no tokenizer download or network call is involved.
+"""
+import math
+import re
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from app import metrics
+from app.config import settings
+
+prompt_tokens = metrics.Histogram(
+    "llm_prompt_tokens", "Estimated tokens per summary prompt",
+    buckets=(50, 100, 200, 300, 400, 600, 800, 1200, 1600, 2400, 3200),
+)
+prompt_items = metrics.Histogram(
+    "llm_prompt_items", "Achievements included per summary prompt",
+    buckets=(0, 1, 2, 4, 8, 12, 16, 24, 32, 64),
+)
+
+INSTRUCTION = (
+    "\nWrite a compelling 3-4 sentence professional summary that highlights "
+    "their key strengths and value proposition."
+)
+
+KIND_WEIGHTS = {"internships": 1.2, "projects": 1.0, "hackathons": 0.9, "courses": 0.6}
+VERIFICATION_WEIGHTS = {"verified": 1.0, "pending": 0.4, "rejected": 0.0}
+RECENCY_HALF_LIFE_YEARS = 2.0
+DESCRIPTION_WORDS = 40
+
+_TOKEN_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count: about one token per 4 letters of a word"""
+    return sum(math.ceil(len(piece) / 4) if piece.isalpha() else max(1, len(piece) // 3)
+               for piece in _TOKEN_RE.findall(text))
+
+
+class Candidate(NamedTuple):
+    kind: str
+    line: str
+    score: float
+    tokens: int
+
+
+class Prompt(NamedTuple):
+    text: str
+    tokens: int
+    included: int
+    omitted: int
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def _clip(text: Optional[str], words: int = DESCRIPTION_WORDS) -> str:
+    parts = (text or "").split()
+    return " ".join(parts[:words]) + (" ..." if len(parts) > words else "")
+
+
+def _render(kind: str, item: Dict[str, Any]) -> str:
+    if kind == "internships":
+        head = f"{item.get('position')} at {item.get('company_name')}"
+        details = [item.get("description"), item.get("achievements")]
+        skills = item.get("skills_used")
+    elif kind == "projects":
+        head = f"Project {item.get('project_name')}" + (f" ({item['role']})" if item.get("role") else "")
+        details = [item.get("description")]
+        skills = item.get("technologies")
+    elif kind == "hackathons":
+        head = f"{item.get('position') or 'Participant'} at {item.get('hackathon_name')}"
+        details = [item.get("project_name"), item.get("project_description")]
+        skills = item.get("technologies_used")
+    else:
+        head = f"Course {item.get('course_name')} ({item.get('platform')})"
+        details = [item.get("description")]
+        skills = item.get("skills_learned")
+
+    line = f"- {head}"
+    if item.get("verification_status") == "verified":
+        line += " [verified]"
+    text = _clip(" ".join(d for d in details if d))
+    if text:
+        line += f": {text}"
+    if skills:
+        line += f" (skills: {skills})"
+    return line
+
+
+def _item_date(kind: str, item: Dict[str, Any]) -> Optional[datetime]:
+    if item.get("is_current") or item.get("is_ongoing"):
+        return datetime.utcnow()
+    for field in ("end_date", "completion_date", "participation_date", "start_date"):
+        date = _parse_date(item.get(field))
+        if date is not None:
+            return date
+    return None
+
+
+def score(kind: str, item: Dict[str, Any], top_skills: Sequence[str], now: datetime) -> float:
+    date = _item_date(kind, item)
+    age_years = max((now - date).days / 365.25, 0.0) if date else 5.0
+    recency = 0.5 ** (age_years / RECENCY_HALF_LIFE_YEARS)
+
+    verification = VERIFICATION_WEIGHTS.get(item.get("verification_status") or "pending", 0.4)
+
+    overlap = 0.0
+    if top_skills:
+        haystack = " ".join(str(v) for v in item.values() if isinstance(v, str)).lower()
+        overlap = sum(1 for skill in top_skills if skill.lower() in haystack) / len(top_skills)
+
+    return KIND_WEIGHTS.get(kind, 1.0) * (1.0 + recency + verification + 2.0 * overlap)
+
+
+def _top_skills(user_data: Dict[str, Any], limit: int = 8) -> List[str]:
+    stats = user_data.get("stats")
+    if stats:
+        return stats["top_skills"][:limit]
+    return [s.get("skill", {}).get("name", "") for s in user_data.get("skills", [])[:limit]]
+
+
+def build(user_data: Dict[str, Any], budget: Optional[int] = None) -> Prompt:
+    """The summary prompt for ``user_data`` in about ``budget`` tokens; the header always goes in"""
+    budget = settings.prompt_token_budget if budget is None else budget
+    now = datetime.utcnow()
+    top_skills = _top_skills(user_data)
+
+    stats = user_data.get("stats")
+    counts = stats["counts"] if stats else {kind: len(user_data.get(kind, [])) for kind in KIND_WEIGHTS}
+
+    header = f"Create a professional resume summary for {user_data.get('full_name', 'the candidate')}"
+    header += " based on the following information:\n\n"
+    totals = ", ".join(f"{counts.get(kind, 0)} {kind}" for kind in KIND_WEIGHTS if counts.get(kind))
+    if totals:
+        header += f"Experience: {totals}\n"
+    if top_skills:
+        header += f"Skills: {', '.join(top_skills)}\n"
+    if user_data.get("bio"):
+        header += f"Bio: {_clip(user_data['bio'])}\n"
+
+    candidates = []
+    for kind in KIND_WEIGHTS:
+        for item in user_data.get(kind, []):
+            line = _render(kind, item)
+            candidates.append(Candidate(kind, line, score(kind, item, top_skills, now), estimate_tokens(line) + 1))
+    candidates.sort(key=lambda c: c.score, reverse=True)
+
+    used = estimate_tokens(header) + estimate_tokens(INSTRUCTION)
+    chosen: Dict[str, List[str]] = {kind: [] for kind in KIND_WEIGHTS}
+    included = 0
+    for candidate in candidates:
+        if used + candidate.tokens > budget:
+            continue  # A shorter, lower-ranked entry may still fit
+        chosen[candidate.kind].append(candidate.line)
+        used += candidate.tokens
+        included += 1
+
+    body = ""
+    for kind, lines in chosen.items():
+        if lines:
+            body += f"\n{kind.capitalize()}:\n" + "\n".join(lines) + "\n"
+
+    text = header + body + INSTRUCTION
+    prompt_tokens.observe(used)
+    prompt_items.observe(included)
+    return Prompt(text, used, included, len(candidates) - included)
@@ -0,0 +1,104 @@
+"""Rotating refresh tokens.
+
+Login hands out a refresh token next to the short-lived access token. Each
+``/auth/refresh`` spends it and issues a successor in the same family, so a
+client holds one live token at a time. A spent token presented again means
+two parties have it: the whole family is revoked and that login has to start
+over with the password.
+
+Only an HMAC of each token is stored, so checking one is a hash and a
+unique-index lookup rather than a bcrypt verification.
+"""
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.refresh_token import RefreshToken
+
+
+class RefreshError(Exception):
+    """The refresh token is unknown, expired, revoked or was already used"""
+
+
+def _hash(token: str) -> str:
+    return hmac.new(settings.secret_key.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+
+def issue(db: Session, user_id: int, family_id: Optional[str] = None) -> Tuple[str, int]:
+    """A new token for ``user_id`` (a new family unless given) and its row id; not committed"""
+    token = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    result = db.execute(insert(RefreshToken).values(
+        user_id=user_id,
+        token_hash=_hash(token),
+        family_id=family_id or secrets.token_hex(16),
+        created_at=now,
+        expires_at=now + timedelta(days=settings.refresh_token_expire_days),
+    ))
+    return token, result.inserted_primary_key[0]
+
+
+def revoke_family(db: Session, family_id: str) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+def rotate(db: Session, token: str) -> Tuple[int, str]:
+    """Spend ``token`` and return ``(user_id, successor)``; commits either way.
+
+    Raises RefreshError if the token can't be used; when that is because it
+    was used before, its family is revoked first.
+    """
+    row = db.execute(
+        select(RefreshToken.id, RefreshToken.user_id, RefreshToken.family_id,
+               RefreshToken.expires_at, RefreshToken.revoked_at)
+        .where(RefreshToken.token_hash == _hash(token))
+    ).first()
+    if row is None:
+        raise RefreshError("unknown refresh token")
+
+    now = datetime.utcnow()
+    # Claim the row atomically: of two concurrent uses only one can win
+    claimed = row.revoked_at is None and db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == row.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    ).rowcount == 1
+    if not claimed:
+        revoke_family(db, row.family_id)
+        db.commit()
+        raise RefreshError("refresh token reused")
+    if row.expires_at <= now:
+        db.commit()
+        raise RefreshError("refresh token expired")
+
+    successor, successor_id = issue(db, row.user_id, row.family_id)
+    db.execute(update(RefreshToken).where(RefreshToken.id == row.id).values(replaced_by=successor_id))
+    db.commit()
+    return row.user_id, successor
+
+
+def revoke(db: Session, token: str) -> None:
+    """Log out: revoke the token's family (every token of that login); commits"""
+    family_id = db.execute(
+        select(RefreshToken.family_id).where(RefreshToken.token_hash == _hash(token))
+    ).scalar()
+    if family_id is not None:
+        revoke_family(db, family_id)
+        db.commit()
+
+
+def purge_expired(db: Session) -> int:
+    """Delete expired tokens; revoked ones are kept until then to catch reuse"""
+    result = db.execute(delete(RefreshToken).where(RefreshToken.expires_at <= datetime.utcnow()))
+    db.commit()
+    return result.rowcount
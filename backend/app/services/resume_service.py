@@ -1,7 +1,8 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.services.ai_service import ai_service
+from app.services.ai_service import get_ai_service
+from app.services.stats_service import stats_service
 
 
 class ResumeService:
@@ -99,12 +100,54 @@ class ResumeService:
                 }
                 for us in user.skills
             ],
+            'stats': stats_service.get(db, user.id),
         }
     
+    @staticmethod
+    def resume_fields(resume) -> Dict[str, Any]:
+        """The resume's own fields, as returned alongside ``user_data``"""
+        
+        return {
+            "id": resume.id,
+            "user_id": resume.user_id,
+            "title": resume.title,
+            "template": resume.template,
+            "summary": resume.summary,
+            "is_ai_generated_summary": bool(resume.is_ai_generated_summary),
+            "configuration": resume.configuration,
+            "is_public": bool(resume.is_public),
+            "public_url_slug": resume.public_url_slug,
+            "view_count": resume.view_count,
+            "last_generated_at": resume.last_generated_at,
+            "created_at": resume.created_at,
+            "updated_at": resume.updated_at,
+        }
+    
+    @staticmethod
+    def select_content(user_data: Dict[str, Any], configuration: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Restrict sections to ``configuration["selected_content"]`` ids, in that order.
+        
+        Sections not named in the selection are kept whole.
+        """
+        
+        selected = (configuration or {}).get('selected_content')
+        if not selected:
+            return user_data
+        
+        filtered = dict(user_data)
+        for section, ids in selected.items():
+            if section not in user_data or not isinstance(ids, list):
+                continue
+            by_id = {item['id']: item for item in user_data[section]}
+            filtered[section] = [by_id[item_id] for item_id in ids if item_id in by_id]
+        # Profile-wide counters would disagree with the selection
+        filtered.pop('stats', None)
+        return filtered
+    
     @staticmethod
     def generate_ai_summary(user_data: Dict[str, Any]) -> str:
         """Generate AI-powered resume summary"""
-        return ai_service.generate_resume_summary(user_data)
+        return get_ai_service().generate_resume_summary(user_data)
 
 
 resume_service = ResumeService()
@@ -0,0 +1,314 @@
+"""Resume revision history.
+
+Every flush that changes a resume's content (the fields in ``FIELDS``)
+appends a ``resume_revisions`` row in the same transaction. Most rows are
+deltas against the previous revision: a JSON Patch (RFC 6902 add, remove and
+replace) for ``configuration``, word-level edits for ``summary`` and the new
+value of any other changed field, all zlib-compressed. A full snapshot is
+stored instead every ``resume_revision_snapshot_interval`` revisions, or
+whenever the delta would not be smaller, so rebuilding any revision reads
+one snapshot and fewer than that many deltas.
+
+Revisions are written in ``after_flush``, once the resume row itself has been
+written and is locked by this transaction, so two concurrent saves of one
+resume can't both claim the same revision number.
+"""
+import re
+import zlib
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.resume import Resume
+from app.models.resume_revision import ResumeRevision
+
+FIELDS = ("title", "template", "summary", "is_ai_generated_summary", "configuration")
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+
+_SOURCE_KEY = "resume_revision_source"
+_WORDS = re.compile(r"\s+|\S+")
+
+Content = Dict[str, Any]
+
+
+def tag(session: Session, source: str) -> None:
+    """Label the revisions written by the session's next flush (default: create / edit)"""
+    session.info[_SOURCE_KEY] = source
+
+
+# JSON Patch, for configuration
+
+
+def _pointer(path: Sequence[Any]) -> str:
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in path)
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    return [part.replace("~1", "/").replace("~0", "~") for part in pointer.split("/")[1:]]
+
+
+def json_diff(old: Any, new: Any, path: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+    """Patch turning ``old`` into ``new``; objects are diffed by key, anything else replaced whole"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer((*path, key))})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer((*path, key)), "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, (*path, key)))
+        return ops
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": _pointer(path), "value": new}]
+
+
+def json_patch(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    document = orjson.loads(orjson.dumps(document))  # Never modify the caller's copy
+    for op in ops:
+        parts = _parse_pointer(op["path"])
+        if not parts:
+            document = op.get("value")
+            continue
+        parent = document
+        for part in parts[:-1]:
+            parent = parent[int(part) if isinstance(parent, list) else part]
+        key = int(parts[-1]) if isinstance(parent, list) else parts[-1]
+        if op["op"] == "remove":
+            del parent[key]
+        else:
+            parent[key] = op["value"]
+    return document
+
+
+# Word-level text edits, for summary
+
+
+def text_diff(old: str, new: str) -> List[list]:
+    """Edits as ``[start, end, replacement]`` over the old text's word/space tokens"""
+    a, b = _WORDS.findall(old), _WORDS.findall(new)
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    return [[i1, i2, "".join(b[j1:j2])] for op, i1, i2, j1, j2 in matcher.get_opcodes() if op != "equal"]
+
+
+def text_patch(old: str, edits: List[list]) -> str:
+    tokens = _WORDS.findall(old)
+    out, position = [], 0
+    for start, end, replacement in edits:
+        out.extend(tokens[position:start])
+        out.append(replacement)
+        position = end
+    out.extend(tokens[position:])
+    return "".join(out)
+
+
+def text_segments(old: Optional[str], new: Optional[str]) -> List[Dict[str, str]]:
+    """Readable word diff: runs of equal, deleted and inserted text"""
+    a, b = _WORDS.findall(old or ""), _WORDS.findall(new or "")
+    segments = []
+    for op, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if op == "equal":
+            segments.append({"op": "equal", "text": "".join(a[i1:i2])})
+            continue
+        if i2 > i1:
+            segments.append({"op": "delete", "text": "".join(a[i1:i2])})
+        if j2 > j1:
+            segments.append({"op": "insert", "text": "".join(b[j1:j2])})
+    return segments
+
+
+# Deltas between two contents
+
+
+def content_of(resume: Resume) -> Content:
+    return {field: getattr(resume, field) for field in FIELDS}
+
+
+def diff(old: Content, new: Content) -> Dict[str, Any]:
+    delta: Dict[str, Any] = {"set": {}}
+    for field in FIELDS:
+        before, after = old.get(field), new.get(field)
+        if before == after and type(before) is type(after):
+            continue
+        if field == "summary" and isinstance(before, str) and isinstance(after, str):
+            delta["summary"] = text_diff(before, after)
+        elif field == "configuration" and isinstance(before, dict) and isinstance(after, dict):
+            delta["configuration"] = json_diff(before, after)
+        else:
+            delta["set"][field] = after
+    return delta
+
+
+def changed_fields(delta: Dict[str, Any]) -> List[str]:
+    return [field for field in FIELDS if field in delta["set"] or field in delta]
+
+
+def apply(content: Content, delta: Dict[str, Any]) -> Content:
+    content = dict(content)
+    if "summary" in delta:
+        content["summary"] = text_patch(content["summary"], delta["summary"])
+    if "configuration" in delta:
+        content["configuration"] = json_patch(content["configuration"], delta["configuration"])
+    content.update(delta["set"])
+    return content
+
+
+def _pack(value: Any) -> bytes:
+    return zlib.compress(orjson.dumps(value), 6)
+
+
+def _unpack(payload: bytes) -> Any:
+    return orjson.loads(zlib.decompress(payload))
+
+
+# Reading
+
+
+def _chain(db, resume_id: int, number: Optional[int] = None) -> List[Any]:
+    """The newest snapshot at or before ``number`` (default: latest) and the deltas after it"""
+    base_query = select(func.max(ResumeRevision.number)).where(
+        ResumeRevision.resume_id == resume_id, ResumeRevision.kind == SNAPSHOT
+    )
+    if number is not None:
+        base_query = base_query.where(ResumeRevision.number <= number)
+    base = db.execute(base_query).scalar()
+    if base is None:
+        return []
+    query = (
+        select(ResumeRevision.number, ResumeRevision.kind, ResumeRevision.payload)
+        .where(ResumeRevision.resume_id == resume_id, ResumeRevision.number >= base)
+        .order_by(ResumeRevision.number)
+    )
+    if number is not None:
+        query = query.where(ResumeRevision.number <= number)
+    return db.execute(query).all()
+
+
+def _replay(chain: Sequence[Any]) -> Content:
+    content = _unpack(chain[0].payload)
+    for row in chain[1:]:
+        content = _unpack(row.payload) if row.kind == SNAPSHOT else apply(content, _unpack(row.payload))
+    return content
+
+
+def content_at(db: Session, resume_id: int, number: int) -> Optional[Content]:
+    """The resume's content as of revision ``number``, or None if there is no such revision"""
+    chain = _chain(db, resume_id, number)
+    if not chain or chain[-1].number != number:
+        return None
+    return _replay(chain)
+
+
+def contents(rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Revision rows ordered by resume and number, with ``payload`` replaced by the full ``content``"""
+    content = None
+    for row in rows:
+        row = dict(row)
+        value = _unpack(row.pop("payload"))
+        content = value if row["kind"] == SNAPSHOT else apply(content, value)
+        yield {**row, "content": content}
+
+
+def history(db: Session, resume_id: int, limit: int = 50, offset: int = 0,
+            number: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Revision metadata, newest first (or just revision ``number``)"""
+    query = (
+        select(ResumeRevision.number, ResumeRevision.kind, ResumeRevision.source, ResumeRevision.fields,
+               func.length(ResumeRevision.payload).label("stored_bytes"), ResumeRevision.created_at)
+        .where(ResumeRevision.resume_id == resume_id)
+        .order_by(ResumeRevision.number.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    if number is not None:
+        query = query.where(ResumeRevision.number == number)
+    return [
+        {**row, "fields": row["fields"].split(",") if row["fields"] else []}
+        for row in db.execute(query).mappings()
+    ]
+
+
+def latest_number(db: Session, resume_id: int) -> Optional[int]:
+    return db.execute(
+        select(func.max(ResumeRevision.number)).where(ResumeRevision.resume_id == resume_id)
+    ).scalar()
+
+
+def compare(old: Content, new: Content) -> Dict[str, Any]:
+    """Field-by-field differences between two contents, for display"""
+    changes: Dict[str, Any] = {}
+    for field in FIELDS:
+        before, after = old.get(field), new.get(field)
+        if before == after:
+            continue
+        if field == "summary":
+            changes[field] = text_segments(before, after)
+        elif field == "configuration":
+            changes[field] = json_diff(before or {}, after or {})
+        else:
+            changes[field] = {"from": before, "to": after}
+    return changes
+
+
+# Writing
+
+
+def _previous_content(resume: Resume) -> Content:
+    """Content before this flush, for resumes saved before history was kept"""
+    state = inspect(resume)
+    content = {}
+    for field in FIELDS:
+        history = state.attrs[field].history
+        content[field] = history.deleted[0] if history.deleted else getattr(resume, field)
+    return content
+
+
+def _record(connection, resume: Resume, is_new: bool, source: str) -> None:
+    new = content_of(resume)
+    rows = []
+    chain = [] if is_new else _chain(connection, resume.id)
+    if chain:
+        previous, number, since_snapshot = _replay(chain), chain[-1].number + 1, len(chain)
+    elif is_new:
+        previous, number, since_snapshot = None, 1, 0
+    else:
+        # First change to a resume from before revisions were kept: keep what it was
+        previous, number, since_snapshot = _previous_content(resume), 2, 1
+        rows.append({"number": 1, "kind": SNAPSHOT, "source": "initial",
+                     "fields": ",".join(FIELDS), "payload": _pack(previous)})
+
+    snapshot = _pack(new)
+    if previous is None:
+        kind, payload, fields = SNAPSHOT, snapshot, list(FIELDS)
+    else:
+        delta = diff(previous, new)
+        fields = changed_fields(delta)
+        if not fields:
+            return
+        payload = _pack(delta)
+        kind = DELTA
+        if since_snapshot >= settings.resume_revision_snapshot_interval or len(payload) >= len(snapshot):
+            kind, payload = SNAPSHOT, snapshot
+    rows.append({"number": number, "kind": kind, "source": source, "fields": ",".join(fields), "payload": payload})
+
+    connection.execute(insert(ResumeRevision), [{"resume_id": resume.id, **row} for row in rows])
+
+
+@event.listens_for(Session, "after_flush")
+def _record_revisions(session: Session, flush_context) -> None:
+    source = session.info.pop(_SOURCE_KEY, None)
+    for resume in session.new:
+        if isinstance(resume, Resume):
+            _record(session.connection(), resume, True, source or "create")
+    for resume in session.dirty:
+        if isinstance(resume, Resume) and resume not in session.deleted:
+            state = inspect(resume)
+            if any(state.attrs[field].history.has_changes() for field in FIELDS):
+                _record(session.connection(), resume, False, source or "edit")
@@ -0,0 +1,255 @@
+import html
+import re
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+
+class SearchSource(NamedTuple):
+    kind: str
+    table: str
+    code: int  # Low bits of the FTS rowid, so (kind, id) maps to a single rowid
+    title_columns: Tuple[str, ...]
+    body_columns: Tuple[str, ...]
+
+
+SOURCES = (
+    SearchSource("internship", "internships", 1, ("position", "company_name"), ("description", "achievements")),
+    SearchSource("course", "courses", 2, ("course_name", "platform"), ("description",)),
+    SearchSource("hackathon", "hackathons", 3, ("hackathon_name", "project_name"), ("project_description",)),
+    SearchSource("project", "projects", 4, ("project_name",), ("description",)),
+)
+
+ROWID_SHIFT = 8
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# The database marks matches with these; the text is HTML-escaped before
+# they are swapped for the real tags, so stored markup can't leak through
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+SNIPPET_WORDS = 16
+
+
+def _concat(columns: Tuple[str, ...], prefix: str = "") -> str:
+    return " || ' ' || ".join(f"coalesce({prefix}{column}, '')" for column in columns)
+
+
+def _highlight(snippet: str) -> str:
+    escaped = html.escape(snippet or "", quote=False)
+    return escaped.replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_END, HIGHLIGHT_END)
+
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+class SearchService:
+    """Full-text search over achievement descriptions.
+
+    SQLite uses an FTS5 table maintained by triggers; PostgreSQL uses GIN
+    expression indexes over ``to_tsvector`` so no extra write path is needed.
+    Any other database gets an unindexed LIKE scan of the user's rows.
+    """
+
+    def install(self, engine: Engine) -> None:
+        """Create the search index (idempotent)"""
+        with engine.begin() as conn:
+            if conn.dialect.name == "sqlite":
+                self._install_sqlite(conn)
+            elif conn.dialect.name == "postgresql":
+                self._install_postgres(conn)
+
+    # SQLite FTS5
+
+    def _install_sqlite(self, conn: Connection) -> None:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'achievement_search'"
+        )).first()
+
+        if not exists:
+            # "owner" holds a u<user_id> token so per-user filtering is an
+            # index intersection inside FTS5 rather than a post-filter.
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE achievement_search USING fts5("
+                "title, body, owner, tokenize = 'porter unicode61')"
+            ))
+
+        for source in SOURCES:
+            rowid = f"new.id * {ROWID_SHIFT} + {source.code}"
+            old_rowid = f"old.id * {ROWID_SHIFT} + {source.code}"
+            insert = (
+                f"INSERT INTO achievement_search (rowid, title, body, owner) VALUES ("
+                f"{rowid}, {_concat(source.title_columns, 'new.')}, "
+                f"{_concat(source.body_columns, 'new.')}, 'u' || new.user_id);"
+            )
+            delete = f"DELETE FROM achievement_search WHERE rowid = {old_rowid};"
+
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {source.table}_search_ai "
+                f"AFTER INSERT ON {source.table} BEGIN {insert} END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {source.table}_search_ad "
+                f"AFTER DELETE ON {source.table} BEGIN {delete} END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {source.table}_search_au "
+                f"AFTER UPDATE ON {source.table} BEGIN {delete} {insert} END"
+            ))
+
+            if not exists:
+                conn.execute(text(
+                    f"INSERT INTO achievement_search (rowid, title, body, owner) "
+                    f"SELECT id * {ROWID_SHIFT} + {source.code}, {_concat(source.title_columns)}, "
+                    f"{_concat(source.body_columns)}, 'u' || user_id FROM {source.table}"
+                ))
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Turn free text into a safe FTS5 expression (AND of terms, last one as prefix)"""
+        terms = _terms(query)
+        if not terms:
+            return ""
+        phrases = [f'"{term}"' for term in terms]
+        phrases[-1] += "*"
+        return " ".join(phrases)
+
+    def _search_sqlite(self, db: Session, user_id: int, query: str, limit: int, offset: int):
+        fts_query = self._fts_query(query)
+        if not fts_query:
+            return []
+
+        rows = db.execute(text(
+            "SELECT rowid, title, "
+            f"snippet(achievement_search, 1, :hl_start, :hl_end, '…', {SNIPPET_WORDS}) AS snippet, "
+            "bm25(achievement_search, 3.0, 1.0, 0.0) AS rank "
+            "FROM achievement_search WHERE achievement_search MATCH :match "
+            "ORDER BY rank LIMIT :limit OFFSET :offset"
+        ), {
+            "hl_start": _MATCH_START,
+            "hl_end": _MATCH_END,
+            # Terms only match the text columns; owner is for the filter alone
+            "match": f"owner:u{user_id} AND {{title body}}: ({fts_query})",
+            "limit": limit,
+            "offset": offset,
+        }).all()
+
+        kinds = {source.code: source.kind for source in SOURCES}
+        return [
+            {
+                "kind": kinds[row.rowid % ROWID_SHIFT],
+                "id": row.rowid // ROWID_SHIFT,
+                "title": row.title,
+                "snippet": _highlight(row.snippet),
+                # bm25() is "lower is better"; expose "higher is better"
+                "rank": -row.rank,
+            }
+            for row in rows
+        ]
+
+    # PostgreSQL tsvector
+
+    @staticmethod
+    def _tsvector(source: SearchSource) -> str:
+        columns = source.title_columns + source.body_columns
+        return f"to_tsvector('english', {_concat(columns)})"
+
+    def _install_postgres(self, conn: Connection) -> None:
+        for source in SOURCES:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{source.table}_search "
+                f"ON {source.table} USING GIN ({self._tsvector(source)})"
+            ))
+
+    def _search_postgres(self, db: Session, user_id: int, query: str, limit: int, offset: int):
+        selects = []
+        for source in SOURCES:
+            selects.append(
+                f"SELECT '{source.kind}' AS kind, id, {_concat(source.title_columns)} AS title, "
+                f"{_concat(source.body_columns)} AS body, "
+                f"ts_rank({self._tsvector(source)}, q) AS rank "
+                f"FROM {source.table}, websearch_to_tsquery('english', :query) AS q "
+                f"WHERE user_id = :user_id AND {self._tsvector(source)} @@ q"
+            )
+
+        rows = db.execute(text(
+            "SELECT kind, id, title, rank, "
+            "ts_headline('english', body, websearch_to_tsquery('english', :query), "
+            ":headline_options) AS snippet "
+            f"FROM ({' UNION ALL '.join(selects)}) AS hits "
+            "ORDER BY rank DESC LIMIT :limit OFFSET :offset"
+        ), {
+            "query": query,
+            "user_id": user_id,
+            "headline_options": f"StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxWords=32",
+            "limit": limit,
+            "offset": offset,
+        }).all()
+
+        return [
+            {"kind": row.kind, "id": row.id, "title": row.title, "snippet": _highlight(row.snippet), "rank": row.rank}
+            for row in rows
+        ]
+
+    # Anything else: LIKE
+
+    @staticmethod
+    def _like_snippet(body: str, terms: List[str]) -> str:
+        """About SNIPPET_WORDS words around the first match, matches marked"""
+        words = body.split()
+        lowered = [word.lower() for word in words]
+        first = next((i for i, word in enumerate(lowered) if any(t in word for t in terms)), 0)
+        start = max(0, first - SNIPPET_WORDS // 4)
+        window = words[start:start + SNIPPET_WORDS]
+        pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+        snippet = " ".join(pattern.sub(lambda m: f"{_MATCH_START}{m.group(0)}{_MATCH_END}", w) for w in window)
+        if start > 0:
+            snippet = "…" + snippet
+        if start + SNIPPET_WORDS < len(words):
+            snippet += "…"
+        return snippet
+
+    def _search_like(self, db: Session, user_id: int, query: str, limit: int, offset: int):
+        terms = _terms(query)
+        if not terms:
+            return []
+
+        params: Dict[str, Any] = {"user_id": user_id}
+        for i, term in enumerate(terms):
+            params[f"t{i}"] = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+        hits = []
+        for source in SOURCES:
+            document = _concat(source.title_columns + source.body_columns)
+            conditions = " AND ".join(f"lower({document}) LIKE :t{i} ESCAPE '\\'" for i in range(len(terms)))
+            rows = db.execute(text(
+                f"SELECT id, {_concat(source.title_columns)} AS title, {_concat(source.body_columns)} AS body "
+                f"FROM {source.table} WHERE user_id = :user_id AND {conditions}"
+            ), params).all()
+            for row in rows:
+                haystack = f"{row.title} {row.body}".lower()
+                hits.append({
+                    "kind": source.kind,
+                    "id": row.id,
+                    "title": row.title,
+                    "snippet": _highlight(self._like_snippet(row.body, terms)),
+                    # Term frequency, titles counted three times as in the FTS weights
+                    "rank": float(sum(haystack.count(t) + 2 * row.title.lower().count(t) for t in terms)),
+                })
+
+        hits.sort(key=lambda hit: hit["rank"], reverse=True)
+        return hits[offset:offset + limit]
+
+    def search(self, db: Session, user_id: int, query: str, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+        """Return ranked hits for one user's achievements, best first"""
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            return self._search_sqlite(db, user_id, query, limit, offset)
+        if dialect == "postgresql":
+            return self._search_postgres(db, user_id, query, limit, offset)
+        return self._search_like(db, user_id, query, limit, offset)
+
+
+search_service = SearchService()
@@ -0,0 +1,236 @@
+import heapq
+import math
+import threading
+import time
+from collections import Counter
+from itertools import combinations
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.achievement import Internship, Course, Hackathon, Project, Skill, UserSkill
+from app.services import profile_events
+
+# Comma-separated technology columns on each achievement table
+TECHNOLOGY_COLUMNS = (
+    Internship.skills_used,
+    Course.skills_learned,
+    Hackathon.technologies_used,
+    Project.technologies,
+)
+
+
+def split_skill_list(value: Optional[str]) -> List[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+class SkillGraph:
+    """Sparse skill co-occurrence matrix over ``skills.id``.
+
+    ``_pairs[a][b]`` counts users who have both skills a and b, either in
+    ``user_skills`` or in an achievement's technology list. Each user's skill
+    set is remembered so a change only subtracts the old pairs and adds the new
+    ones. Suggestions sum a few sparse rows; no other user is scanned.
+
+    Profile changes only mark the user dirty; the next suggestion re-reads
+    dirty users before answering. Only the first build blocks: later periodic
+    rebuilds run on a background thread, one at a time, into a separate graph
+    that is swapped in when complete, and users changed meanwhile are marked
+    dirty again since the new graph may predate their change.
+    """
+
+    _STATE = ("_pairs", "_users_with", "_user_sets")
+
+    def __init__(self, rebuild_interval_seconds: int):
+        self.rebuild_interval_seconds = rebuild_interval_seconds
+        self._pairs: Dict[int, Counter] = {}
+        self._users_with: Counter = Counter()  # skill id -> number of users
+        self._user_sets: Dict[int, FrozenSet[int]] = {}
+        self._built_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()  # Single flight
+        self._refresh_lock = threading.Lock()  # Dirty users are re-read in order
+        self._dirty: Set[int] = set()
+        self._changed_during_rebuild: Optional[Set[int]] = None
+
+    @staticmethod
+    def _user_skill_sets(db: Session, user_ids: Optional[Iterable[int]] = None) -> Dict[int, Set[int]]:
+        user_ids = list(user_ids) if user_ids is not None else None
+        sets: Dict[int, Set[int]] = {}
+
+        query = db.query(UserSkill.user_id, UserSkill.skill_id)
+        if user_ids is not None:
+            query = query.filter(UserSkill.user_id.in_(user_ids))
+        for row in query:
+            sets.setdefault(row.user_id, set()).add(row.skill_id)
+
+        names: Dict[int, Set[str]] = {}
+        for column in TECHNOLOGY_COLUMNS:
+            model = column.class_
+            query = db.query(model.user_id, column).filter(column.isnot(None))
+            if user_ids is not None:
+                query = query.filter(model.user_id.in_(user_ids))
+            for user_id, value in query:
+                names.setdefault(user_id, set()).update(name.lower() for name in split_skill_list(value))
+
+        all_names = set().union(*names.values()) if names else set()
+        skill_ids: Dict[str, int] = {}
+        if all_names:
+            for row in db.query(Skill.id, func.lower(Skill.name).label("name")).filter(
+                func.lower(Skill.name).in_(all_names)
+            ):
+                skill_ids[row.name] = row.id
+        for user_id, user_names in names.items():
+            sets.setdefault(user_id, set()).update(skill_ids[n] for n in user_names if n in skill_ids)
+
+        return sets
+
+    def _apply(self, skills: FrozenSet[int], delta: int) -> None:
+        for skill_id in skills:
+            self._users_with[skill_id] += delta
+            if self._users_with[skill_id] <= 0:
+                del self._users_with[skill_id]
+        for a, b in combinations(skills, 2):
+            self._pairs.setdefault(a, Counter())[b] += delta
+            self._pairs.setdefault(b, Counter())[a] += delta
+            if self._pairs[a][b] <= 0:
+                del self._pairs[a][b]
+                del self._pairs[b][a]
+
+    def _set_user(self, user_id: int, skills: FrozenSet[int]) -> None:
+        old = self._user_sets.pop(user_id, frozenset())
+        if old:
+            self._apply(old, -1)
+        if skills:
+            self._user_sets[user_id] = skills
+            self._apply(skills, +1)
+
+    def _build(self, db: Session) -> "SkillGraph":
+        """A complete graph from the database, built without touching this one"""
+        fresh = SkillGraph(self.rebuild_interval_seconds)
+        for user_id, skills in self._user_skill_sets(db).items():
+            fresh._set_user(user_id, frozenset(skills))
+        return fresh
+
+    def _rebuild_locked(self, db: Session) -> None:
+        with self._lock:
+            self._changed_during_rebuild = set()
+        try:
+            fresh = self._build(db)
+        except BaseException:
+            with self._lock:
+                self._changed_during_rebuild = None
+            raise
+        with self._lock:
+            for name in self._STATE:
+                setattr(self, name, getattr(fresh, name))
+            self._built_at = time.monotonic()
+            self._dirty.update(self._changed_during_rebuild)
+            self._changed_during_rebuild = None
+
+    def rebuild(self, db: Session) -> None:
+        """Rebuild now, waiting for any rebuild already in progress first"""
+        with self._rebuild_lock:
+            self._rebuild_locked(db)
+
+    def _rebuild_in_background(self) -> None:
+        db = SessionLocal()
+        try:
+            self._rebuild_locked(db)
+        except Exception as e:
+            print(f"Skill graph rebuild failed: {e}")
+        finally:
+            db.close()
+            self._rebuild_lock.release()
+
+    def refresh_users(self, db: Session, user_ids: Set[int]) -> None:
+        sets = self._user_skill_sets(db, user_ids)
+        with self._lock:
+            for user_id in user_ids:
+                self._set_user(user_id, frozenset(sets.get(user_id, ())))
+
+    def on_profile_change(self, user_ids: Set[int]) -> None:
+        # Runs inside the writer's commit: just note who to re-read
+        with self._lock:
+            if self._changed_during_rebuild is not None:
+                self._changed_during_rebuild.update(user_ids)
+            if self._built_at is not None:
+                self._dirty.update(user_ids)
+
+    def _apply_dirty(self, db: Session) -> None:
+        with self._refresh_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+            if not dirty:
+                return
+            try:
+                self.refresh_users(db, dirty)
+            except BaseException:
+                with self._lock:
+                    self._dirty.update(dirty)
+                raise
+
+    def _ensure_fresh(self, db: Session) -> None:
+        if self._built_at is None:
+            with self._rebuild_lock:
+                if self._built_at is None:  # Another request may have built it meanwhile
+                    self._rebuild_locked(db)
+        elif time.monotonic() - self._built_at > self.rebuild_interval_seconds \
+                and self._rebuild_lock.acquire(blocking=False):
+            # Stale: keep answering from the current graph while a new one is built
+            threading.Thread(target=self._rebuild_in_background, name="skill-graph-rebuild", daemon=True).start()
+        self._apply_dirty(db)
+
+    def related(self, db: Session, user_id: int, limit: int = 10) -> List[tuple]:
+        """Return (skill_id, score, co-occurrence count) for skills related to the user's set"""
+        self._ensure_fresh(db)
+        with self._lock:
+            owned = self._user_sets.get(user_id, frozenset())
+            scores: Dict[int, float] = {}
+            support: Counter = Counter()
+            for skill_id in owned:
+                for other, count in self._pairs.get(skill_id, {}).items():
+                    if other in owned:
+                        continue
+                    # Ochiai (cosine) similarity damps globally common skills
+                    similarity = count / math.sqrt(self._users_with[skill_id] * self._users_with[other])
+                    scores[other] = scores.get(other, 0.0) + similarity
+                    support[other] += count
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+            return [(skill_id, score, support[skill_id]) for skill_id, score in top]
+
+
+class SkillGraphService:
+    """Service for related-skill suggestions"""
+
+    def __init__(self, graph: SkillGraph):
+        self.graph = graph
+
+    def suggest(self, db: Session, user_id: int, limit: int = 10) -> List[dict]:
+        related = self.graph.related(db, user_id, limit)
+        if not related:
+            return []
+        skills = {
+            skill.id: skill
+            for skill in db.query(Skill).filter(Skill.id.in_([skill_id for skill_id, _, _ in related]))
+        }
+        return [
+            {
+                "skill_id": skill_id,
+                "name": skills[skill_id].name,
+                "category": skills[skill_id].category,
+                "score": round(score, 4),
+                "co_occurrences": count,
+            }
+            for skill_id, score, count in related
+            if skill_id in skills
+        ]
+
+
+skill_graph = SkillGraph(rebuild_interval_seconds=settings.skill_graph_rebuild_seconds)
+profile_events.subscribe(skill_graph.on_profile_change)
+
+skill_graph_service = SkillGraphService(skill_graph)
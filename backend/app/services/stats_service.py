@@ -0,0 +1,209 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, literal, or_, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.achievement import Internship, Course, Hackathon, Project, Skill, UserSkill, VerificationStatus
+from app.models.user import User
+from app.models.user_stats import UserStats
+from app.services import change_tokens
+
+MODELS = {
+    "internship": Internship,
+    "course": Course,
+    "hackathon": Hackathon,
+    "project": Project,
+}
+
+TOP_SKILLS = 8
+
+
+def counter(kind: str, status) -> str:
+    """Column holding the number of ``kind`` achievements in ``status``"""
+    status = VerificationStatus(status or VerificationStatus.PENDING)
+    return f"{kind}s_{status.value}"
+
+
+COUNTERS = [counter(kind, s) for kind in MODELS for s in VerificationStatus]
+
+
+class StatsService:
+    """Maintains the user_stats row behind counts in summaries and dashboards.
+
+    Handlers apply deltas in the same transaction as the change itself, so a
+    counter moves exactly when the row it counts commits. A missing stats row
+    is rebuilt from the source tables on first use, and ``rebuild`` can
+    recompute every row if the counters are ever suspected to have drifted.
+    It counts inside its UPDATE, so it is safe to run while users write.
+    """
+
+    # Deltas
+
+    def record(self, db: Session, user_id: int, **deltas: int) -> None:
+        """Add ``deltas`` to the user's counters atomically"""
+        values = {name: getattr(UserStats, name) + delta for name, delta in deltas.items() if delta}
+        if not values:
+            return
+        statement = update(UserStats).where(UserStats.user_id == user_id).values(values)
+        if db.execute(statement).rowcount:
+            return
+        # No row yet: count from the source tables, which already include this change
+        try:
+            with db.begin_nested():
+                self.rebuild_user(db, user_id)
+        except IntegrityError:
+            # Someone else created it first, from data that can't include our change
+            db.execute(statement)
+
+    def achievement_added(self, db: Session, user_id: int, kind: str, status=None) -> None:
+        self.record(db, user_id, **{counter(kind, status): 1})
+
+    def achievement_removed(self, db: Session, user_id: int, kind: str, status=None) -> None:
+        self.record(db, user_id, **{counter(kind, status): -1})
+
+    def status_changed(self, db: Session, user_id: int, kind: str, old, new) -> None:
+        if counter(kind, old) != counter(kind, new):
+            self.record(db, user_id, **{counter(kind, old): -1, counter(kind, new): 1})
+
+    def skills_changed(self, db: Session, user_id: int, delta: int = 0) -> None:
+        """Apply a skill count delta and re-rank the user's top skills"""
+        db.flush()
+        self.record(db, user_id, skills_count=delta)
+        db.execute(
+            update(UserStats)
+            .where(UserStats.user_id == user_id)
+            .values(top_skills=self.top_skills(db, user_id))
+        )
+
+    # Reading
+
+    def get(self, db: Session, user_id: int) -> Dict[str, Any]:
+        """The user's counters as a dict (see ``as_dict``)"""
+        stats = db.get(UserStats, user_id)
+        if stats is None:
+            # Created by the user's first change or by ``rebuild``; count directly until then
+            stats = self._fill(db, UserStats(user_id=user_id), *self._count_user(db, user_id))
+        return self.as_dict(stats)
+
+    @staticmethod
+    def as_dict(stats: UserStats) -> Dict[str, Any]:
+        """{"counts": {kind: n}, "verification": {kind: {status: n}}, "skills_count", "top_skills"}"""
+        verification = {
+            f"{kind}s": {s.value: getattr(stats, counter(kind, s)) or 0 for s in VerificationStatus}
+            for kind in MODELS
+        }
+        return {
+            "counts": {kind: sum(by_status.values()) for kind, by_status in verification.items()},
+            "verification": verification,
+            "skills_count": stats.skills_count or 0,
+            "top_skills": list(stats.top_skills or []),
+        }
+
+    # Rebuilding
+
+    @staticmethod
+    def _achievement_counts(db: Session, user_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, int]]:
+        """Counters per user from one UNION ALL ... GROUP BY over the achievement tables"""
+        parts = []
+        for kind, model in MODELS.items():
+            query = select(
+                model.user_id.label("user_id"),
+                literal(kind).label("kind"),
+                model.verification_status.label("status"),
+                func.count().label("n"),
+            ).group_by(model.user_id, model.verification_status)
+            if user_ids is not None:
+                query = query.where(model.user_id.in_(list(user_ids)))
+            parts.append(query)
+
+        counts: Dict[int, Dict[str, int]] = {}
+        for user_id, kind, status, n in db.execute(union_all(*parts)):
+            row = counts.setdefault(user_id, {})
+            row[counter(kind, status)] = row.get(counter(kind, status), 0) + n
+        return counts
+
+    @staticmethod
+    def top_skills(db: Session, user_id: int) -> List[str]:
+        rows = db.execute(
+            select(Skill.name)
+            .join(UserSkill, UserSkill.skill_id == Skill.id)
+            .where(UserSkill.user_id == user_id)
+            .order_by(UserSkill.verified_count.desc(), UserSkill.years_of_experience.desc(), UserSkill.id)
+            .limit(TOP_SKILLS)
+        )
+        return [name for (name,) in rows]
+
+    def _count_user(self, db: Session, user_id: int):
+        counts = self._achievement_counts(db, [user_id]).get(user_id, {})
+        skills_count = db.query(func.count(UserSkill.id)).filter(UserSkill.user_id == user_id).scalar()
+        return counts, skills_count
+
+    def _fill(self, db: Session, stats: UserStats, counts: Dict[str, int], skills_count: int) -> UserStats:
+        for name in COUNTERS:
+            setattr(stats, name, counts.get(name, 0))
+        stats.skills_count = skills_count
+        stats.top_skills = self.top_skills(db, stats.user_id)
+        return stats
+
+    def _store(self, db: Session, user_id: int, counts: Dict[str, int], skills_count: int) -> UserStats:
+        stats = db.get(UserStats, user_id)
+        if stats is None:
+            stats = UserStats(user_id=user_id)
+            db.add(stats)
+        return self._fill(db, stats, counts, skills_count)
+
+    def rebuild_user(self, db: Session, user_id: int) -> UserStats:
+        """Recompute one user's row from the source tables"""
+        db.flush()
+        stats = self._store(db, user_id, *self._count_user(db, user_id))
+        db.flush()
+        return stats
+
+    @staticmethod
+    def _recount_values() -> Dict[str, Any]:
+        """Correlated COUNT subqueries for every counter of the user_stats row being updated"""
+        values: Dict[str, Any] = {}
+        for kind, model in MODELS.items():
+            for status in VerificationStatus:
+                matches = model.verification_status == status
+                if status == VerificationStatus.PENDING:
+                    matches = or_(matches, model.verification_status.is_(None))  # See ``counter``
+                values[counter(kind, status)] = (
+                    select(func.count()).where(model.user_id == UserStats.user_id, matches).scalar_subquery()
+                )
+        values["skills_count"] = (
+            select(func.count()).where(UserSkill.user_id == UserStats.user_id).scalar_subquery()
+        )
+        return values
+
+    def rebuild(self, db: Session, batch_size: int = 500) -> int:
+        """Recompute every user's row; returns the number of users processed.
+
+        The counts are taken by the UPDATE itself rather than read first and
+        written back, so a delta committed meanwhile is not overwritten.
+        """
+        user_ids = [user_id for (user_id,) in db.execute(select(User.id).order_by(User.id))]
+        for start in range(0, len(user_ids), batch_size):
+            batch = user_ids[start:start + batch_size]
+            existing = set(db.execute(select(UserStats.user_id).where(UserStats.user_id.in_(batch))).scalars())
+            for user_id in batch:
+                if user_id not in existing:
+                    self.rebuild_user(db, user_id)
+            db.execute(
+                update(UserStats).where(UserStats.user_id.in_(batch)).values(self._recount_values()),
+                execution_options={"synchronize_session": False},
+            )
+            # The rows are locked now, so no top-skills update can slip in between
+            for user_id in batch:
+                db.execute(
+                    update(UserStats).where(UserStats.user_id == user_id)
+                    .values(top_skills=self.top_skills(db, user_id))
+                )
+            # Counters feed cached profiles and dashboards: make clients revalidate
+            change_tokens.bump(db.connection(), batch)
+            db.commit()
+        return len(user_ids)
+
+
+stats_service = StatsService()
@@ -0,0 +1,159 @@
+import hashlib
+import os
+import re
+import tempfile
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.models.stored_object import StoredObject, StoredObjectUpload
+from app.models.user import User
+
+FILES_PREFIX = "/api/files/"
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+# Accepted upload types, identified by their leading bytes rather than the
+# client's Content-Type header
+SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UnsupportedFileType(Exception):
+    pass
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class StorageService:
+    """Content-addressed file store.
+
+    Uploads are streamed to a temporary file while being hashed, so memory use
+    is bounded by the chunk size, then renamed to ``<root>/ab/cd/<sha256>``.
+    Identical files uploaded by different users share one copy on disk, and
+    each uploader is recorded so that only they can read it back: pointing an
+    achievement's URL at someone else's file grants nothing.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def path_for(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    @staticmethod
+    def url_for(sha256: str) -> str:
+        return f"{FILES_PREFIX}{sha256}"
+
+    @staticmethod
+    def is_stored_url(url: Optional[str]) -> bool:
+        return bool(url) and url.startswith(FILES_PREFIX)
+
+    async def save(self, db: Session, chunks: AsyncIterator[bytes], user_id: int) -> StoredObject:
+        """Stream ``chunks`` into the store and return the (possibly existing) object.
+
+        Only reading the request happens on the event loop; disk writes and
+        the database work run in the threadpool.
+        """
+        tmp_path = None
+        try:
+            fd, tmp_path = await run_in_threadpool(self._temp_file)
+            digest = hashlib.sha256()
+            size = 0
+            head = b""
+            pending = bytearray()
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadTooLarge()
+                    if len(head) < 16:
+                        head += chunk[:16 - len(head)]
+                    digest.update(chunk)
+                    pending.extend(chunk)
+                    if len(pending) >= WRITE_BUFFER_BYTES:
+                        await run_in_threadpool(f.write, bytes(pending))
+                        pending.clear()
+                if pending:
+                    await run_in_threadpool(f.write, bytes(pending))
+
+            content_type = sniff_content_type(head)
+            if content_type is None:
+                raise UnsupportedFileType()
+            return await run_in_threadpool(
+                self._commit, db, tmp_path, digest.hexdigest(), size, content_type, user_id
+            )
+        except BaseException:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _temp_file(self):
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        return tempfile.mkstemp(dir=tmp_dir)
+
+    def _commit(self, db: Session, tmp_path: str, sha256: str, size: int,
+                content_type: str, user_id: int) -> StoredObject:
+        """Move a finished upload into place and record it and its uploader"""
+        path = self.path_for(sha256)
+        if os.path.exists(path):
+            os.remove(tmp_path)  # Already stored
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+
+        stored = db.get(StoredObject, sha256)
+        if stored is None:
+            stored = StoredObject(sha256=sha256, size=size, content_type=content_type, uploaded_by=user_id)
+            db.add(stored)
+            try:
+                db.commit()
+            except IntegrityError:
+                # The same file was uploaded concurrently
+                db.rollback()
+                stored = db.get(StoredObject, sha256)
+
+        if db.get(StoredObjectUpload, (sha256, user_id)) is None:
+            db.add(StoredObjectUpload(sha256=sha256, user_id=user_id))
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()  # Same user, same file, concurrently
+        return stored
+
+    def may_read(self, db: Session, stored: StoredObject, user: User) -> bool:
+        """Whether ``user`` uploaded the file themselves"""
+        if stored.uploaded_by == user.id:
+            return True
+        return db.get(StoredObjectUpload, (stored.sha256, user.id)) is not None
+
+    def get(self, db: Session, sha256: str) -> Optional[StoredObject]:
+        if not SHA256_PATTERN.match(sha256):
+            return None
+        return db.get(StoredObject, sha256)
+
+
+storage_service = StorageService(settings.upload_dir, settings.upload_max_bytes)
@@ -0,0 +1,157 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Dict, Optional
+
+import orjson
+
+from app import metrics
+from app.config import settings
+from app.database import SessionLocal
+from app.rate_limit import admission
+from app.models.resume import Resume
+from app.models.user import User
+from app.services import change_tokens, revision_service
+from app.services.profile_cache import profile_cache
+from app.services.resume_service import resume_service
+
+summary_requests = metrics.Counter(
+    "summary_requests_total", "Summary regeneration requests by how they were served", ("outcome",)
+)
+
+
+class _Batch:
+    """Requests for one resume that will be answered by a single generation"""
+    __slots__ = ("future", "due", "deadline", "force", "started")
+
+    def __init__(self, now: float, window: float, max_wait: float, force: bool):
+        self.future: Future = Future()
+        self.due = now + window
+        self.deadline = now + max_wait
+        self.force = force
+        self.started = False
+
+
+class SummaryScheduler:
+    """Debounced, single-flight AI summary regeneration per resume.
+
+    The first request for a resume opens a batch and waits out the debounce
+    window; each further request pushes the window back (up to ``max_wait``
+    after the first) and joins the batch. When the window closes the first
+    caller generates once, from the profile as it is then, and every caller
+    gets that result. Requests arriving while a generation is running start
+    the next batch, since they may carry newer data.
+
+    A forced request (an explicit "regenerate") doesn't wait: it closes the
+    window at once, for its own batch or the one it joins, so it never holds
+    a worker thread for the debounce. It also joins a generation that is
+    already running, which is as fresh as the user asked for.
+
+    Unless forced, a batch whose profile is byte-for-byte the one the current
+    summary was generated from keeps that summary without calling the LLM.
+
+    Admission control (``app.rate_limit``) is charged once per batch, to the
+    user, around the LLM call alone: waiting out the window or for someone
+    else's generation holds no "ai" slot and spends no token. If the call is
+    refused, every caller in the batch gets the 429.
+    """
+
+    def __init__(self, window_seconds: float, max_wait_seconds: float, remembered: int = 4096):
+        self.window = window_seconds
+        self.max_wait = max(max_wait_seconds, window_seconds)
+        self.remembered = remembered
+        self._batches: Dict[int, _Batch] = {}  # Still collecting requests
+        self._running: Dict[int, _Batch] = {}
+        # resume id -> digest of the profile its current summary was generated from
+        self._inputs: "OrderedDict[int, bytes]" = OrderedDict()
+        self._cond = threading.Condition()
+
+    def regenerate(self, resume_id: int, user_id: int, force: bool = False) -> Optional[str]:
+        """Regenerate the resume's AI summary and return it (None if the resume is gone)"""
+        now = time.monotonic()
+        with self._cond:
+            batch = self._batches.get(resume_id)
+            if batch is None and force:
+                batch = self._running.get(resume_id)
+            if batch is not None and batch.started:
+                summary_requests.inc(outcome="coalesced")
+                leader = False
+            elif batch is not None:
+                batch.due = now if force else min(now + self.window, batch.deadline)
+                batch.force = batch.force or force
+                if force:
+                    self._cond.notify_all()  # Wake the leader
+                summary_requests.inc(outcome="coalesced")
+                leader = False
+            else:
+                batch = self._batches[resume_id] = _Batch(now, 0 if force else self.window, self.max_wait, force)
+                leader = True
+
+        if not leader:
+            return batch.future.result()
+
+        with self._cond:
+            while (remaining := batch.due - time.monotonic()) > 0:
+                self._cond.wait(remaining)
+            batch.started = True
+            # Later requests start a new batch from here on
+            if self._batches.get(resume_id) is batch:
+                del self._batches[resume_id]
+            self._running[resume_id] = batch
+
+        try:
+            batch.future.set_result(self._generate(resume_id, user_id, batch.force))
+        except BaseException as e:
+            batch.future.set_exception(e)
+        finally:
+            with self._cond:
+                if self._running.get(resume_id) is batch:
+                    del self._running[resume_id]
+        return batch.future.result()
+
+    def _generate(self, resume_id: int, user_id: int, force: bool) -> Optional[str]:
+        db = SessionLocal()
+        try:
+            resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == user_id).first()
+            if resume is None:
+                return None
+            user = db.get(User, user_id)
+            token = change_tokens.current(db, user_id)
+            profile = profile_cache.get_or_build(
+                user_id, token.version, lambda: resume_service.get_user_complete_data(db, user)
+            )
+            digest = hashlib.blake2b(profile, digest_size=16).digest()
+
+            with self._cond:
+                unchanged = self._inputs.get(resume_id) == digest
+            if unchanged and not force and resume.summary and resume.is_ai_generated_summary:
+                summary_requests.inc(outcome="unchanged")
+                return resume.summary
+
+            with admission.admit("ai", f"user:{user_id}"):
+                summary = resume_service.generate_ai_summary(orjson.loads(profile))
+            summary_requests.inc(outcome="generated")
+
+            resume.summary = summary
+            resume.is_ai_generated_summary = 1
+            resume.last_generated_at = datetime.utcnow()
+            revision_service.tag(db, "ai_summary")
+            db.commit()
+
+            with self._cond:
+                self._inputs[resume_id] = digest
+                self._inputs.move_to_end(resume_id)
+                while len(self._inputs) > self.remembered:
+                    self._inputs.popitem(last=False)
+            return summary
+        finally:
+            db.close()
+
+
+summary_scheduler = SummaryScheduler(
+    window_seconds=settings.summary_debounce_seconds,
+    max_wait_seconds=settings.summary_max_wait_seconds,
+)
@@ -0,0 +1,422 @@
+import math
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.achievement import Skill, UserSkill
+from app.models.resume import Resume
+from app.models.user import User
+from app.services import profile_events
+
+PROFICIENCY_WEIGHTS = {
+    "beginner": 1.0,
+    "intermediate": 2.0,
+    "advanced": 3.0,
+    "expert": 4.0,
+}
+
+
+class TalentQuery(NamedTuple):
+    expression: Optional[tuple]
+    verified_only: bool
+    min_years: int
+
+
+class TalentQueryError(ValueError):
+    pass
+
+
+def posting_score(proficiency_level: Optional[str], years: Optional[int], verified_count: Optional[int]) -> float:
+    """Weight a user's skill by proficiency, verification and experience"""
+    weight = PROFICIENCY_WEIGHTS.get((proficiency_level or "").strip().lower(), 1.0)
+    return weight * (1.0 + math.log1p(verified_count or 0)) + 0.25 * min(years or 0, 10)
+
+
+# Query parsing
+#
+#   query      := expression ("," modifier)*
+#   expression := and_expr ("OR" and_expr)*
+#   and_expr   := unary ("AND" unary)*
+#   unary      := "NOT" unary | "(" expression ")" | skill
+#   modifier   := "verified" | [">=" | "≥"] N ["+"] "years"
+#
+# A skill is one or more words (so "Machine Learning" works) or a quoted string.
+
+_TOKEN_RE = re.compile(r'\s*(\(|\)|"[^"]*"|[^\s()"]+)')
+_YEARS_RE = re.compile(r"^(?:>=|≥)?\s*(\d+)\s*\+?\s*(?:years?|yrs?)$", re.IGNORECASE)
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+def parse_query(query: str) -> TalentQuery:
+    expression_text, *modifiers = query.split(",")
+    verified_only = False
+    min_years = 0
+    for modifier in modifiers:
+        modifier = modifier.strip()
+        years = _YEARS_RE.match(modifier)
+        if modifier.lower() == "verified":
+            verified_only = True
+        elif years:
+            min_years = int(years.group(1))
+        elif modifier:
+            raise TalentQueryError(f"Unknown modifier: {modifier}")
+
+    tokens = _TOKEN_RE.findall(expression_text.strip())
+    position = 0
+
+    def peek() -> Optional[str]:
+        return tokens[position] if position < len(tokens) else None
+
+    def take() -> str:
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def expression():
+        node = and_expr()
+        while peek() is not None and peek().upper() == "OR":
+            take()
+            node = ("or", node, and_expr())
+        return node
+
+    def and_expr():
+        node = unary()
+        while peek() is not None and peek().upper() == "AND":
+            take()
+            node = ("and", node, unary())
+        return node
+
+    def unary():
+        token = peek()
+        if token is None:
+            raise TalentQueryError("Unexpected end of query")
+        if token.upper() == "NOT":
+            take()
+            return ("not", unary())
+        if token == "(":
+            take()
+            node = expression()
+            if peek() != ")":
+                raise TalentQueryError("Missing closing parenthesis")
+            take()
+            return node
+        if token == ")":
+            raise TalentQueryError("Unexpected closing parenthesis")
+        if token.startswith('"'):
+            return ("skill", take().strip('"').strip().lower())
+        words = []
+        while peek() is not None and peek() not in ("(", ")") and peek().upper() not in _OPERATORS \
+                and not peek().startswith('"'):
+            words.append(take())
+        return ("skill", " ".join(words).lower())
+
+    node = expression() if tokens else None
+    if position != len(tokens):
+        raise TalentQueryError(f"Unexpected token: {tokens[position]}")
+    return TalentQuery(node, verified_only, min_years)
+
+
+class PostingList:
+    """Users holding one skill, as parallel NumPy arrays (slot, score, years, verified)"""
+
+    __slots__ = ("slots", "scores", "years", "verified")
+
+    def __init__(self, slots=(), scores=(), years=(), verified=()):
+        self.slots = np.asarray(slots, dtype=np.int64)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self.years = np.asarray(years, dtype=np.int32)
+        self.verified = np.asarray(verified, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def remove(self, slot: int) -> None:
+        keep = self.slots != slot
+        if not keep.all():
+            self.slots, self.scores = self.slots[keep], self.scores[keep]
+            self.years, self.verified = self.years[keep], self.verified[keep]
+
+    def add(self, slot: int, score: float, years: int, verified: int) -> None:
+        self.remove(slot)
+        self.slots = np.append(self.slots, slot)
+        self.scores = np.append(self.scores, np.float32(score))
+        self.years = np.append(self.years, np.int32(years))
+        self.verified = np.append(self.verified, np.int32(verified))
+
+
+class TalentIndex:
+    """Inverted index from skill id to the public profiles that list it.
+
+    Each user gets a dense slot; queries evaluate to (mask, score) vectors over
+    all slots so boolean operators are vectorized NumPy operations rather than
+    per-user Python loops. Postings are per-process and updated incrementally
+    from profile change events; a periodic rebuild picks up writes made by
+    other workers. Only the first build blocks queries: later ones run on a
+    background thread, one at a time, into a separate index that is swapped
+    in when complete, while queries keep using the old one.
+    """
+
+    _STATE = ("_postings", "_skill_ids", "_skill_names", "_user_skills", "_slots", "_slot_users", "_active")
+
+    def __init__(self, rebuild_interval_seconds: int):
+        self.rebuild_interval_seconds = rebuild_interval_seconds
+        self._reset()
+        self._built_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()  # Single flight
+        self._changed_during_rebuild: Optional[Set[int]] = None
+
+    def _reset(self) -> None:
+        self._postings: Dict[int, PostingList] = {}
+        self._skill_ids: Dict[str, Set[int]] = {}  # lower-cased name -> skill ids
+        self._skill_names: Dict[int, str] = {}
+        self._user_skills: Dict[int, Set[int]] = {}  # forward index, for removals
+        self._slots: Dict[int, int] = {}  # user id -> slot
+        self._slot_users = np.zeros(0, dtype=np.int64)
+        self._active = np.zeros(0, dtype=bool)
+
+    # Building and maintenance
+
+    @staticmethod
+    def _public_user_ids(db: Session, user_ids: Optional[Iterable[int]] = None) -> Set[int]:
+        query = db.query(Resume.user_id).filter(Resume.is_public == 1)
+        if user_ids is not None:
+            query = query.filter(Resume.user_id.in_(list(user_ids)))
+        return {row.user_id for row in query.distinct()}
+
+    @staticmethod
+    def _skill_rows(db: Session, user_ids: Optional[Iterable[int]] = None):
+        query = db.query(
+            UserSkill.user_id, UserSkill.skill_id, UserSkill.proficiency_level,
+            UserSkill.years_of_experience, UserSkill.verified_count, Skill.name,
+        ).join(Skill, Skill.id == UserSkill.skill_id)
+        if user_ids is not None:
+            query = query.filter(UserSkill.user_id.in_(list(user_ids)))
+        return query.all()
+
+    def _slot_for(self, user_id: int) -> int:
+        slot = self._slots.get(user_id)
+        if slot is None:
+            slot = len(self._slots)
+            self._slots[user_id] = slot
+            if slot >= len(self._slot_users):
+                capacity = max(1024, 2 * len(self._slot_users))
+                self._slot_users = np.resize(self._slot_users, capacity)
+                self._active = np.concatenate([self._active, np.zeros(capacity - len(self._active), dtype=bool)])
+            self._slot_users[slot] = user_id
+        self._active[slot] = True
+        return slot
+
+    def _register_skill(self, skill_id: int, name: str) -> None:
+        self._skill_names[skill_id] = name
+        self._skill_ids.setdefault(name.strip().lower(), set()).add(skill_id)
+
+    def _build(self, db: Session) -> "TalentIndex":
+        """A complete index from the database, built without touching this one"""
+        fresh = TalentIndex(self.rebuild_interval_seconds)
+        public_user_ids = self._public_user_ids(db)
+        columns: Dict[int, tuple] = {}
+        for row in self._skill_rows(db):
+            if row.user_id not in public_user_ids:
+                continue
+            fresh._register_skill(row.skill_id, row.name)
+            fresh._user_skills.setdefault(row.user_id, set()).add(row.skill_id)
+            slots, scores, years, verified = columns.setdefault(row.skill_id, ([], [], [], []))
+            slots.append(fresh._slot_for(row.user_id))
+            scores.append(posting_score(row.proficiency_level, row.years_of_experience, row.verified_count))
+            years.append(row.years_of_experience or 0)
+            verified.append(row.verified_count or 0)
+        fresh._postings = {skill_id: PostingList(*column) for skill_id, column in columns.items()}
+        return fresh
+
+    def _rebuild_locked(self, db: Session) -> None:
+        with self._lock:
+            self._changed_during_rebuild = set()
+        try:
+            fresh = self._build(db)
+        except BaseException:
+            with self._lock:
+                self._changed_during_rebuild = None
+            raise
+        with self._lock:
+            for name in self._STATE:
+                setattr(self, name, getattr(fresh, name))
+            self._built_at = time.monotonic()
+            changed, self._changed_during_rebuild = self._changed_during_rebuild, None
+        # The new index may predate profile changes made while it was built
+        if changed:
+            self.refresh_users(db, changed)
+
+    def rebuild(self, db: Session) -> None:
+        """Rebuild now, waiting for any rebuild already in progress first"""
+        with self._rebuild_lock:
+            self._rebuild_locked(db)
+
+    def _rebuild_in_background(self) -> None:
+        db = SessionLocal()
+        try:
+            self._rebuild_locked(db)
+        except Exception as e:
+            print(f"Talent index rebuild failed: {e}")
+        finally:
+            db.close()
+            self._rebuild_lock.release()
+
+    def refresh_users(self, db: Session, user_ids: Set[int]) -> None:
+        """Re-index only the given users (after their skills or resumes changed)"""
+        public_user_ids = self._public_user_ids(db, user_ids)
+        rows = self._skill_rows(db, public_user_ids) if public_user_ids else []
+        with self._lock:
+            for user_id in user_ids:
+                slot = self._slots.get(user_id)
+                if slot is None:
+                    continue
+                for skill_id in self._user_skills.pop(user_id, ()):
+                    self._postings[skill_id].remove(slot)
+                self._active[slot] = False
+            for row in rows:
+                self._register_skill(row.skill_id, row.name)
+                self._user_skills.setdefault(row.user_id, set()).add(row.skill_id)
+                self._postings.setdefault(row.skill_id, PostingList()).add(
+                    self._slot_for(row.user_id),
+                    posting_score(row.proficiency_level, row.years_of_experience, row.verified_count),
+                    row.years_of_experience or 0,
+                    row.verified_count or 0,
+                )
+
+    def on_profile_change(self, user_ids: Set[int]) -> None:
+        with self._lock:
+            if self._changed_during_rebuild is not None:
+                self._changed_during_rebuild.update(user_ids)
+        if self._built_at is None:
+            return
+        db = SessionLocal()
+        try:
+            self.refresh_users(db, user_ids)
+        finally:
+            db.close()
+
+    def _ensure_fresh(self, db: Session) -> None:
+        if self._built_at is None:
+            with self._rebuild_lock:
+                if self._built_at is None:  # Another request may have built it meanwhile
+                    self._rebuild_locked(db)
+        elif time.monotonic() - self._built_at > self.rebuild_interval_seconds \
+                and self._rebuild_lock.acquire(blocking=False):
+            # Stale: keep answering from the current index while a new one is built
+            threading.Thread(target=self._rebuild_in_background, name="talent-index-rebuild", daemon=True).start()
+
+    # Querying
+
+    def _match_skill(self, name: str, query: TalentQuery) -> Tuple[np.ndarray, np.ndarray]:
+        size = len(self._slot_users)
+        mask = np.zeros(size, dtype=bool)
+        scores = np.zeros(size, dtype=np.float32)
+        for skill_id in self._skill_ids.get(name, ()):
+            postings = self._postings.get(skill_id)
+            if not postings:
+                continue
+            keep = postings.years >= query.min_years
+            if query.verified_only:
+                keep &= postings.verified > 0
+            slots = postings.slots[keep]
+            mask[slots] = True
+            scores[slots] = np.maximum(scores[slots], postings.scores[keep])
+        return mask, scores
+
+    def _evaluate(self, node: tuple, query: TalentQuery) -> Tuple[np.ndarray, np.ndarray]:
+        op = node[0]
+        if op == "skill":
+            return self._match_skill(node[1], query)
+        if op in ("and", "or"):
+            left_mask, left_scores = self._evaluate(node[1], query)
+            right_mask, right_scores = self._evaluate(node[2], query)
+            mask = left_mask & right_mask if op == "and" else left_mask | right_mask
+            return mask, np.where(mask, left_scores + right_scores, 0.0).astype(np.float32)
+        if op == "not":
+            mask, _ = self._evaluate(node[1], query)
+            return ~mask & self._active, np.zeros(len(mask), dtype=np.float32)
+        raise TalentQueryError(f"Unknown operator: {op}")
+
+    def search(self, db: Session, query: TalentQuery, limit: int = 20) -> List[Tuple[int, float, List[str]]]:
+        """Return (user_id, score, matched skill names) for the top ``limit`` profiles"""
+        if query.expression is None:
+            return []
+        self._ensure_fresh(db)
+        with self._lock:
+            mask, scores = self._evaluate(query.expression, query)
+            candidates = np.flatnonzero(mask & self._active)
+            if len(candidates) > limit:
+                top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+                candidates = candidates[top]
+            order = np.lexsort((self._slot_users[candidates], -scores[candidates]))
+            wanted = self._query_skill_names(query.expression)
+
+            results = []
+            for slot in candidates[order]:
+                user_id = int(self._slot_users[slot])
+                matched = sorted(
+                    self._skill_names[skill_id] for skill_id in self._user_skills.get(user_id, ())
+                    if self._skill_names[skill_id].strip().lower() in wanted
+                )
+                results.append((user_id, float(scores[slot]), matched))
+            return results
+
+    @staticmethod
+    def _query_skill_names(node: tuple) -> Set[str]:
+        if node[0] == "skill":
+            return {node[1]}
+        if node[0] == "not":
+            return set()
+        return TalentIndex._query_skill_names(node[1]) | TalentIndex._query_skill_names(node[2])
+
+
+class TalentService:
+    """Service for recruiter-facing search across public profiles"""
+
+    def __init__(self, index: TalentIndex):
+        self.index = index
+
+    def search(self, db: Session, query: str, verified_only: bool = False,
+               min_years: int = 0, limit: int = 20) -> List[dict]:
+        parsed = parse_query(query)
+        parsed = parsed._replace(
+            verified_only=parsed.verified_only or verified_only,
+            min_years=max(parsed.min_years, min_years),
+        )
+        hits = self.index.search(db, parsed, limit)
+        if not hits:
+            return []
+
+        user_ids = [user_id for user_id, _, _ in hits]
+        users = {user.id: user for user in db.query(User).filter(User.id.in_(user_ids))}
+        slugs: Dict[int, str] = {}
+        for row in db.query(Resume.user_id, Resume.public_url_slug).filter(
+            Resume.user_id.in_(user_ids), Resume.is_public == 1
+        ).order_by(Resume.updated_at.desc()):
+            slugs.setdefault(row.user_id, row.public_url_slug)
+
+        return [
+            {
+                "user_id": user_id,
+                "full_name": users[user_id].full_name,
+                "public_url_slug": slugs.get(user_id),
+                "score": round(score, 4),
+                "matched_skills": matched,
+            }
+            for user_id, score, matched in hits
+            if user_id in users
+        ]
+
+
+talent_index = TalentIndex(rebuild_interval_seconds=settings.talent_index_rebuild_seconds)
+profile_events.subscribe(talent_index.on_profile_change)
+
+talent_service = TalentService(talent_index)
@@ -0,0 +1,377 @@
+import hashlib
+import html
+import ipaddress
+import json
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.achievement import (
+    Internship, Course, Hackathon, Project, Skill, UserSkill, VerificationStatus
+)
+from app.models.user import User
+from app.services import change_tokens, profile_events
+from app.services.skill_graph_service import split_skill_list
+from app.services.stats_service import stats_service
+from app.services.storage_service import storage_service
+
+MODELS = {
+    "internship": Internship,
+    "course": Course,
+    "hackathon": Hackathon,
+    "project": Project,
+}
+
+ACCEPTED_CONTENT_TYPES = ("application/pdf", "image/", "text/html", "text/plain", "application/json")
+TEXT_CONTENT_TYPES = ("text/html", "text/plain", "application/json")
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+GITHUB_HOSTS = ("github.com", "www.github.com")
+
+
+class FetchResult(NamedTuple):
+    status_code: int  # 0 for network errors
+    content_type: str
+    content_hash: Optional[str]
+    body: bytes
+    url: str = ""  # After redirects
+
+
+class Holder(NamedTuple):
+    """What a certificate page can be matched against, besides the certificate id"""
+    full_name: Optional[str]
+    github_login: Optional[str]
+
+
+class TransientError(Exception):
+    """Issuer unreachable or failing; leave the achievement pending and retry"""
+
+
+def evidence(kind: str, achievement) -> Tuple[Optional[str], Optional[str]]:
+    """Return (url, certificate id) to check for an achievement"""
+    if kind == "project":
+        return achievement.github_url or achievement.live_url, None
+    if storage_service.is_stored_url(achievement.certificate_url):
+        return None, None  # Uploaded files have no issuer to ask; left for manual review
+    return achievement.certificate_url, getattr(achievement, "certificate_id", None)
+
+
+def github_login(url: Optional[str]) -> Optional[str]:
+    """The account in a github.com URL (``https://github.com/<login>/...``), lower-cased"""
+    if not url:
+        return None
+    parts = urlsplit(url if "//" in url else f"https://{url}")
+    if (parts.hostname or "").lower() not in GITHUB_HOSTS:
+        return None
+    login = parts.path.strip("/").split("/")[0]
+    return login.lower() or None
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def skill_names(kind: str, achievement) -> List[str]:
+    value = {
+        "internship": lambda a: a.skills_used,
+        "course": lambda a: a.skills_learned,
+        "hackathon": lambda a: a.technologies_used,
+        "project": lambda a: a.technologies,
+    }[kind](achievement)
+    return split_skill_list(value)
+
+
+def credit_skills(db: Session, user_id: int, names: List[str], delta: int) -> None:
+    """Add ``delta`` to ``verified_count`` of the user's skills named by a (formerly) verified achievement"""
+    if not names:
+        return
+    skill_ids = db.query(Skill.id).filter(func.lower(Skill.name).in_([n.lower() for n in names]))
+    query = db.query(UserSkill).filter(
+        UserSkill.user_id == user_id,
+        UserSkill.skill_id.in_(skill_ids.scalar_subquery()),
+    )
+    if delta < 0:
+        query = query.filter(UserSkill.verified_count > 0)
+    query.update({"verified_count": func.coalesce(UserSkill.verified_count, 0) + delta}, synchronize_session=False)
+    stats_service.skills_changed(db, user_id)
+
+
+class VerificationService:
+    """Background verification of achievement certificates.
+
+    Checks run on a thread pool. Requests to one issuer host are capped by a
+    per-host semaphore. Concurrent checks of the same URL share one fetch, and
+    verdicts are cached by (content hash, certificate id), so identical
+    certificates are evaluated once.
+    """
+
+    def __init__(self, workers: int, per_host_limit: int, timeout_seconds: float,
+                 max_bytes: int, allow_private_hosts: bool, cache_size: int = 10000):
+        self.workers = workers
+        self.per_host_limit = per_host_limit
+        self.timeout_seconds = timeout_seconds
+        self.max_bytes = max_bytes
+        self.allow_private_hosts = allow_private_hosts
+        self.cache_size = cache_size
+        self.max_attempts = 3
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._client = None
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._url_hashes: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._verdicts: "OrderedDict[Tuple[str, Optional[str], Holder], VerificationStatus]" = OrderedDict()
+
+    # Lifecycle
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                import httpx
+
+                self._client = httpx.Client(
+                    timeout=self.timeout_seconds,
+                    follow_redirects=False,  # Followed hop by hop in _download
+                    limits=httpx.Limits(max_connections=self.workers * 2),
+                )
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="verify")
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._client.close()
+                self._pool = None
+                self._client = None
+
+    def enqueue(self, kind: str, achievement_id: int) -> Future:
+        """Schedule a verification check; returns a future for the final status"""
+        return self._get_pool().submit(self._run, kind, achievement_id)
+
+    def enqueue_pending(self, db: Session) -> List[Future]:
+        """Schedule checks for every pending achievement that has evidence to check"""
+        futures = []
+        for kind, model in MODELS.items():
+            for (achievement_id,) in db.query(model.id).filter(
+                model.verification_status == VerificationStatus.PENDING
+            ):
+                futures.append(self.enqueue(kind, achievement_id))
+        return futures
+
+    # Fetching
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slot
+
+    def _is_allowed_host(self, host: str) -> bool:
+        if self.allow_private_hosts:
+            return True
+        try:
+            addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+        except OSError:
+            return False
+        for address in addresses:
+            ip = ipaddress.ip_address(address.split("%")[0])
+            if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved:
+                return False
+        return True
+
+    def _download_once(self, url: str) -> Tuple[FetchResult, Optional[str]]:
+        """One request, without following redirects; returns the result and any redirect target"""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return FetchResult(400, "", None, b"", url), None
+        if not self._is_allowed_host(parts.hostname):
+            return FetchResult(403, "", None, b"", url), None
+
+        with self._host_slot(parts.hostname):
+            try:
+                with self._client.stream("GET", url) as response:
+                    location = response.headers.get("location")
+                    if response.status_code in REDIRECT_STATUSES and location:
+                        return FetchResult(response.status_code, "", None, b"", url), urljoin(url, location)
+                    digest = hashlib.sha256()
+                    body = bytearray()
+                    for chunk in response.iter_bytes():
+                        digest.update(chunk)
+                        body.extend(chunk)
+                        if len(body) > self.max_bytes:
+                            return FetchResult(413, "", None, b"", url), None
+                    return FetchResult(
+                        response.status_code,
+                        response.headers.get("content-type", "").split(";")[0].strip().lower(),
+                        digest.hexdigest(),
+                        bytes(body),
+                        url,
+                    ), None
+            except Exception as e:
+                print(f"Certificate fetch error for {url}: {e}")
+                return FetchResult(0, "", None, b"", url), None
+
+    def _download(self, url: str) -> FetchResult:
+        # Redirects are followed here rather than by httpx so that every hop's
+        # host goes through the same private-address check as the first one
+        for _ in range(MAX_REDIRECTS + 1):
+            result, location = self._download_once(url)
+            if location is None:
+                return result
+            url = location
+        return result  # Too many redirects: judged on the last 3xx, i.e. rejected
+
+    def _fetch(self, url: str) -> FetchResult:
+        """Fetch a URL, sharing one download among concurrent callers"""
+        with self._lock:
+            future = self._inflight.get(url)
+            owner = future is None
+            if owner:
+                future = self._inflight[url] = Future()
+        if not owner:
+            return future.result()
+        try:
+            result = self._download(url)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+
+    # Verdicts
+
+    @staticmethod
+    def _judge(result: FetchResult, certificate_id: Optional[str], holder: Holder) -> VerificationStatus:
+        """VERIFIED only if the page names the certificate id or the holder; PENDING if it can't tell"""
+        if result.status_code == 0 or result.status_code >= 500 or result.status_code == 429:
+            raise TransientError(f"status {result.status_code}")
+        if result.status_code != 200:
+            return VerificationStatus.REJECTED
+        if not result.content_type.startswith(ACCEPTED_CONTENT_TYPES):
+            return VerificationStatus.REJECTED
+        if certificate_id and certificate_id.strip().encode("utf-8") not in result.body:
+            return VerificationStatus.REJECTED
+        if result.content_type == "application/json":
+            try:
+                document = json.loads(result.body)
+            except ValueError:
+                return VerificationStatus.REJECTED
+            if isinstance(document, dict) and document.get("valid") is False:
+                return VerificationStatus.REJECTED
+        if certificate_id:
+            return VerificationStatus.VERIFIED
+
+        # Issuer-specific: a repository under the holder's own GitHub account
+        if holder.github_login and github_login(result.url) == holder.github_login:
+            return VerificationStatus.VERIFIED
+        # Otherwise the page has to name the holder
+        if holder.full_name and result.content_type.startswith(TEXT_CONTENT_TYPES):
+            page = result.body.decode("utf-8", errors="ignore")
+            if result.content_type == "text/html":
+                page = html.unescape(re.sub(r"<[^>]+>", " ", page))
+            if _normalize(holder.full_name) in _normalize(page):
+                return VerificationStatus.VERIFIED
+        # Reachable, but nothing ties it to this user: left for manual review
+        return VerificationStatus.PENDING
+
+    def _remember(self, cache: OrderedDict, key, value) -> None:
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+    def check(self, url: str, certificate_id: Optional[str] = None,
+              holder: Holder = Holder(None, None)) -> VerificationStatus:
+        with self._lock:
+            known = self._url_hashes.get(url)
+            if known is not None and time.monotonic() - known[0] < 3600:
+                verdict = self._verdicts.get((known[1], certificate_id, holder))
+                if verdict is not None:
+                    return verdict
+
+        result = self._fetch(url)
+        if result.content_hash is not None:
+            verdict = self._verdicts.get((result.content_hash, certificate_id, holder))
+            if verdict is not None:
+                return verdict
+        verdict = self._judge(result, certificate_id, holder)
+        if result.content_hash is not None:
+            self._remember(self._url_hashes, url, (time.monotonic(), result.content_hash))
+            self._remember(self._verdicts, (result.content_hash, certificate_id, holder), verdict)
+        return verdict
+
+    # Applying results
+
+    def _run(self, kind: str, achievement_id: int) -> Optional[VerificationStatus]:
+        db = SessionLocal()
+        try:
+            achievement = db.get(MODELS[kind], achievement_id)
+            if achievement is None or achievement.verification_status != VerificationStatus.PENDING:
+                return None
+            url, certificate_id = evidence(kind, achievement)
+            if not url:
+                return None
+            user_id, names = achievement.user_id, skill_names(kind, achievement)
+            user = db.get(User, user_id)
+            holder = Holder(user.full_name, github_login(user.github_url))
+            db.rollback()  # Don't hold a read transaction open during the fetch
+
+            for attempt in range(self.max_attempts):
+                try:
+                    status = self.check(url, certificate_id, holder)
+                    break
+                except TransientError as e:
+                    if attempt == self.max_attempts - 1:
+                        print(f"Verification of {kind} {achievement_id} deferred: {e}")
+                        return None
+                    time.sleep(2 ** attempt)
+            if status == VerificationStatus.PENDING:
+                return None
+
+            updated = db.query(MODELS[kind]).filter(
+                MODELS[kind].id == achievement_id,
+                MODELS[kind].verification_status == VerificationStatus.PENDING,
+            ).update({"verification_status": status}, synchronize_session=False)
+
+            if updated and status == VerificationStatus.VERIFIED:
+                credit_skills(db, user_id, names, 1)
+
+            if updated:
+                stats_service.status_changed(db, user_id, kind, VerificationStatus.PENDING, status)
+                change_tokens.bump(db.connection(), {user_id})
+            db.commit()
+            if updated:
+                # Bulk UPDATEs bypass the ORM flush that normally announces changes
+                profile_events.notify({user_id})
+            return status if updated else None
+        except Exception as e:
+            db.rollback()
+            print(f"Verification error for {kind} {achievement_id}: {e}")
+            return None
+        finally:
+            db.close()
+
+
+verification_service = VerificationService(
+    workers=settings.verification_workers,
+    per_host_limit=settings.verification_per_host_limit,
+    timeout_seconds=settings.verification_timeout_seconds,
+    max_bytes=settings.verification_max_bytes,
+    allow_private_hosts=settings.verification_allow_private_hosts,
+)
@@ -0,0 +1,179 @@
+"""Opt-in log of slow SQL statements with their query plans.
+
+Statements slower than ``SLOW_QUERY_MS`` are written as JSON lines to a
+rotating log file and kept in an in-memory ring buffer for the admin API.
+Parameter values are never recorded, only their types. The plan (``EXPLAIN
+QUERY PLAN`` on SQLite, ``EXPLAIN`` on PostgreSQL) is captured the first time
+each statement shape is slow and reused afterwards. It runs on a background
+thread over a separate pooled connection once the statement has finished, so
+it never touches the request's connection or transaction; entries waiting for
+a plan are logged when it arrives.
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\([^)]*\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\([^)]*\)s|%s|:\w+))+\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACE = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE|INSERT)\b", re.IGNORECASE)
+
+
+def statement_shape(statement: str) -> str:
+    """Statement with literals and IN-lists collapsed, so repeats group together"""
+    shape = _STRING.sub("?", statement)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(?, ...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+def redact(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    MAX_PLANS = 1000
+    MAX_WAITING = 100  # Entries queued for EXPLAIN; beyond that they are logged without a plan
+
+    def __init__(self, threshold_ms: float, path: Optional[str], buffer_size: int, explain: bool = True):
+        self.threshold_seconds = threshold_ms / 1000.0
+        self.explain = explain
+        self.entries: deque = deque(maxlen=buffer_size)
+        self._plans: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self._explain_prefix = "EXPLAIN "
+        self._waiting: "queue.Queue" = queue.Queue(maxsize=self.MAX_WAITING)
+        self._worker: Optional[threading.Thread] = None
+
+        self.logger = logging.getLogger("app.slow_queries")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        if path and not self.logger.handlers:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=10 * 1024 * 1024, backupCount=5)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger.addHandler(handler)
+
+    def install(self, engine: Engine) -> None:
+        self._engine = engine
+        self._explain_prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["slow_query_started"].pop()
+            if elapsed >= self.threshold_seconds:
+                self.record(statement, parameters, executemany, elapsed)
+
+    def _plan(self, statement: str, parameters, key: str) -> Optional[List[str]]:
+        with self._lock:
+            if key in self._plans:
+                return self._plans[key]
+        plan = None
+        try:
+            # Its own pooled connection, rolled back afterwards; a raw DBAPI
+            # cursor doesn't re-enter these hooks
+            connection = self._engine.raw_connection()
+            try:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(self._explain_prefix + statement, parameters)
+                    plan = [" | ".join(str(col) for col in row) for row in cursor.fetchall()]
+                finally:
+                    cursor.close()
+            finally:
+                connection.rollback()
+                connection.close()
+        except Exception as e:
+            plan = [f"EXPLAIN failed: {e}"]
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.MAX_PLANS:
+                self._plans.popitem(last=False)
+        return plan
+
+    def _explain_waiting(self) -> None:
+        while True:
+            entry, statement, parameters = self._waiting.get()
+            entry["plan"] = self._plan(statement, parameters, entry["shape_id"])
+            self._publish(entry)
+
+    def _publish(self, entry: Dict[str, Any]) -> None:
+        self.entries.append(entry)
+        self.logger.info(json.dumps(entry))
+
+    def record(self, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+        shape = statement_shape(statement)
+        entry: Dict[str, Any] = {
+            "time": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+            "duration_ms": round(elapsed * 1000, 2),
+            "shape_id": hashlib.sha1(shape.encode("utf-8")).hexdigest()[:12],
+            "statement": shape,
+            "parameters": redact(parameters) if not executemany else f"executemany x{len(parameters)}",
+            "plan": None,
+        }
+        if self.explain and not executemany and _EXPLAINABLE.match(statement):
+            with self._lock:
+                known = entry["shape_id"] in self._plans
+                if known:
+                    entry["plan"] = self._plans[entry["shape_id"]]
+                elif self._worker is None:
+                    self._worker = threading.Thread(target=self._explain_waiting, name="slow-query-explain", daemon=True)
+                    self._worker.start()
+            if not known:
+                # Copy: the caller may reuse its parameter list
+                copied = dict(parameters) if isinstance(parameters, dict) else tuple(parameters or ())
+                try:
+                    self._waiting.put_nowait((entry, statement, copied))
+                    return
+                except queue.Full:
+                    pass
+        self._publish(entry)
+
+    def query(self, limit: int = 100, min_ms: float = 0.0, contains: Optional[str] = None,
+              shape_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest-first entries from the ring buffer matching the filters"""
+        matches = []
+        for entry in reversed(list(self.entries)):
+            if entry["duration_ms"] < min_ms:
+                continue
+            if shape_id and entry["shape_id"] != shape_id:
+                continue
+            if contains and contains.lower() not in entry["statement"].lower():
+                continue
+            matches.append(entry)
+            if len(matches) >= limit:
+                break
+        return matches
+
+
+slow_query_log: Optional[SlowQueryLog] = None
+
+
+def enable(engine: Engine, threshold_ms: float, path: Optional[str], buffer_size: int, explain: bool = True) -> SlowQueryLog:
+    global slow_query_log
+    if slow_query_log is None:
+        slow_query_log = SlowQueryLog(threshold_ms, path, buffer_size, explain)
+        slow_query_log.install(engine)
+    return slow_query_log
@@ -0,0 +1,91 @@
+"""Benchmark login CPU per active-user-hour with and without refresh tokens.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_auth --repeat 40
+
+Measures the server CPU time of ``POST /auth/login`` (bcrypt) and of
+``POST /auth/refresh`` (HMAC plus indexed lookups) in-process, then models a
+user who keeps the app open for an hour:
+
+* before: 30-minute access tokens and no refresh, so a password login every
+  30 minutes;
+* after: access tokens of ``access_token_expire_minutes`` renewed through
+  ``/auth/refresh``, plus one password login per ``--login-every-hours``
+  (a new device or an expired refresh token).
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+
+def _cpu_ms(func, repeat: int) -> float:
+    func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        func()
+        samples.append(time.process_time() - started)
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=40)
+    parser.add_argument("--login-every-hours", type=float, default=24.0,
+                        help="How often an active user still logs in with a password")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="resume-bench-auth-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["DATA_DIR"] = os.path.join(workdir, "data")
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["METRICS_ENABLED"] = "false"
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.config import settings
+
+    credentials = {"username": "bench@example.com", "password": "bench-password"}
+    with TestClient(app) as client:
+        client.post("/api/auth/register", json={
+            "email": credentials["username"], "password": credentials["password"], "full_name": "Bench User",
+        })
+
+        def login():
+            response = client.post("/api/auth/login", data=credentials)
+            assert response.status_code == 200, response.text
+            return response.json()
+
+        state = {"refresh_token": login()["refresh_token"]}
+
+        def refresh():
+            response = client.post("/api/auth/refresh", json={"refresh_token": state["refresh_token"]})
+            assert response.status_code == 200, response.text
+            state["refresh_token"] = response.json()["refresh_token"]
+
+        login_ms = _cpu_ms(login, args.repeat)
+        refresh_ms = _cpu_ms(refresh, args.repeat)
+
+    before_per_hour = 60 / 30 * login_ms
+    refreshes_per_hour = 60 / settings.access_token_expire_minutes
+    after_per_hour = refreshes_per_hour * refresh_ms + login_ms / args.login_every_hours
+
+    print(json.dumps({
+        "cpu_ms": {"login": login_ms, "refresh": refresh_ms},
+        "per_active_user_hour": {
+            "before": {"logins": 2.0, "cpu_ms": round(before_per_hour, 3)},
+            "after": {
+                "refreshes": refreshes_per_hour,
+                "logins": round(1 / args.login_every_hours, 4),
+                "cpu_ms": round(after_per_hour, 3),
+            },
+            "reduction": round(before_per_hour / after_per_hour, 1),
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark the GET /resumes/{id} response path on a large profile.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_json --achievements 500
+
+Creates one user with ``--achievements`` achievements (plus skills) in a
+throwaway database and compares:
+
+* serialization alone: the response_model path (validate into
+  ResumeFullResponse, dump to Python, json.dumps) vs. orjson on the plain
+  dict vs. splicing the cached profile bytes;
+* the endpoint end to end: the previous implementation (mounted on a
+  benchmark-only route), the new route with the profile cache invalidated per request, and
+  the new route with a warm cache.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+
+def _timeit(func, repeat: int):
+    func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1] * 1000, 3),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--achievements", type=int, default=500)
+    parser.add_argument("--skills", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="resume-bench-json-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["DATA_DIR"] = os.path.join(workdir, "data")
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["METRICS_ENABLED"] = "false"
+
+    from fastapi import Depends
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+    from app.main import app
+    from app.auth import create_access_token, get_current_user
+    from app.database import engine, init_db, SessionLocal, get_db
+    from app.models.resume import Resume
+    from app.models.user import User
+    from app.responses import dumps
+    from app.schemas.resume import ResumeFullResponse
+    from app.services.profile_cache import profile_cache
+    from app.services.resume_service import resume_service
+    from benchmarks.datagen import Generator, INSERTS, KIND_WEIGHTS, TECH, generate
+
+    init_db()
+    generate(engine, users=1, achievements=0, skills=min(args.skills, len(TECH)))
+    gen = Generator(seed=3)
+    kinds = gen.rng.choices(list(KIND_WEIGHTS), weights=list(KIND_WEIGHTS.values()), k=args.achievements)
+    with engine.begin() as conn:
+        for kind in KIND_WEIGHTS:
+            rows = [gen.achievement(kind, 1) for k in kinds if k == kind]
+            if rows:
+                conn.execute(text(INSERTS[kind]), rows)
+
+    def resume_fields(resume):
+        return {
+            "id": resume.id, "user_id": resume.user_id, "title": resume.title, "template": resume.template,
+            "summary": resume.summary, "is_ai_generated_summary": bool(resume.is_ai_generated_summary),
+            "configuration": resume.configuration, "is_public": bool(resume.is_public),
+            "public_url_slug": resume.public_url_slug, "view_count": resume.view_count,
+            "last_generated_at": resume.last_generated_at, "created_at": resume.created_at,
+            "updated_at": resume.updated_at,
+        }
+
+    # The route as it was: build the dict, let response_model validate and encode it
+    @app.get("/bench/legacy-resume/{resume_id}", response_model=ResumeFullResponse)
+    def legacy_get_resume(resume_id: int, current_user: User = Depends(get_current_user), db=Depends(get_db)):
+        resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
+        return {**resume_fields(resume), "user_data": resume_service.get_user_complete_data(db, current_user)}
+
+    db = SessionLocal()
+    user = db.get(User, 1)
+    resume = db.query(Resume).filter(Resume.user_id == 1).first()
+    payload = {**resume_fields(resume), "user_data": resume_service.get_user_complete_data(db, user)}
+    profile_bytes = dumps(payload["user_data"])
+    fields = resume_fields(resume)
+
+    serialization = {
+        "response_model_json": _timeit(
+            lambda: json.dumps(ResumeFullResponse.model_validate(payload).model_dump(mode="json")), args.repeat),
+        "orjson_dict": _timeit(lambda: dumps(payload), args.repeat),
+        "cached_splice": _timeit(
+            lambda: dumps(fields)[:-1] + b',"user_data":' + profile_bytes + b"}", args.repeat),
+    }
+    db.close()
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+    with TestClient(app) as client:
+        legacy = client.get(f"/bench/legacy-resume/{resume.id}", headers=headers)
+        current = client.get(f"/api/resumes/{resume.id}", headers=headers)
+        assert legacy.json() == current.json(), "fast path must return the same document"
+
+        endpoint = {"legacy": _timeit(lambda: client.get(f"/bench/legacy-resume/{resume.id}", headers=headers),
+                                      args.repeat)}
+
+        def uncached():
+            profile_cache.on_profile_change({user.id})
+            return client.get(f"/api/resumes/{resume.id}", headers=headers)
+        endpoint["fast_uncached"] = _timeit(uncached, args.repeat)
+        endpoint["fast_cached"] = _timeit(lambda: client.get(f"/api/resumes/{resume.id}", headers=headers),
+                                          args.repeat)
+
+    print(json.dumps({
+        "achievements": args.achievements,
+        "response_bytes": len(current.content),
+        "serialization": serialization,
+        "endpoint": endpoint,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark achievement full-text search on a synthetic dataset.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_search --rows 1000000 --users 20000
+
+Builds a throwaway SQLite database, bulk-loads ``--rows`` achievements split
+evenly across the four searchable tables (the FTS triggers index them on the
+way in), then compares per-user FTS5 queries with the ``LIKE`` scan they replace.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+import app.models  # noqa: F401  (register tables on Base.metadata)
+from app.services.search_service import search_service, SOURCES
+
+TECH = [
+    "python", "react", "kafka", "django", "fastapi", "postgres", "redis", "docker",
+    "kubernetes", "typescript", "golang", "rust", "spark", "airflow", "graphql",
+    "tensorflow", "pytorch", "aws", "gcp", "terraform", "flutter", "swift", "java",
+]
+FILLER = [
+    "built", "designed", "implemented", "scalable", "pipeline", "service", "dashboard",
+    "team", "users", "latency", "improved", "platform", "api", "realtime", "analytics",
+    "mobile", "web", "data", "model", "deployment", "testing", "monitoring", "search",
+]
+
+
+def _sentence(rng: random.Random, words: int = 24) -> str:
+    # Zipf-ish: a few technologies dominate, like real resumes
+    out = []
+    for _ in range(words):
+        if rng.random() < 0.25:
+            out.append(TECH[min(int(rng.paretovariate(1.2)) - 1, len(TECH) - 1)])
+        else:
+            out.append(rng.choice(FILLER))
+    return " ".join(out)
+
+
+def generate(engine, rows: int, users: int, seed: int = 7, batch: int = 10000) -> float:
+    rng = random.Random(seed)
+    now = datetime(2024, 1, 1)
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, hashed_password, full_name) VALUES (:id, :email, 'x', :name)"), [
+            {"id": i, "email": f"user{i}@example.com", "name": f"User {i}"} for i in range(1, users + 1)
+        ])
+
+    statements = {
+        "internships": "INSERT INTO internships (user_id, company_name, position, start_date, description, achievements) "
+                       "VALUES (:user_id, :a, :b, :date, :body, :extra)",
+        "courses": "INSERT INTO courses (user_id, course_name, platform, description) VALUES (:user_id, :a, :b, :body)",
+        "hackathons": "INSERT INTO hackathons (user_id, hackathon_name, organizer, participation_date, project_description) "
+                      "VALUES (:user_id, :a, :b, :date, :body)",
+        "projects": "INSERT INTO projects (user_id, project_name, start_date, description) VALUES (:user_id, :a, :date, :body)",
+    }
+    per_table = rows // len(statements)
+
+    for table, statement in statements.items():
+        for start in range(0, per_table, batch):
+            params = [
+                {
+                    "user_id": rng.randint(1, users),
+                    "a": f"{rng.choice(TECH).title()} {rng.choice(FILLER)}",
+                    "b": rng.choice(FILLER).title(),
+                    "date": now,
+                    "body": _sentence(rng),
+                    "extra": _sentence(rng, 8),
+                }
+                for _ in range(min(batch, per_table - start))
+            ]
+            with engine.begin() as conn:
+                conn.execute(text(statement), params)
+
+    return time.perf_counter() - started
+
+
+def _like_scan(db, user_id: int, term: str):
+    selects = " UNION ALL ".join(
+        f"SELECT id FROM {source.table} WHERE user_id = :user_id AND ("
+        + " OR ".join(f"{column} LIKE :pattern" for column in source.body_columns)
+        + ")"
+        for source in SOURCES
+    )
+    return db.execute(text(selects), {"user_id": user_id, "pattern": f"%{term}%"}).all()
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1] * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--db", help="SQLite file to use (default: temporary)")
+    args = parser.parse_args(argv)
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "bench_search.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    search_service.install(engine)
+
+    load_seconds = generate(engine, args.rows, args.users)
+
+    rng = random.Random(11)
+    queries = [(rng.randint(1, args.users), rng.choice(TECH)) for _ in range(args.queries)]
+    db = sessionmaker(bind=engine)()
+
+    fts_times, like_times, hits = [], [], 0
+    for user_id, term in queries:
+        started = time.perf_counter()
+        hits += len(search_service.search(db, user_id, term, limit=20))
+        fts_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        _like_scan(db, user_id, term)
+        like_times.append(time.perf_counter() - started)
+
+    db.close()
+    print(json.dumps({
+        "rows": args.rows,
+        "users": args.users,
+        "load_seconds": round(load_seconds, 2),
+        "db_megabytes": round(os.path.getsize(path) / 1e6, 1),
+        "queries": args.queries,
+        "avg_hits": round(hits / args.queries, 2),
+        "fts": _percentiles(fts_times),
+        "like_scan": _percentiles(like_times),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Bulk synthetic data for benchmarks: N users with realistic achievement mixes.
+
+Usage (from the backend directory):
+    python -m benchmarks.datagen --db /tmp/bench.db --users 10000 --achievements 12 --skills 8
+
+Rows are written with executemany in large batches, straight through the
+engine, so loading a 10k-user dataset takes seconds. That skips the ORM
+hooks that keep the derived tables in step, so the same backfills as
+``python -m app.cli backfill-fingerprints`` and ``rebuild-stats`` run
+afterwards and every user gets a ``profile_versions`` row. Every user's password is
+``PASSWORD`` (one bcrypt hash, computed once).
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+
+PASSWORD = "benchmark-password"
+
+TECH = [
+    "Python", "JavaScript", "React", "SQL", "Java", "Docker", "AWS", "TypeScript", "Node.js", "Django",
+    "FastAPI", "PostgreSQL", "Git", "Kubernetes", "Machine Learning", "TensorFlow", "PyTorch", "Go",
+    "Rust", "C++", "Kafka", "Redis", "GraphQL", "Flutter", "Swift", "Kotlin", "Spark", "Airflow",
+    "Terraform", "GCP", "Azure", "Pandas", "NumPy", "Figma", "Linux", "Vue", "Angular", "Spring",
+    "MongoDB", "Elasticsearch",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Stark Industries", "Wayne Enterprises", "Hooli",
+             "Pied Piper", "Soylent", "Cyberdyne", "Tyrell", "Wonka", "Vandelay", "Gringotts"]
+POSITIONS = ["Software Engineering Intern", "Data Science Intern", "Backend Intern", "Frontend Intern",
+             "ML Research Intern", "DevOps Intern", "Product Intern"]
+PLATFORMS = ["Coursera", "Udemy", "edX", "Udacity", "LinkedIn Learning", "Pluralsight"]
+ORGANIZERS = ["MLH", "Devpost", "HackMIT", "TreeHacks", "PennApps", "ETHGlobal"]
+WORDS = ["built", "designed", "shipped", "scalable", "pipeline", "service", "dashboard", "team", "users",
+         "latency", "improved", "platform", "api", "realtime", "analytics", "mobile", "data", "model",
+         "deployment", "testing", "monitoring", "search", "reduced", "automated", "migrated"]
+
+# Rough share of each achievement type on real profiles
+KIND_WEIGHTS = {"internships": 0.2, "courses": 0.35, "hackathons": 0.15, "projects": 0.3}
+STATUS_WEIGHTS = {"PENDING": 0.6, "VERIFIED": 0.35, "REJECTED": 0.05}
+LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+
+
+class Generator:
+    def __init__(self, seed: int = 7):
+        self.rng = random.Random(seed)
+        # Zipf-like popularity: a few technologies appear on most profiles
+        self.tech_weights = [1 / (rank + 1) ** 1.1 for rank in range(len(TECH))]
+        self.epoch = datetime(2019, 1, 1)
+
+    def count(self, mean: float) -> int:
+        """Heavy-tailed per-user count with the given mean"""
+        if mean <= 0:
+            return 0
+        return max(0, int(self.rng.lognormvariate(0, 0.75) * mean / 1.32 + 0.5))
+
+    def techs(self, k: int):
+        picked = set()
+        while len(picked) < k:
+            picked.add(self.rng.choices(TECH, weights=self.tech_weights)[0])
+        return sorted(picked)
+
+    def sentence(self, words: int = 20) -> str:
+        techs = self.techs(2)
+        return " ".join(self.rng.choice(WORDS) if self.rng.random() > 0.15 else self.rng.choice(techs)
+                        for _ in range(words)).capitalize() + "."
+
+    def date(self) -> datetime:
+        return self.epoch + timedelta(days=self.rng.randint(0, 5 * 365))
+
+    def status(self) -> str:
+        return self.rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0]
+
+    def achievement(self, kind: str, user_id: int) -> Dict:
+        start = self.date()
+        techs = ", ".join(self.techs(self.rng.randint(1, 5)))
+        row = {"user_id": user_id, "status": self.status(), "created_at": start}
+        if kind == "internships":
+            row.update(company_name=self.rng.choice(COMPANIES), position=self.rng.choice(POSITIONS),
+                       start_date=start, end_date=start + timedelta(days=90), description=self.sentence(),
+                       achievements=self.sentence(12), skills_used=techs)
+        elif kind == "courses":
+            row.update(course_name=f"{self.techs(1)[0]} {self.rng.choice(['Fundamentals', 'Bootcamp', 'Advanced Topics'])}",
+                       platform=self.rng.choice(PLATFORMS), completion_date=start,
+                       duration_hours=self.rng.randint(4, 80), description=self.sentence(14), skills_learned=techs)
+        elif kind == "hackathons":
+            row.update(hackathon_name=f"{self.rng.choice(ORGANIZERS)} {start.year}", organizer=self.rng.choice(ORGANIZERS),
+                       participation_date=start, team_size=self.rng.randint(1, 5),
+                       position=self.rng.choice(["Winner", "Runner-up", "Participant", "Participant"]),
+                       project_name=self.rng.choice(WORDS).title(), project_description=self.sentence(),
+                       technologies_used=techs)
+        else:
+            row.update(project_name=f"{self.rng.choice(WORDS).title()} {self.rng.choice(WORDS)}",
+                       project_type=self.rng.choice(["Personal", "Academic", "Professional"]),
+                       start_date=start, description=self.sentence(30), technologies=techs,
+                       github_url=f"https://github.com/user{user_id}/{self.rng.randint(1, 10**6)}")
+        return row
+
+
+INSERTS = {
+    "internships": "INSERT INTO internships (user_id, company_name, position, start_date, end_date, is_current, "
+                   "description, achievements, skills_used, verification_status, created_at) VALUES (:user_id, "
+                   ":company_name, :position, :start_date, :end_date, 0, :description, :achievements, :skills_used, "
+                   ":status, :created_at)",
+    "courses": "INSERT INTO courses (user_id, course_name, platform, completion_date, duration_hours, description, "
+               "skills_learned, verification_status, created_at) VALUES (:user_id, :course_name, :platform, "
+               ":completion_date, :duration_hours, :description, :skills_learned, :status, :created_at)",
+    "hackathons": "INSERT INTO hackathons (user_id, hackathon_name, organizer, participation_date, team_size, position, "
+                  "project_name, project_description, technologies_used, verification_status, created_at) VALUES "
+                  "(:user_id, :hackathon_name, :organizer, :participation_date, :team_size, :position, :project_name, "
+                  ":project_description, :technologies_used, :status, :created_at)",
+    "projects": "INSERT INTO projects (user_id, project_name, project_type, start_date, is_ongoing, description, "
+                "technologies, github_url, verification_status, created_at) VALUES (:user_id, :project_name, "
+                ":project_type, :start_date, 0, :description, :technologies, :github_url, :status, :created_at)",
+}
+
+
+def generate(engine, users: int, achievements: float = 12, skills: float = 8, seed: int = 7,
+             public_ratio: float = 0.3, batch: int = 5000) -> Dict:
+    """Populate an empty schema; returns row counts and load time"""
+    from app.auth import get_password_hash
+
+    gen = Generator(seed)
+    started = time.perf_counter()
+    password_hash = get_password_hash(PASSWORD)
+    now = datetime(2024, 6, 1)
+    counts = {name: 0 for name in ["users", "skills", "user_skills", "resumes", *INSERTS]}
+
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO skills (id, name, category, created_at) VALUES (:id, :name, 'Technology', :now)"),
+                     [{"id": i + 1, "name": name, "now": now} for i, name in enumerate(TECH)])
+        counts["skills"] = len(TECH)
+
+    skill_ids = {name: i + 1 for i, name in enumerate(TECH)}
+    pending = {name: [] for name in ["users", "user_skills", "resumes", *INSERTS]}
+    statements = dict(INSERTS)
+    statements["users"] = ("INSERT INTO users (id, email, hashed_password, full_name, location, bio, created_at, updated_at) "
+                           "VALUES (:id, :email, :hashed_password, :full_name, :location, :bio, :now, :now)")
+    statements["user_skills"] = ("INSERT INTO user_skills (user_id, skill_id, proficiency_level, years_of_experience, "
+                                 "verified_count, created_at) VALUES (:user_id, :skill_id, :level, :years, :verified, :now)")
+    statements["resumes"] = ("INSERT INTO resumes (user_id, title, template, summary, is_ai_generated_summary, is_public, "
+                             "public_url_slug, view_count, created_at, updated_at) VALUES (:user_id, 'My Resume', 'modern', "
+                             ":summary, 0, :is_public, :slug, 0, :now, :now)")
+
+    def flush(force: bool = False):
+        for name, rows in pending.items():
+            if rows and (force or len(rows) >= batch):
+                with engine.begin() as conn:
+                    conn.execute(text(statements[name]), rows)
+                counts[name] += len(rows)
+                rows.clear()
+
+    kinds, weights = list(KIND_WEIGHTS), list(KIND_WEIGHTS.values())
+    for user_id in range(1, users + 1):
+        pending["users"].append({
+            "id": user_id, "email": f"user{user_id}@example.com", "hashed_password": password_hash,
+            "full_name": f"User {user_id}", "location": gen.rng.choice(["Berlin", "Austin", "Pune", "Toronto", None]),
+            "bio": gen.sentence(15), "now": now,
+        })
+        for kind in gen.rng.choices(kinds, weights=weights, k=gen.count(achievements)):
+            pending[kind].append(gen.achievement(kind, user_id))
+        for name in gen.techs(min(len(TECH), gen.count(skills))):
+            pending["user_skills"].append({
+                "user_id": user_id, "skill_id": skill_ids[name], "level": gen.rng.choice(LEVELS),
+                "years": gen.rng.randint(0, 6), "verified": gen.rng.randint(0, 2), "now": now,
+            })
+        is_public = gen.rng.random() < public_ratio
+        pending["resumes"].append({
+            "user_id": user_id, "summary": gen.sentence(40), "is_public": int(is_public),
+            "slug": f"user-{user_id}" if is_public else None, "now": now,
+        })
+        if user_id % 1000 == 0:
+            flush()
+    flush(force=True)
+    counts.update(derive(engine))
+
+    counts["load_seconds"] = round(time.perf_counter() - started, 2)
+    return counts
+
+
+def derive(engine) -> Dict:
+    """Fill the tables the app derives from the rows above; returns their row counts"""
+    from app.models.achievement import AchievementFingerprint
+    from app.models.profile_version import ProfileVersion
+    from app.models.user import User
+    from app.models.user_stats import UserStats
+    from app.services import change_tokens
+    from app.services.duplicate_service import duplicate_service
+    from app.services.stats_service import stats_service
+
+    with Session(bind=engine) as db:
+        duplicate_service.backfill(db)
+        stats_service.rebuild(db)
+        user_ids = list(db.execute(select(User.id).order_by(User.id)).scalars())
+        for start in range(0, len(user_ids), 500):
+            change_tokens.bump(db.connection(), user_ids[start:start + 500])
+        db.commit()
+        return {
+            table.__tablename__: db.execute(select(func.count()).select_from(table)).scalar()
+            for table in (AchievementFingerprint, UserStats, ProfileVersion)
+        }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", required=True, help="SQLite file to create")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--achievements", type=float, default=12, help="Mean achievements per user")
+    parser.add_argument("--skills", type=float, default=8, help="Mean skills per user")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    from app.database import Base
+    import app.models  # noqa: F401  (register tables on Base.metadata)
+    from app.services.search_service import search_service
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    Base.metadata.create_all(bind=engine)
+    search_service.install(engine)
+    print(json.dumps(generate(engine, args.users, args.achievements, args.skills, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
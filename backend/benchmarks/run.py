@@ -0,0 +1,342 @@
+"""Endpoint benchmark suite.
+
+Usage (from the backend directory):
+    python -m benchmarks.run --users 2000 --out results.json
+    python -m benchmarks.run --users 2000 --baseline results.json   # run, then compare
+    python -m benchmarks.run --compare old.json new.json            # compare two result files
+
+Generates a synthetic dataset (see ``benchmarks.datagen``) in a throwaway
+SQLite database, then drives the real app in-process through the ASGI test
+client. Summary generation runs against a stubbed LLM client with a fixed
+latency, so it measures our side of the call; ``--llm-url`` points it at an
+OpenAI-compatible server such as ``tools.llm_stub`` instead. Each scenario
+reports latency percentiles, throughput, SQL statements per request and the
+process's peak RSS. Compare mode exits non-zero when a scenario regressed beyond tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+SCENARIOS: Dict[str, Callable] = {}
+
+
+def scenario(name: str):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+# Scenarios: each issues one request for a random sample user
+
+
+@scenario("login")
+def _login(ctx, rng):
+    user = rng.choice(ctx["users"])
+    return ctx["client"].post("/api/auth/login", data={"username": user["email"], "password": ctx["password"]})
+
+
+@scenario("list_internships")
+def _list_internships(ctx, rng):
+    return ctx["client"].get("/api/achievements/internships", headers=rng.choice(ctx["users"])["headers"])
+
+
+@scenario("list_courses")
+def _list_courses(ctx, rng):
+    return ctx["client"].get("/api/achievements/courses", headers=rng.choice(ctx["users"])["headers"])
+
+
+@scenario("list_projects")
+def _list_projects(ctx, rng):
+    return ctx["client"].get("/api/achievements/projects", headers=rng.choice(ctx["users"])["headers"])
+
+
+@scenario("list_skills")
+def _list_skills(ctx, rng):
+    return ctx["client"].get("/api/achievements/skills", headers=rng.choice(ctx["users"])["headers"])
+
+
+@scenario("list_resumes")
+def _list_resumes(ctx, rng):
+    return ctx["client"].get("/api/resumes", headers=rng.choice(ctx["users"])["headers"])
+
+
+@scenario("get_resume")
+def _get_resume(ctx, rng):
+    user = rng.choice(ctx["users"])
+    return ctx["client"].get(f"/api/resumes/{user['resume_id']}", headers=user["headers"])
+
+
+@scenario("export_pdf")
+def _export_pdf(ctx, rng):
+    user = rng.choice(ctx["users"])
+    return ctx["client"].get(f"/api/resumes/{user['resume_id']}/export-pdf", headers=user["headers"])
+
+
+@scenario("create_skill")
+def _create_skill(ctx, rng):
+    user = rng.choice(ctx["users"])
+    name = f"Skill {rng.randint(1, 10**9)}"
+    return ctx["client"].post("/api/achievements/skills", headers=user["headers"],
+                              json={"skill_name": name, "proficiency_level": "Intermediate", "years_of_experience": 1})
+
+
+@scenario("generate_summary")
+def _generate_summary(ctx, rng):
+    user = rng.choice(ctx["users"])
+    return ctx["client"].post(f"/api/resumes/{user['resume_id']}/regenerate-summary", headers=user["headers"])
+
+
+# Stubbed LLM
+
+
+class _StubCompletions:
+    latency = 0.0
+
+    def create(self, **kwargs):
+        time.sleep(self.latency)
+        message = type("Message", (), {"content": "Motivated engineer with hands-on experience across the stack."})
+        choice = type("Choice", (), {"message": message})
+        return type("Completion", (), {"choices": [choice]})
+
+
+class _StubOpenAI:
+    def __init__(self, *args, **kwargs):
+        self.chat = type("Chat", (), {"completions": _StubCompletions()})
+
+
+def _install_llm_stub(latency: float) -> None:
+    import openai
+    from app.config import LLMProvider, settings
+    from app.services import llm_providers
+    from app.services.ai_service import get_ai_service
+
+    _StubCompletions.latency = latency
+    openai.OpenAI = _StubOpenAI
+    stub = llm_providers.Provider(
+        LLMProvider(name="stub", model="stub", max_concurrency=64),
+        settings.llm_failure_threshold, settings.llm_cooldown_seconds,
+    )
+    get_ai_service().providers = llm_providers.ProviderRegistry([stub])
+
+
+# Measurement
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+
+def _percentile(sorted_samples: List[float], q: float) -> float:
+    index = min(len(sorted_samples) - 1, max(0, int(round(q * (len(sorted_samples) - 1)))))
+    return round(sorted_samples[index] * 1000, 3)
+
+
+def run_scenario(ctx, name: str, requests: int, concurrency: int, warmup: int, seed: int) -> Dict:
+    func = SCENARIOS[name]
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        func(ctx, rng)
+
+    counter = ctx["query_counter"]
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i: int):
+        nonlocal errors
+        local_rng = random.Random(seed * 100003 + i)
+        started = time.perf_counter()
+        response = func(ctx, local_rng)
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if response.status_code >= 400:
+                errors += 1
+
+    queries_before = counter["count"]
+    started = time.perf_counter()
+    if concurrency == 1:
+        for i in range(requests):
+            one(i)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": _percentile(latencies, 0.50),
+        "p90_ms": _percentile(latencies, 0.90),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "throughput_rps": round(requests / wall, 1),
+        "queries_per_request": round((counter["count"] - queries_before) / requests, 2),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run(args) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    # Configure the app before it is imported
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["DATA_DIR"] = os.path.join(workdir, "data")
+    os.environ["UPLOAD_DIR"] = os.path.join(workdir, "uploads")
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["VERIFICATION_ENABLED"] = "false"
+    if args.llm_url:
+        os.environ["LLM_PROVIDERS"] = json.dumps([
+            {"name": "stub", "base_url": args.llm_url, "model": "stub", "max_concurrency": 64},
+        ])
+
+    from sqlalchemy import event
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import engine, init_db
+    from app.auth import create_access_token
+    from benchmarks.datagen import generate, PASSWORD
+
+    init_db()
+    dataset = generate(engine, args.users, args.achievements, args.skills, seed=args.seed)
+    if not args.llm_url:
+        _install_llm_stub(args.llm_latency)
+
+    counter = {"count": 0}
+    counter_lock = threading.Lock()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def count_queries(*_):
+        with counter_lock:
+            counter["count"] += 1
+
+    rng = random.Random(args.seed)
+    sample = rng.sample(range(1, args.users + 1), min(args.sample_users, args.users))
+    users = [
+        {
+            "email": f"user{user_id}@example.com",
+            "resume_id": user_id,  # One resume per generated user, inserted in user order
+            "headers": {"Authorization": f"Bearer {create_access_token({'sub': f'user{user_id}@example.com'})}"},
+        }
+        for user_id in sample
+    ]
+
+    selected = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    results = {}
+    with TestClient(app) as client:
+        ctx = {"client": client, "users": users, "password": PASSWORD, "query_counter": counter}
+        for name in selected:
+            requests = args.requests if name != "login" else max(1, args.requests // 4)  # bcrypt is slow on purpose
+            results[name] = run_scenario(ctx, name, requests, args.concurrency, args.warmup, args.seed)
+            print(f"{name:>18}: p50 {results[name]['p50_ms']:8.2f} ms  p95 {results[name]['p95_ms']:8.2f} ms  "
+                  f"{results[name]['throughput_rps']:8.1f} req/s  {results[name]['queries_per_request']:6.2f} q/req",
+                  file=sys.stderr)
+
+    return {
+        "meta": {
+            "users": args.users,
+            "mean_achievements": args.achievements,
+            "mean_skills": args.skills,
+            "seed": args.seed,
+            "llm_latency_s": args.llm_latency,
+            "llm_url": args.llm_url,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "dataset": dataset,
+        },
+        "scenarios": results,
+    }
+
+
+# Comparing runs
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float) -> List[str]:
+    """Return human-readable regressions of ``current`` against ``baseline``"""
+    regressions = []
+    for name, new in current["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            continue
+        # Small absolute changes on fast endpoints are noise
+        for key in ("p50_ms", "p95_ms"):
+            if new[key] > old[key] * (1 + tolerance) and new[key] - old[key] > 1.0:
+                regressions.append(f"{name}: {key} {old[key]} -> {new[key]}")
+        if new["throughput_rps"] < old["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput_rps {old['throughput_rps']} -> {new['throughput_rps']}")
+        if new["queries_per_request"] > old["queries_per_request"] + 0.5:
+            regressions.append(f"{name}: queries_per_request {old['queries_per_request']} -> {new['queries_per_request']}")
+        if new["errors"] > old["errors"]:
+            regressions.append(f"{name}: errors {old['errors']} -> {new['errors']}")
+    old_rss = max((s["peak_rss_mb"] for s in baseline["scenarios"].values()), default=0)
+    new_rss = max((s["peak_rss_mb"] for s in current["scenarios"].values()), default=0)
+    if old_rss and new_rss > old_rss * (1 + tolerance):
+        regressions.append(f"peak_rss_mb {old_rss} -> {new_rss}")
+    return regressions
+
+
+def _report(regressions: List[str]) -> None:
+    if regressions:
+        print("Regressions:", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        sys.exit(1)
+    print("No regressions", file=sys.stderr)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--achievements", type=float, default=12, help="Mean achievements per user")
+    parser.add_argument("--skills", type=float, default=8, help="Mean skills per user")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--sample-users", type=int, default=200, help="Distinct users the scenarios act as")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Stub LLM latency in seconds")
+    parser.add_argument("--llm-url", help="Call an OpenAI-compatible server (e.g. tools.llm_stub) instead")
+    parser.add_argument("--scenarios", help=f"Comma-separated subset of: {','.join(SCENARIOS)}")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="Compare this run against a stored results file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="Only compare two result files")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        _report(compare(baseline, current, args.tolerance))
+        return
+
+    results = run(args)
+    output = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            _report(compare(json.load(f), results, args.tolerance))
+
+
+if __name__ == "__main__":
+    main()
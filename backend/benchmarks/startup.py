@@ -0,0 +1,66 @@
+"""Import-time budget check for API workers.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup --budget-ms 1500
+
+Imports ``app.main`` in a fresh interpreter under ``python -X importtime``
+(several runs, best one kept) and fails if the cumulative import time
+exceeds the budget or if a module that should load lazily (ReportLab,
+OpenAI) was imported at startup. Prints the heaviest modules either way.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+LAZY_MODULES = ("reportlab", "openai")
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure():
+    """Return (total microseconds, {module: (self us, cumulative us)}) for one cold import"""
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup.db')}")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules["app.main"][1], modules
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    total, modules = min((measure() for _ in range(args.runs)), key=lambda run: run[0])
+
+    print(f"app.main cumulative import: {total / 1000:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print("Heaviest modules (self time):")
+    for name, (own, cumulative) in sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {own / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if total / 1000 > args.budget_ms:
+        failures.append(f"import time {total / 1000:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+    for lazy in LAZY_MODULES:
+        if lazy in modules:
+            failures.append(f"{lazy} is imported at startup; it should load on first use")
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
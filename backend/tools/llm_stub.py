@@ -0,0 +1,163 @@
+"""Stub OpenAI-compatible LLM server for running summary load tests offline.
+
+Usage (from the backend directory):
+    python -m tools.llm_stub --port 8766 --latency 0.8 --jitter 0.2 --error-rate 0.05
+
+Then point the API at it (several stubs with different latencies exercise
+the provider routing):
+    LLM_PROVIDERS='[{"name": "stub", "base_url": "http://127.0.0.1:8766/v1", "model": "stub"}]'
+
+    POST /v1/chat/completions   chat completion; the text depends only on the prompt
+    GET  /v1/models             the one model, named by ``--model``
+    GET  /stats                 request and outcome counts
+
+Each completion sleeps ``--latency`` seconds plus up to ``--jitter`` either
+way, and fails with 500 (or 429 for ``--rate-limit-rate``) at the given
+rates, drawn from a generator seeded with ``--seed`` so runs repeat.
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+hits: Counter = Counter()
+hits_lock = threading.Lock()
+
+OPENINGS = [
+    "Results-driven engineer",
+    "Versatile developer",
+    "Detail-oriented builder",
+    "Collaborative problem solver",
+]
+CLOSINGS = [
+    "Eager to turn ideas into reliable products.",
+    "Ready to contribute from day one.",
+    "Known for shipping clean, well-tested work.",
+]
+
+
+def completion_text(prompt: str) -> str:
+    """A plausible summary that is the same every time for the same prompt"""
+    digest = hashlib.sha256(prompt.encode()).digest()
+    name = "The candidate"
+    for line in prompt.splitlines():
+        if " for " in line and line.startswith("Create"):
+            name = line.split(" for ", 1)[1].split(" based on", 1)[0]
+            break
+    skills = next((line[len("Skills: "):] for line in prompt.splitlines() if line.startswith("Skills: ")), "")
+    text = f"{OPENINGS[digest[0] % len(OPENINGS)]}, {name} brings hands-on experience"
+    text += f" with {skills}." if skills else " across the stack."
+    return f"{text} {CLOSINGS[digest[1] % len(CLOSINGS)]}"
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    model = "stub"
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    rate_limit_rate = 0.0
+    rng = random.Random(0)
+    rng_lock = threading.Lock()
+
+    def _send(self, code: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self, key: str) -> None:
+        with hits_lock:
+            hits[key] += 1
+
+    def do_GET(self):
+        if self.path == "/stats":
+            with hits_lock:
+                return self._send(200, dict(hits))
+        if self.path == "/v1/models":
+            return self._send(200, {"object": "list", "data": [{"id": self.model, "object": "model"}]})
+        return self._send(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        if self.path != "/v1/chat/completions":
+            return self._send(404, {"error": {"message": "not found"}})
+        self._count("requests")
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            prompt = "\n".join(m.get("content", "") for m in request["messages"] if m.get("role") == "user")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self._count("bad_request")
+            return self._send(400, {"error": {"message": "expected a chat completion request"}})
+
+        with self.rng_lock:
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            roll = self.rng.random()
+        time.sleep(delay)
+
+        if roll < self.rate_limit_rate:
+            self._count("rate_limited")
+            return self._send(429, {"error": {"message": "rate limited", "type": "rate_limit_exceeded"}})
+        if roll < self.rate_limit_rate + self.error_rate:
+            self._count("errors")
+            return self._send(500, {"error": {"message": "injected failure", "type": "server_error"}})
+
+        text = completion_text(prompt)
+        prompt_tokens = len(prompt.split())
+        completion_tokens = len(text.split())
+        self._count("completions")
+        return self._send(200, {
+            "id": f"chatcmpl-{hashlib.sha256(prompt.encode()).hexdigest()[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", self.model),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--model", default="stub")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean seconds per completion")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- seconds around the mean")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of completions failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction failing with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    StubLLMHandler.model = args.model
+    StubLLMHandler.latency = args.latency
+    StubLLMHandler.jitter = args.jitter
+    StubLLMHandler.error_rate = args.error_rate
+    StubLLMHandler.rate_limit_rate = args.rate_limit_rate
+    StubLLMHandler.rng = random.Random(args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), StubLLMHandler)
+    print(f"Stub LLM listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Stub certificate issuer for exercising the verification pipeline locally.
+
+Usage (from the backend directory):
+    python -m tools.stub_issuer --port 8765 --latency 0.2
+
+Then run the API with VERIFICATION_ALLOW_PRIVATE_HOSTS=true and point
+certificate URLs at it:
+    http://127.0.0.1:8765/certificates/<id>   200 PDF mentioning <id>
+    http://127.0.0.1:8765/verify/<id>         200 JSON {"certificate_id": <id>, "valid": true}
+    http://127.0.0.1:8765/revoked/<id>        200 JSON with "valid": false
+    http://127.0.0.1:8765/flaky/<id>          503 on odd-numbered requests
+    http://127.0.0.1:8765/awarded/<name>      200 HTML naming <name> (URL-encoded) as the holder
+    http://127.0.0.1:8765/redirect/<id>       302 to /certificates/<id>
+anything else returns 404. Each request sleeps ``--latency`` seconds, and the
+per-path hit counts are served at /stats so dedupe can be checked.
+"""
+import argparse
+import html
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+hits: Counter = Counter()
+hits_lock = threading.Lock()
+
+
+class IssuerHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def _send(self, code: int, content_type: str, body: bytes, location: str = None) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            with hits_lock:
+                body = json.dumps(dict(hits)).encode()
+            return self._send(200, "application/json", body)
+
+        with hits_lock:
+            hits[self.path] += 1
+            count = hits[self.path]
+        time.sleep(self.latency)
+
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 2:
+            return self._send(404, "text/plain", b"not found")
+        route, certificate_id = parts
+
+        if route == "certificates":
+            body = f"%PDF-1.4\n% Certificate of completion\n% ID: {certificate_id}\n%%EOF\n".encode()
+            return self._send(200, "application/pdf", body)
+        if route in ("verify", "revoked"):
+            body = json.dumps({"certificate_id": certificate_id, "valid": route == "verify"}).encode()
+            return self._send(200, "application/json", body)
+        if route == "flaky":
+            if count % 2:
+                return self._send(503, "text/plain", b"try again")
+            body = f"<html><body>Certificate {certificate_id}</body></html>".encode()
+            return self._send(200, "text/html", body)
+        if route == "awarded":
+            name = html.escape(unquote(certificate_id))
+            body = f"<html><body><p>This certificate is awarded to <b>{name}</b></p></body></html>".encode()
+            return self._send(200, "text/html", body)
+        if route == "redirect":
+            return self._send(302, "text/plain", b"", location=f"/certificates/{certificate_id}")
+        return self._send(404, "text/plain", b"not found")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to sleep per request")
+    args = parser.parse_args(argv)
+
+    IssuerHandler.latency = args.latency
+    server = ThreadingHTTPServer((args.host, args.port), IssuerHandler)
+    print(f"Stub issuer listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,7 @@ import Link from 'next/link';
 export default function DashboardPage() {
   const router = useRouter();
   const { user, isAuthenticated, isLoading: authLoading, fetchUser } = useAuthStore();
-  const { resumes, achievements, fetchResumes, fetchAchievements, createResume } = useResumeStore();
+  const { dashboard, fetchDashboard, createResume } = useResumeStore();
   const [isCreating, setIsCreating] = useState(false);
 
   useEffect(() => {
@@ -28,10 +28,13 @@ export default function DashboardPage() {
 
   useEffect(() => {
     if (isAuthenticated) {
-      fetchResumes();
-      fetchAchievements();
+      fetchDashboard();
     }
-  }, [isAuthenticated, fetchResumes, fetchAchievements]);
+  }, [isAuthenticated, fetchDashboard]);
+
+  const resumes = dashboard?.resumes ?? [];
+  const skills = dashboard?.skills ?? [];
+  const counts = dashboard?.counts ?? {};
 
   const handleCreateResume = async () => {
     setIsCreating(true);
@@ -124,25 +127,25 @@ export default function DashboardPage() {
             <AchievementCard
               icon={<Briefcase className="h-6 w-6" />}
               title="Internships"
-              count={achievements.internships.length}
+              count={counts.internships ?? 0}
               href="/achievements/internships"
             />
             <AchievementCard
               icon={<BookOpen className="h-6 w-6" />}
               title="Courses"
-              count={achievements.courses.length}
+              count={counts.courses ?? 0}
               href="/achievements/courses"
             />
             <AchievementCard
               icon={<Trophy className="h-6 w-6" />}
               title="Hackathons"
-              count={achievements.hackathons.length}
+              count={counts.hackathons ?? 0}
               href="/achievements/hackathons"
             />
             <AchievementCard
               icon={<Code className="h-6 w-6" />}
               title="Projects"
-              count={achievements.projects.length}
+              count={counts.projects ?? 0}
               href="/achievements/projects"
             />
           </div>
@@ -159,7 +162,7 @@ export default function DashboardPage() {
               </Button>
             </Link>
           </div>
-          {achievements.skills.length === 0 ? (
+          {skills.length === 0 ? (
             <Card>
               <CardContent className="py-8 text-center">
                 <Award className="h-10 w-10 text-gray-400 mx-auto mb-3" />
@@ -168,13 +171,13 @@ export default function DashboardPage() {
             </Card>
           ) : (
             <div className="flex flex-wrap gap-2">
-              {achievements.skills.map((userSkill: any) => (
+              {skills.map((skill: any) => (
                 <span
-                  key={userSkill.id}
+                  key={skill.id}
                   className="px-3 py-1 bg-primary-100 text-primary-800 rounded-full text-sm"
                 >
-                  {userSkill.skill.name}
-                  {userSkill.proficiency_level && ` • ${userSkill.proficiency_level}`}
+                  {skill.name}
+                  {skill.proficiency_level && ` • ${skill.proficiency_level}`}
                 </span>
               ))}
             </div>
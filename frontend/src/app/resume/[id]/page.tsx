@@ -28,7 +28,7 @@ export default function ResumePage() {
   const resumeId = parseInt(params.id as string);
   
   const { isAuthenticated, fetchUser } = useAuthStore();
-  const { currentResume, fetchResume, updateResume, regenerateSummary, exportPDF } = useResumeStore();
+  const { currentResume, fetchResume, subscribeResume, updateResume, regenerateSummary, exportPDF } = useResumeStore();
   const [isRegenerating, setIsRegenerating] = useState(false);
   const [isExporting, setIsExporting] = useState(false);
   const [selectedTemplate, setSelectedTemplate] = useState('modern');
@@ -45,6 +45,12 @@ export default function ResumePage() {
     fetchResume(resumeId);
   }, [isAuthenticated, resumeId, fetchResume, router]);
 
+  // Keep the preview in sync as achievements and skills change elsewhere
+  useEffect(() => {
+    if (!isAuthenticated) return;
+    return subscribeResume(resumeId);
+  }, [isAuthenticated, resumeId, subscribeResume]);
+
   const handleRegenerateSummary = async () => {
     setIsRegenerating(true);
     try {
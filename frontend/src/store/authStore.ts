@@ -20,10 +20,21 @@ interface AuthState {
   login: (email: string, password: string) => Promise<void>;
   register: (data: any) => Promise<void>;
   logout: () => void;
+  refreshSession: () => Promise<boolean>;
   fetchUser: () => Promise<void>;
   updateUser: (data: any) => Promise<void>;
 }
 
+const storeTokens = (data: { access_token: string; refresh_token?: string }) => {
+  localStorage.setItem('access_token', data.access_token);
+  if (data.refresh_token) {
+    localStorage.setItem('refresh_token', data.refresh_token);
+  }
+};
+
+// One refresh at a time: a refresh token is single-use, so concurrent 401s wait on the same one
+let pendingRefresh: Promise<boolean> | null = null;
+
 export const useAuthStore = create<AuthState>((set) => ({
   user: null,
   isAuthenticated: false,
@@ -40,7 +51,7 @@ export const useAuthStore = create<AuthState>((set) => ({
       },
     });
 
-    localStorage.setItem('access_token', response.data.access_token);
+    storeTokens(response.data);
     
     // Fetch user data
     const userResponse = await api.get('/api/users/me');
@@ -52,10 +63,37 @@ export const useAuthStore = create<AuthState>((set) => ({
   },
 
   logout: () => {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (refreshToken) {
+      api.post('/api/auth/logout', { refresh_token: refreshToken }).catch(() => {});
+    }
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     set({ user: null, isAuthenticated: false });
   },
 
+  refreshSession: () => {
+    if (!pendingRefresh) {
+      pendingRefresh = (async () => {
+        const refreshToken = localStorage.getItem('refresh_token');
+        if (!refreshToken) {
+          return false;
+        }
+        try {
+          const response = await api.post('/api/auth/refresh', { refresh_token: refreshToken });
+          storeTokens(response.data);
+          return true;
+        } catch (error) {
+          localStorage.removeItem('refresh_token');
+          return false;
+        }
+      })().finally(() => {
+        pendingRefresh = null;
+      });
+    }
+    return pendingRefresh;
+  },
+
   fetchUser: async () => {
     try {
       const token = localStorage.getItem('access_token');
@@ -67,6 +105,7 @@ export const useAuthStore = create<AuthState>((set) => ({
       const response = await api.get('/api/users/me');
       set({ user: response.data, isAuthenticated: true, isLoading: false });
     } catch (error) {
+      // An expired access token was already renewed and retried by the interceptor below
       set({ user: null, isAuthenticated: false, isLoading: false });
     }
   },
@@ -77,3 +116,21 @@ export const useAuthStore = create<AuthState>((set) => ({
   },
 }));
 
+// An expired access token is renewed once and the request retried
+api.interceptors.response.use(undefined, async (error) => {
+  const request = error.config;
+  if (
+    error.response?.status !== 401 ||
+    !request ||
+    request._retried ||
+    request.url?.startsWith('/api/auth/')
+  ) {
+    return Promise.reject(error);
+  }
+  request._retried = true;
+  if (!(await useAuthStore.getState().refreshSession())) {
+    return Promise.reject(error);
+  }
+  request.headers.Authorization = `Bearer ${localStorage.getItem('access_token')}`;
+  return api(request);
+});
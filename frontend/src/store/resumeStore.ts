@@ -1,5 +1,6 @@
 import { create } from 'zustand';
 import api from '@/lib/api';
+import { useAuthStore } from '@/store/authStore';
 
 interface Resume {
   id: number;
@@ -22,15 +23,27 @@ interface Achievement {
   skills: any[];
 }
 
+interface Dashboard {
+  counts: Record<string, number>;
+  verification: Record<string, Record<string, number>>;
+  recent: Record<string, any[]>;
+  skills: any[];
+  resumes: Pick<Resume, 'id' | 'title' | 'template' | 'is_public' | 'view_count' | 'updated_at'>[];
+}
+
 interface ResumeState {
   resumes: Resume[];
+  dashboard: Dashboard | null;
   currentResume: any | null;
   achievements: Achievement;
   isLoading: boolean;
   
+  fetchDashboard: () => Promise<void>;
+
   // Resume operations
   fetchResumes: () => Promise<void>;
   fetchResume: (id: number) => Promise<void>;
+  subscribeResume: (id: number) => () => void;
   createResume: (data: any) => Promise<Resume>;
   updateResume: (id: number, data: any) => Promise<void>;
   deleteResume: (id: number) => Promise<void>;
@@ -51,8 +64,38 @@ interface ResumeState {
   deleteSkill: (id: number) => Promise<void>;
 }
 
+// Apply a live preview diff (see backend/app/services/live_service.py)
+function applyResumeOps(resume: any, ops: any[]) {
+  const next = structuredClone(resume);
+  for (const op of ops) {
+    const key = op.path[op.path.length - 1];
+    let parent = next;
+    for (const part of op.path.slice(0, -1)) {
+      parent = parent[part] ??= {};
+    }
+    if (op.op === 'set') {
+      parent[key] = op.value;
+    } else if (op.op === 'upsert') {
+      const list = parent[key] ?? [];
+      for (const item of op.items) {
+        const index = list.findIndex((existing: any) => existing.id === item.id);
+        if (index >= 0) list[index] = item;
+        else list.push(item);
+      }
+      parent[key] = list;
+    } else if (op.op === 'remove') {
+      parent[key] = (parent[key] ?? []).filter((item: any) => !op.ids.includes(item.id));
+    } else if (op.op === 'order') {
+      const byId = new Map((parent[key] ?? []).map((item: any) => [item.id, item]));
+      parent[key] = op.ids.map((id: number) => byId.get(id));
+    }
+  }
+  return next;
+}
+
 export const useResumeStore = create<ResumeState>((set, get) => ({
   resumes: [],
+  dashboard: null,
   currentResume: null,
   achievements: {
     internships: [],
@@ -63,6 +106,17 @@ export const useResumeStore = create<ResumeState>((set, get) => ({
   },
   isLoading: false,
 
+  fetchDashboard: async () => {
+    set({ isLoading: true });
+    try {
+      const response = await api.get('/api/dashboard');
+      set({ dashboard: response.data, isLoading: false });
+    } catch (error) {
+      set({ isLoading: false });
+      throw error;
+    }
+  },
+
   // Resume operations
   fetchResumes: async () => {
     set({ isLoading: true });
@@ -86,6 +140,48 @@ export const useResumeStore = create<ResumeState>((set, get) => ({
     }
   },
 
+  subscribeResume: (id: number) => {
+    const base = (api.defaults.baseURL || window.location.origin).replace(/^http/, 'ws');
+    let socket: WebSocket;
+    let stopped = false;
+
+    const connect = () => {
+      let received = false;
+      socket = new WebSocket(`${base}/api/resumes/${id}/live`);
+
+      // The token goes in the first frame, not the URL, so it stays out of access logs
+      socket.onopen = () => {
+        socket.send(JSON.stringify({ type: 'auth', token: localStorage.getItem('access_token') || '' }));
+      };
+
+      socket.onmessage = (event) => {
+        received = true;
+        const message = JSON.parse(event.data);
+        if (message.type === 'snapshot') {
+          set({ currentResume: message.resume });
+        } else if (message.type === 'diff') {
+          set({ currentResume: applyResumeOps(get().currentResume, message.ops) });
+        } else {
+          return;
+        }
+        socket.send(JSON.stringify({ type: 'ack', version: message.version }));
+      };
+
+      // 4401 after a working connection means the access token expired: renew it and reconnect
+      socket.onclose = async (event) => {
+        if (!stopped && received && event.code === 4401 && (await useAuthStore.getState().refreshSession())) {
+          connect();
+        }
+      };
+    };
+
+    connect();
+    return () => {
+      stopped = true;
+      socket.close();
+    };
+  },
+
   createResume: async (data: any) => {
     const response = await api.post('/api/resumes', data);
     set((state) => ({ resumes: [...state.resumes, response.data] }));